@@ -0,0 +1,311 @@
+"""
+Reader for And-Inverter Graphs in the ASCII (``aag``) and binary (``aig``)
+AIGER formats, with a direct CNF encoding.
+
+Each AND gate ``g = a & b`` becomes exactly three clauses::
+
+    (~g | a) & (~g | b) & (g | ~a | ~b)
+
+Inverters are not gates in an AIG, they are just the negated polarity of a
+literal, so they cost nothing.  Only the gates in the cone of influence of the
+asserted literals are encoded.
+
+Reference: https://fmv.jku.at/aiger/FORMAT
+"""
+
+from __future__ import annotations
+from array import array
+import itertools
+import os
+from typing import TYPE_CHECKING, Iterator, Literal
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, CNF, Clause, Lit, Not, Or, Var
+
+if TYPE_CHECKING:
+    from satisfaction.solvers.cdcl import CDCL
+
+type Assert = Literal["any", "all", "none"]
+
+
+class Aiger:
+    __slots__ = (
+        "max_var",
+        "inputs",
+        "latches",
+        "outputs",
+        "bad",
+        "constraints",
+        "ands",
+        "symbols",
+        "_vars",
+    )
+
+    max_var: int
+    inputs: list[int]
+    latches: list[tuple[int, int]]
+    outputs: list[int]
+    bad: list[int]
+    constraints: list[int]
+    # flattened (lhs, rhs0, rhs1) triples
+    ands: array[int]
+    symbols: dict[tuple[str, int], str]
+
+    _vars: list[Var | None]
+
+    def __init__(self, max_var: int) -> None:
+        self.max_var = max_var
+        self.inputs = []
+        self.latches = []
+        self.outputs = []
+        self.bad = []
+        self.constraints = []
+        self.ands = array("l")
+        self.symbols = {}
+        self._vars = [None] * (max_var + 1)
+
+    @property
+    def num_ands(self) -> int:
+        return len(self.ands) // 3
+
+    def var(self, v: int) -> Var:
+        """
+        The solver variable for AIG variable ``v``.  Inputs and latches are
+        named by ``name_vars``, gates are generated ``g<v>``.
+        """
+        var = self._vars[v]
+        if var is None:
+            name = "false" if v == 0 else f"g{v}"
+            var = self._vars[v] = Var(name, generated=True)
+        return var
+
+    def lit(self, lit: int) -> Lit:
+        var = self.var(lit >> 1)
+        return Not(var) if lit & 1 else var
+
+    def name_vars(self) -> None:
+        """
+        Name input and latch variables after their symbols, or ``i<n>`` and
+        ``l<n>`` if they have none.
+        """
+        for i, lit in enumerate(self.inputs):
+            self._vars[lit >> 1] = Var(self.symbols.get(("i", i), f"i{i}"))
+        for i, (lit, _) in enumerate(self.latches):
+            self._vars[lit >> 1] = Var(self.symbols.get(("l", i), f"l{i}"))
+
+    def targets(self) -> list[int]:
+        return self.outputs + self.bad
+
+    def cone(self, roots: list[int]) -> array[int]:
+        """
+        Indices of the gates that ``roots`` depend on, in topological order.
+        """
+        gate_of = array("l", [-1]) * (self.max_var + 1)
+        ands = self.ands
+        for i in range(self.num_ands):
+            gate_of[ands[3 * i] >> 1] = i
+
+        seen = bytearray(self.max_var + 1)
+        order = array("l")
+        stack = [lit >> 1 for lit in roots]
+        while stack:
+            v = stack.pop()
+            if v >= 0:
+                if seen[v]:
+                    continue
+                seen[v] = 1
+                i = gate_of[v]
+                if i < 0:
+                    continue
+                # revisit as ~v once both children are done
+                stack.append(~v)
+                stack.append(ands[3 * i + 1] >> 1)
+                stack.append(ands[3 * i + 2] >> 1)
+            else:
+                order.append(gate_of[~v])
+
+        return order
+
+    def clauses(self, assert_targets: Assert = "any") -> Iterator[Clause]:
+        """
+        Lazily encode the circuit as clauses.
+
+        ``assert_targets`` selects what is asserted about the outputs and bad
+        state properties: that ``"any"`` of them is true, that ``"all"`` of
+        them are true, or nothing (``"none"``) in which case every gate is
+        encoded.  Invariant constraints are always asserted.
+        """
+        lit = self.lit
+        targets = self.targets()
+
+        if assert_targets == "none":
+            gates: range | array[int] = range(self.num_ands)
+        else:
+            gates = self.cone(targets + self.constraints)
+
+        # constant false is variable 0
+        yield Or(~self.var(0))
+
+        ands = self.ands
+        for i in gates:
+            g = self.var(ands[3 * i] >> 1)
+            a = lit(ands[3 * i + 1])
+            b = lit(ands[3 * i + 2])
+            yield Or(~g, a)
+            yield Or(~g, b)
+            yield Or(g, ~a, ~b)
+
+        for c in self.constraints:
+            yield Or(lit(c))
+
+        match assert_targets:
+            case "any":
+                yield Or(*(lit(t) for t in targets))
+            case "all":
+                for t in targets:
+                    yield Or(lit(t))
+            case "none":
+                pass
+            case _:
+                raise ValueError(f"unsupported assertion: {assert_targets}")
+
+    def to_cnf(self, assert_targets: Assert = "any") -> CNF:
+        return And(*self.clauses(assert_targets))
+
+    def add_to(self, solver: CDCL, assert_targets: Assert = "any") -> None:
+        """
+        Stream the encoding into a solver with an ``add_clause`` method (such
+        as ``CDCL``) without building the intermediate CNF.
+        """
+        add_clause = solver.add_clause
+        for clause in self.clauses(assert_targets):
+            add_clause(clause)
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    data: bytes
+    pos: int
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def line(self) -> list[str]:
+        end = self.data.find(b"\n", self.pos)
+        if end < 0:
+            end = len(self.data)
+        line = self.data[self.pos : end]
+        self.pos = end + 1
+        return line.decode().split()
+
+    def ints(self, n: int | None = None) -> list[int]:
+        fields = self.line()
+        try:
+            values = [int(f) for f in fields]
+        except ValueError:
+            raise ParseError(f"expected integers, found {fields}") from None
+        if n is not None and len(values) != n:
+            raise ParseError(f"expected {n} integers, found {fields}")
+        return values
+
+    def varint(self) -> int:
+        data = self.data
+        x = 0
+        shift = 0
+        try:
+            while True:
+                ch = data[self.pos]
+                self.pos += 1
+                x |= (ch & 0x7F) << shift
+                if not ch & 0x80:
+                    return x
+                shift += 7
+        except IndexError:
+            raise ParseError("unexpected end of binary AND section") from None
+
+    def at_end(self) -> bool:
+        return self.pos >= len(self.data)
+
+
+def parse_aiger(data: bytes) -> Aiger:
+    reader = _Reader(data)
+
+    header = reader.line()
+    if len(header) < 6 or header[0] not in ("aag", "aig"):
+        raise ParseError("not an AIGER file")
+    binary = header[0] == "aig"
+    try:
+        counts = [int(f) for f in header[1:]]
+    except ValueError:
+        raise ParseError(f"invalid AIGER header: {header}") from None
+
+    counts += [0] * (9 - len(counts))
+    max_var, n_in, n_latch, n_out, n_and, n_bad, n_cons, n_just, n_fair = counts
+    if n_just or n_fair:
+        raise ParseError("justice and fairness properties are not supported")
+
+    aig = Aiger(max_var)
+
+    if binary:
+        aig.inputs = [2 * (k + 1) for k in range(n_in)]
+    else:
+        aig.inputs = [reader.ints(1)[0] for _ in range(n_in)]
+
+    for k in range(n_latch):
+        fields = reader.ints()
+        # an optional reset value follows the next-state literal
+        if not 1 + (not binary) <= len(fields) <= 2 + (not binary):
+            raise ParseError(f"invalid latch definition: {fields}")
+        if binary:
+            aig.latches.append((2 * (n_in + k + 1), fields[0]))
+        else:
+            aig.latches.append((fields[0], fields[1]))
+
+    aig.outputs = [reader.ints(1)[0] for _ in range(n_out)]
+    aig.bad = [reader.ints(1)[0] for _ in range(n_bad)]
+    aig.constraints = [reader.ints(1)[0] for _ in range(n_cons)]
+
+    ands = aig.ands
+    if binary:
+        for k in range(n_and):
+            lhs = 2 * (n_in + n_latch + k + 1)
+            rhs0 = lhs - reader.varint()
+            rhs1 = rhs0 - reader.varint()
+            ands.extend((lhs, rhs0, rhs1))
+    else:
+        for _ in range(n_and):
+            ands.extend(reader.ints(3))
+
+    max_lit = 2 * max_var + 1
+    for lits in (
+        aig.inputs,
+        itertools.chain.from_iterable(aig.latches),
+        aig.outputs,
+        aig.bad,
+        aig.constraints,
+        ands,
+    ):
+        for lit in lits:
+            if not 0 <= lit <= max_lit:
+                raise ParseError(f"literal {lit} exceeds maximum variable {max_var}")
+
+    while not reader.at_end():
+        fields = reader.line()
+        if not fields:
+            continue
+        if fields[0] == "c":
+            break
+        kind, idx = fields[0][0], fields[0][1:]
+        if kind not in "ilobc" or not idx.isdigit():
+            raise ParseError(f"invalid symbol table entry: {fields}")
+        aig.symbols[kind, int(idx)] = " ".join(fields[1:])
+
+    aig.name_vars()
+    return aig
+
+
+def read_aiger(path: str | os.PathLike) -> Aiger:
+    with open(path, "rb") as f:
+        return parse_aiger(f.read())
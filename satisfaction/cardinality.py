@@ -0,0 +1,287 @@
+"""
+Clause encodings of cardinality constraints.
+
+Every encoding emits clauses directly, introducing generated auxiliary
+variables where needed, so the result can be conjoined with other clauses
+without going through ``Tseitin``.  The encoding is chosen per constraint:
+
+* at most one: ``pairwise``, ``sequential`` (ladder), ``commander``, ``product``
+* at most k: ``sequential`` (Sinz counter), ``totalizer``, ``sortnet``
+  (odd-even merge sorting network, pruned to the outputs that matter)
+
+At-least constraints are encoded as at-most constraints over the negated
+literals: at least k of n literals are true iff at most n - k are false.
+"""
+
+from __future__ import annotations
+import math
+from typing import Callable, Iterator, Sequence
+
+from satisfaction.expr import Clause, Lit, Or, Var
+from satisfaction.utils import chunks, numbered_var
+
+AMO_ENCODINGS = ("pairwise", "sequential", "commander", "product")
+AMK_ENCODINGS = ("sequential", "totalizer", "sortnet")
+
+
+class Encoder:
+    __slots__ = ("name_gen", "commander_size", "product_min")
+
+    name_gen: Iterator[str]
+    commander_size: int
+    product_min: int
+
+    def __init__(
+        self,
+        name_gen: Iterator[str] | None = None,
+        commander_size: int = 3,
+        product_min: int = 8,
+    ) -> None:
+        """
+        Auxiliary variable names are drawn from ``name_gen``.  Share a single
+        encoder (or name generator) between all constraints of a formula so
+        that their auxiliary variables do not collide.
+        """
+        if name_gen is None:
+            name_gen = numbered_var("k", 0)
+
+        self.name_gen = name_gen
+        self.commander_size = commander_size
+        self.product_min = product_min
+
+    def new_var(self) -> Var:
+        return Var(next(self.name_gen), generated=True)
+
+    def at_least_one(self, lits: Sequence[Lit]) -> list[Clause]:
+        return [Or(*lits)]
+
+    def at_most_one(
+        self, lits: Sequence[Lit], encoding: str = "pairwise"
+    ) -> list[Clause]:
+        if encoding not in AMO_ENCODINGS:
+            raise ValueError(f"unsupported at-most-one encoding: {encoding}")
+        if len(lits) <= 1:
+            return []
+
+        encode: Callable[[Sequence[Lit]], list[Clause]] = getattr(
+            self, f"_amo_{encoding}"
+        )
+        return encode(lits)
+
+    def exactly_one(
+        self, lits: Sequence[Lit], encoding: str = "pairwise"
+    ) -> list[Clause]:
+        return self.at_least_one(lits) + self.at_most_one(lits, encoding)
+
+    def at_most_k(
+        self, lits: Sequence[Lit], k: int, encoding: str = "sequential"
+    ) -> list[Clause]:
+        if k == 1 and encoding in AMO_ENCODINGS:
+            return self.at_most_one(lits, encoding)
+        if encoding not in AMK_ENCODINGS:
+            raise ValueError(f"unsupported at-most-k encoding: {encoding}")
+
+        if k < 0:
+            return [Or()]
+        if k >= len(lits):
+            return []
+        if k == 0:
+            return [Or(~lit) for lit in lits]
+
+        encode: Callable[[Sequence[Lit], int], list[Clause]] = getattr(
+            self, f"_amk_{encoding}"
+        )
+        return encode(lits, k)
+
+    def at_least_k(
+        self, lits: Sequence[Lit], k: int, encoding: str = "sequential"
+    ) -> list[Clause]:
+        if k == 1:
+            return self.at_least_one(lits)
+        return self.at_most_k([~lit for lit in lits], len(lits) - k, encoding)
+
+    def exactly_k(
+        self, lits: Sequence[Lit], k: int, encoding: str = "sequential"
+    ) -> list[Clause]:
+        return self.at_most_k(lits, k, encoding) + self.at_least_k(lits, k, encoding)
+
+    # at most one
+
+    def _amo_pairwise(self, lits: Sequence[Lit]) -> list[Clause]:
+        clauses = []
+        for i in range(len(lits)):
+            not_lit = ~lits[i]
+            for j in range(i + 1, len(lits)):
+                clauses.append(Or(not_lit, ~lits[j]))
+        return clauses
+
+    def _amo_sequential(self, lits: Sequence[Lit]) -> list[Clause]:
+        # s[i] is true if any of lits[0..i] is true
+        n = len(lits)
+        s = [self.new_var() for _ in range(n - 1)]
+
+        clauses = [Or(~lits[0], s[0])]
+        for i in range(1, n - 1):
+            clauses.append(Or(~lits[i], s[i]))
+            clauses.append(Or(~s[i - 1], s[i]))
+            clauses.append(Or(~lits[i], ~s[i - 1]))
+        clauses.append(Or(~lits[n - 1], ~s[n - 2]))
+        return clauses
+
+    def _amo_commander(self, lits: Sequence[Lit]) -> list[Clause]:
+        if len(lits) <= self.commander_size + 1:
+            return self._amo_pairwise(lits)
+
+        clauses = []
+        commanders = []
+        for group in chunks(lits, self.commander_size):
+            c = self.new_var()
+            commanders.append(c)
+
+            clauses.extend(self._amo_pairwise(group))
+            clauses.append(Or(~c, *group))
+            for lit in group:
+                clauses.append(Or(~lit, c))
+
+        clauses.extend(self._amo_commander(commanders))
+        return clauses
+
+    def _amo_product(self, lits: Sequence[Lit]) -> list[Clause]:
+        if len(lits) < self.product_min:
+            return self._amo_pairwise(lits)
+
+        p = math.ceil(math.sqrt(len(lits)))
+        q = math.ceil(len(lits) / p)
+        rows = [self.new_var() for _ in range(p)]
+        cols = [self.new_var() for _ in range(q)]
+
+        clauses = []
+        for idx, lit in enumerate(lits):
+            i, j = divmod(idx, q)
+            clauses.append(Or(~lit, rows[i]))
+            clauses.append(Or(~lit, cols[j]))
+
+        clauses.extend(self._amo_product(rows))
+        clauses.extend(self._amo_product(cols))
+        return clauses
+
+    # at most k, with 1 <= k < len(lits)
+
+    def _amk_sequential(self, lits: Sequence[Lit], k: int) -> list[Clause]:
+        # s[i][j] is true if at least j + 1 of lits[0..i] are true
+        n = len(lits)
+        s = [[self.new_var() for _ in range(k)] for _ in range(n - 1)]
+
+        clauses = [Or(~lits[0], s[0][0])]
+        for j in range(1, k):
+            clauses.append(Or(~s[0][j]))
+
+        for i in range(1, n - 1):
+            x, prev, curr = lits[i], s[i - 1], s[i]
+            clauses.append(Or(~x, curr[0]))
+            clauses.append(Or(~prev[0], curr[0]))
+            for j in range(1, k):
+                clauses.append(Or(~x, ~prev[j - 1], curr[j]))
+                clauses.append(Or(~prev[j], curr[j]))
+            clauses.append(Or(~x, ~prev[k - 1]))
+
+        clauses.append(Or(~lits[n - 1], ~s[n - 2][k - 1]))
+        return clauses
+
+    def _amk_totalizer(self, lits: Sequence[Lit], k: int) -> list[Clause]:
+        clauses: list[Clause] = []
+        root = self._totalize(lits, k + 1, clauses)
+        if len(root) > k:
+            clauses.append(Or(~root[k]))
+        return clauses
+
+    def _totalize(
+        self, lits: Sequence[Lit], cap: int, clauses: list[Clause]
+    ) -> list[Lit]:
+        """
+        Unary count of ``lits`` truncated at ``cap``: ``out[i]`` is implied by
+        at least ``i + 1`` of ``lits`` being true.
+        """
+        if len(lits) == 1:
+            return [lits[0]]
+
+        mid = len(lits) // 2
+        a = self._totalize(lits[:mid], cap, clauses)
+        b = self._totalize(lits[mid:], cap, clauses)
+        out: list[Lit] = [self.new_var() for _ in range(min(len(lits), cap))]
+
+        for i in range(len(a) + 1):
+            for j in range(len(b) + 1):
+                if i + j == 0:
+                    continue
+                clause: list[Lit] = []
+                if i > 0:
+                    clause.append(~a[i - 1])
+                if j > 0:
+                    clause.append(~b[j - 1])
+                clause.append(out[min(i + j, len(out)) - 1])
+                clauses.append(Or(*clause))
+
+                if i + j >= len(out):
+                    break
+
+        return out
+
+    def _amk_sortnet(self, lits: Sequence[Lit], k: int) -> list[Clause]:
+        size = 1 << (len(lits) - 1).bit_length()
+        pairs = odd_even_merge_sort(size)
+
+        # Only the first k + 1 outputs of the (descending) sorted sequence are
+        # read.  Walk the network backwards to find which comparator outputs
+        # they depend on so that the rest can be left unencoded.
+        needed = [i <= k for i in range(size)]
+        flags: list[tuple[bool, bool]] = [(False, False)] * len(pairs)
+        for t in range(len(pairs) - 1, -1, -1):
+            i, j = pairs[t]
+            flags[t] = (needed[i], needed[j])
+            if needed[i] or needed[j]:
+                needed[i] = needed[j] = True
+
+        # None is a padding wire that is constantly false
+        wires: list[Lit | None] = list(lits) + [None] * (size - len(lits))
+        clauses = []
+        for (i, j), (need_max, need_min) in zip(pairs, flags):
+            a, b = wires[i], wires[j]
+            if a is None or b is None:
+                wires[i], wires[j] = (b, None) if a is None else (a, None)
+                continue
+
+            hi = lo = None
+            if need_max:
+                hi = self.new_var()
+                clauses.append(Or(~a, hi))
+                clauses.append(Or(~b, hi))
+            if need_min:
+                lo = self.new_var()
+                clauses.append(Or(~a, ~b, lo))
+            wires[i], wires[j] = hi, lo
+
+        out = wires[k]
+        assert out is not None
+        clauses.append(Or(~out))
+        return clauses
+
+
+def odd_even_merge_sort(n: int) -> list[tuple[int, int]]:
+    """
+    Comparators ``(i, j)`` with ``i < j`` of Batcher's odd-even merge sort on
+    ``n`` wires, where ``n`` is a power of two.  Each comparator moves the
+    larger value to wire ``i``, so the network sorts in descending order.
+    """
+    pairs = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            for j in range(k % p, n - k, 2 * k):
+                for i in range(min(k, n - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        pairs.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return pairs
@@ -0,0 +1,251 @@
+"""
+The ``satisfaction`` command: solve a DIMACS file with SAT competition output.
+
+Prints ``s SATISFIABLE`` with the model on ``v`` lines, ``s UNSATISFIABLE``
+or ``s UNKNOWN``, and exits with 10, 20 or 0 accordingly.  Comments and
+statistics go to ``c`` lines.  SIGINT and SIGTERM stop the search and
+report ``s UNKNOWN``; the time and memory limits do the same.  With
+``--proof``, the cdcl solver writes a DRAT (or ``--lrat``) proof of
+unsatisfiability, which ``python -m satisfaction.proof`` checks.
+
+Only the standard library is imported before the arguments are parsed, so
+``--help`` and argument errors are fast.
+"""
+
+from __future__ import annotations
+import argparse
+import signal
+import sys
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, TextIO
+
+if TYPE_CHECKING:
+    from satisfaction.packed import PackedCNF
+    from satisfaction.proof import ProofWriter
+    from satisfaction.solvers.solver import Solver
+
+SOLVERS = ("cdcl", "indexed", "dpll")
+
+EXIT_SAT = 10
+EXIT_UNSAT = 20
+EXIT_UNKNOWN = 0
+
+# width of the ``v`` lines, as recommended by the competition rules
+LINE_WIDTH = 78
+
+
+class _Interrupted(Exception):
+    pass
+
+
+parser = argparse.ArgumentParser(
+    prog="satisfaction",
+    description="Solve a DIMACS CNF file, printing the answer in SAT "
+    "competition format.",
+)
+parser.add_argument(
+    "file",
+    nargs="?",
+    default="-",
+    help="DIMACS file, optionally gzip, bzip2 or xz compressed "
+    "(default: standard input)",
+)
+parser.add_argument(
+    "--solver", choices=SOLVERS, default="cdcl", help="solver (default: cdcl)"
+)
+cdcl_options = parser.add_argument_group("cdcl options")
+cdcl_options.add_argument(
+    "--heuristic", default="vsids", help="order or vsids (default: vsids)"
+)
+cdcl_options.add_argument(
+    "--restarts", default="luby", help="none, luby or geometric (default: luby)"
+)
+cdcl_options.add_argument(
+    "--phase", default="saved", help="true, false, saved or random (default: saved)"
+)
+cdcl_options.add_argument("--seed", type=int, default=None, help="random seed")
+limits = parser.add_argument_group("limits")
+limits.add_argument(
+    "--time-limit", type=float, default=None, metavar="SECONDS", help="wall time"
+)
+limits.add_argument(
+    "--memory-limit",
+    type=int,
+    default=None,
+    metavar="MB",
+    help="address space, in megabytes",
+)
+limits.add_argument("--conflicts", type=int, default=None, help="conflicts")
+output = parser.add_argument_group("output")
+output.add_argument(
+    "--no-model", dest="model", action="store_false", help="omit the v lines"
+)
+output.add_argument(
+    "--stats", action="store_true", help="print search statistics as comments"
+)
+output.add_argument(
+    "--proof", metavar="FILE", help="write a proof of unsatisfiability (cdcl only)"
+)
+output.add_argument(
+    "--binary-proof", action="store_true", help="use the binary proof encoding"
+)
+output.add_argument("--lrat", action="store_true", help="write LRAT instead of DRAT")
+
+
+def make_solver(args: argparse.Namespace, packed: PackedCNF) -> Solver:
+    cnf = packed.to_cnf()
+    match args.solver:
+        case "cdcl":
+            from satisfaction.solvers.cdcl import CDCL, Config
+
+            config = Config(args.heuristic, args.restarts, args.phase, args.seed)
+            return CDCL(cnf, config)
+        case "indexed":
+            from satisfaction.solvers.indexed import DPLL
+
+            return DPLL(cnf)
+        case _:
+            from satisfaction.solvers.dpll import DPLL as NaiveDPLL
+
+            return NaiveDPLL(cnf)
+
+
+def read_input(path: str) -> PackedCNF:
+    from satisfaction.dimacs import decompress, parse_dimacs
+
+    if path == "-":
+        data = sys.stdin.buffer.read()
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+    return parse_dimacs(decompress(data))
+
+
+def write_model(model: list[int], out: TextIO) -> None:
+    line = "v"
+    for lit in [*model, 0]:
+        text = f" {lit}"
+        if len(line) + len(text) > LINE_WIDTH:
+            out.write(line + "\n")
+            line = "v"
+        line += text
+    out.write(line + "\n")
+
+
+def write_stats(solver: Solver | None, times: dict[str, float], out: TextIO) -> None:
+    stats: dict[str, Any] = {}
+    if solver is not None:
+        stats.update(solver.stats.counters)
+        times = {**times, **solver.times}
+    for name, value in stats.items():
+        out.write(f"c {name}: {value}\n")
+    for phase, seconds in times.items():
+        out.write(f"c {phase} time: {seconds:.3f}s\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parser.parse_args(argv)
+    if args.proof is not None and args.solver != "cdcl":
+        parser.error("--proof needs the cdcl solver")
+    out = sys.stdout
+    start = time.perf_counter()
+
+    solver: Solver | None = None
+    proof_file: BinaryIO | None = None
+    proof: ProofWriter | None = None
+
+    def on_signal(signum: int, frame: object) -> None:
+        out.write(f"c received {signal.Signals(signum).name}\n")
+        if solver is None:
+            raise _Interrupted
+        solver.interrupt()
+
+    previous = {
+        signum: signal.signal(signum, on_signal)
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+
+    if args.memory_limit is not None:
+        import resource
+
+        limit = args.memory_limit << 20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    times: dict[str, float] = {}
+    result = "UNKNOWN"
+    model: list[int] = []
+    try:
+        from satisfaction.exceptions import ParseError
+        from satisfaction.solvers.solver import Budget, Result
+
+        try:
+            packed = read_input(args.file)
+        except (OSError, ParseError) as e:
+            out.write(f"c error: {e}\n")
+            return 1
+        times["parse"] = time.perf_counter() - start
+        out.write(f"c {packed.num_vars} variables, {len(packed)} clauses\n")
+
+        time_left = None
+        if args.time_limit is not None:
+            time_left = max(0.0, args.time_limit - (time.perf_counter() - start))
+        try:
+            solver = make_solver(args, packed)
+        except ValueError as e:
+            out.write(f"c error: {e}\n")
+            return 1
+        if args.proof is not None:
+            from satisfaction.proof import ProofWriter
+
+            try:
+                proof_file = open(args.proof, "wb")
+            except OSError as e:
+                out.write(f"c error: {e}\n")
+                return 1
+            proof = ProofWriter(proof_file, args.binary_proof, args.lrat, len(packed))
+            solver.attach_proof(proof, packed.table.encode)  # type: ignore[attr-defined]
+        solver.budget = Budget(time=time_left, conflicts=args.conflicts)
+        answer = solver.check()
+
+        if answer is Result.SAT:
+            encode = packed.table.encode
+            true = {encode(lit) for lit in solver.assignments.els}
+            model = [v if v in true else -v for v in range(1, packed.num_vars + 1)]
+        result = {
+            Result.SAT: "SATISFIABLE",
+            Result.UNSAT: "UNSATISFIABLE",
+            Result.UNKNOWN: "UNKNOWN",
+        }[answer]
+    except _Interrupted:
+        pass
+    except MemoryError:
+        # free the solver first so there is memory left to report with
+        solver = None
+        out.write("c out of memory\n")
+    finally:
+        if proof is not None:
+            # a proof cut short by a signal or a limit is still flushed
+            proof.close()
+        if proof_file is not None:
+            proof_file.close()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+    if args.stats or result == "UNKNOWN":
+        write_stats(solver, times, out)
+    out.write(f"c total time: {time.perf_counter() - start:.3f}s\n")
+    out.write(f"s {result}\n")
+    if result == "SATISFIABLE" and args.model:
+        write_model(model, out)
+    out.flush()
+    return {"SATISFIABLE": EXIT_SAT, "UNSATISFIABLE": EXIT_UNSAT}.get(
+        result, EXIT_UNKNOWN
+    )
+
+
+def run() -> None:
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    run()
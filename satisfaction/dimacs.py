@@ -0,0 +1,115 @@
+"""
+Reader and writer for the DIMACS CNF format.
+
+Formulas are read straight into a ``PackedCNF`` whose integer numbering is
+the file's own, so models can be reported in the caller's numbering without
+a variable table.  Variable ``n`` is named ``x<n>``.  Files compressed with
+gzip, bzip2 or xz are recognized by their magic number and decompressed.
+
+Reference: http://www.satcompetition.org/2009/format-benchmarks2009.html
+"""
+
+from __future__ import annotations
+from array import array
+import importlib
+import os
+from typing import BinaryIO
+
+from satisfaction.exceptions import ParseError
+from satisfaction.packed import PackedCNF
+
+# compression formats by magic number, with the module that decompresses them
+COMPRESSION = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "lzma",
+}
+
+
+def parse_dimacs(data: bytes | str) -> PackedCNF:
+    """
+    Clauses may span lines and several may share one.  A ``%`` line, as in
+    the SATLIB benchmarks, ends the clauses.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+
+    num_vars: int | None = None
+    body = array("i")
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line[:1] == b"c":
+            continue
+        if line[:1] == b"%":
+            break
+        if line[:1] == b"p":
+            fields = line.split()
+            if len(fields) != 4 or fields[1] != b"cnf" or num_vars is not None:
+                raise ParseError(f"invalid problem line: {line.decode()!r}")
+            try:
+                num_vars, _ = int(fields[2]), int(fields[3])
+            except ValueError:
+                raise ParseError(f"invalid problem line: {line.decode()!r}") from None
+            continue
+
+        if num_vars is None:
+            raise ParseError("clause before the problem line")
+        try:
+            body.extend(map(int, line.split()))
+        except ValueError:
+            raise ParseError(f"expected integers, found {line.decode()!r}") from None
+
+    if num_vars is None:
+        raise ParseError("missing problem line")
+    if body and body[-1] != 0:
+        raise ParseError("last clause is not terminated by 0")
+    if body and max(max(body), -min(body)) > num_vars:
+        raise ParseError(f"literal exceeds the {num_vars} declared variables")
+
+    lits = array("i")
+    offsets = array("q", [0])
+    start = 0
+    for end, lit in enumerate(body):
+        if lit == 0:
+            lits.extend(body[start:end])
+            offsets.append(len(lits))
+            start = end + 1
+
+    names = "\n".join(f"x{v}" for v in range(1, num_vars + 1)).encode()
+    return PackedCNF(
+        memoryview(lits),
+        memoryview(offsets),
+        memoryview(bytes(num_vars)),
+        memoryview(names),
+    )
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    ``data`` decompressed if it starts with a known magic number, otherwise
+    unchanged.  The decompressors are imported on first use.
+    """
+    for magic, module in COMPRESSION.items():
+        if data.startswith(magic):
+            decompressor = importlib.import_module(module)
+            try:
+                return decompressor.decompress(data)
+            # gzip and bz2 raise OSError or EOFError, lzma its own LZMAError
+            except (
+                OSError,
+                EOFError,
+                getattr(decompressor, "LZMAError", OSError),
+            ) as e:
+                raise ParseError(f"invalid {module} data: {e}") from None
+    return data
+
+
+def read_dimacs(path: str | os.PathLike) -> PackedCNF:
+    with open(path, "rb") as f:
+        return parse_dimacs(decompress(f.read()))
+
+
+def write_dimacs(packed: PackedCNF, f: BinaryIO) -> None:
+    f.write(f"p cnf {packed.num_vars} {len(packed)}\n".encode())
+    for clause in packed:
+        f.write(" ".join(map(str, [*clause, 0])).encode() + b"\n")
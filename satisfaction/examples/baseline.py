@@ -0,0 +1,175 @@
+"""
+Saving benchmark timings as a baseline and comparing new runs against it.
+
+Timings are summarized by their median and interquartile range, which a
+few runs disturbed by the rest of the machine hardly move.  A change is
+judged by the ratio of the new median to the baseline's, with a percentile
+bootstrap confidence interval: both sets of samples are resampled with
+replacement and the ratio of the resampled medians recomputed many times.
+A slowdown is significant when the whole interval lies above 1.
+"""
+
+from __future__ import annotations
+import json
+import platform
+import random
+import statistics
+from typing import Any, TextIO
+
+BASELINE_VERSION = 1
+RESAMPLES = 2000
+CONFIDENCE = 0.95
+# relative slowdown of the median that fails a comparison
+THRESHOLD = 0.05
+
+type Samples = dict[str, dict[int, list[float]]]
+
+
+def quartiles(samples: list[float]) -> tuple[float, float, float]:
+    if len(samples) == 1:
+        return samples[0], samples[0], samples[0]
+    q1, median, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    return q1, median, q3
+
+
+def bootstrap_ratio(
+    base: list[float],
+    new: list[float],
+    resamples: int = RESAMPLES,
+    confidence: float = CONFIDENCE,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """
+    The ``confidence`` interval of ``median(new) / median(base)``.
+    """
+    rng = random.Random(seed)
+    median = statistics.median
+    ratios = sorted(
+        median(rng.choices(new, k=len(new))) / median(rng.choices(base, k=len(base)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (resamples - 1))]
+    high = ratios[round((1 - tail) * (resamples - 1))]
+    return low, high
+
+
+class Comparison:
+    __slots__ = ("solver", "n", "base", "new", "ratio", "low", "high")
+
+    solver: str
+    n: int
+    base: list[float]
+    new: list[float]
+    ratio: float
+    low: float
+    high: float
+
+    def __init__(
+        self,
+        solver: str,
+        n: int,
+        base: list[float],
+        new: list[float],
+        resamples: int = RESAMPLES,
+        confidence: float = CONFIDENCE,
+    ) -> None:
+        self.solver = solver
+        self.n = n
+        self.base = base
+        self.new = new
+        self.ratio = statistics.median(new) / statistics.median(base)
+        self.low, self.high = bootstrap_ratio(base, new, resamples, confidence)
+
+    def __repr__(self) -> str:
+        return (
+            f"Comparison({self.solver!r}, {self.n}, {self.ratio:.3f} "
+            f"[{self.low:.3f}, {self.high:.3f}])"
+        )
+
+    @property
+    def slower(self) -> bool:
+        return self.low > 1
+
+    @property
+    def faster(self) -> bool:
+        return self.high < 1
+
+    def regressed(self, threshold: float = THRESHOLD) -> bool:
+        """
+        Significantly slower, by more than ``threshold`` at the median.
+        """
+        return self.slower and self.ratio > 1 + threshold
+
+
+def compare(
+    base: Samples,
+    new: Samples,
+    resamples: int = RESAMPLES,
+    confidence: float = CONFIDENCE,
+) -> list[Comparison]:
+    """
+    Compare every solver and size timed in both runs.
+    """
+    return [
+        Comparison(solver, n, base[solver][n], samples, resamples, confidence)
+        for solver, sizes in new.items()
+        for n, samples in sizes.items()
+        if n in base.get(solver, {})
+    ]
+
+
+def format_comparisons(
+    comparisons: list[Comparison], threshold: float = THRESHOLD
+) -> str:
+    header = (
+        f"{'solver':>10}{'N':>5}{'base':>11}{'IQR':>10}{'new':>11}{'IQR':>10}"
+        f"{'ratio':>8}{'CI':>17}"
+    )
+    lines = [header, "-" * len(header)]
+    for c in comparisons:
+        b1, base, b3 = quartiles(c.base)
+        n1, new, n3 = quartiles(c.new)
+        if c.regressed(threshold):
+            flag = "REGRESSION"
+        elif c.slower:
+            flag = "slower"
+        elif c.faster:
+            flag = "faster"
+        else:
+            flag = ""
+        lines.append(
+            f"{c.solver:>10}{c.n:>5}{base:>11.4f}{b3 - b1:>10.4f}"
+            f"{new:>11.4f}{n3 - n1:>10.4f}{c.ratio:>8.3f}"
+            f"{f'[{c.low:.3f}, {c.high:.3f}]':>17}  {flag}".rstrip()
+        )
+    return "\n".join(lines)
+
+
+def save_baseline(samples: Samples, options: dict[str, Any], f: TextIO) -> None:
+    """
+    ``options`` records how the instances were built, so that a
+    comparison can refuse a baseline of different formulas.
+    """
+    json.dump(
+        {
+            "version": BASELINE_VERSION,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "options": options,
+            "samples": samples,
+        },
+        f,
+        indent=2,
+    )
+
+
+def load_baseline(f: TextIO) -> tuple[Samples, dict[str, Any]]:
+    data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version {data.get('version')!r}")
+    samples = {
+        solver: {int(n): times for n, times in sizes.items()}
+        for solver, sizes in data["samples"].items()
+    }
+    return samples, data["options"]
@@ -3,11 +3,35 @@ Benchmark comparing the three SAT solvers on N-Queens instances.
 
 Usage:
     python -m satisfaction.examples.benchmark
+    python -m satisfaction.examples.benchmark --amo sequential --sizes 8 16 32 64
+    python -m satisfaction.examples.benchmark --profile profiles --top 20
+    python -m satisfaction.examples.benchmark --memory
+    python -m satisfaction.examples.benchmark --runs 10 --save baseline.json
+    python -m satisfaction.examples.benchmark --runs 10 --compare baseline.json
 """
 
 import argparse
+import os
+import pstats
+import sys
 import time
 
+from satisfaction.cardinality import AMO_ENCODINGS
+from satisfaction.examples.baseline import (
+    THRESHOLD,
+    compare,
+    format_comparisons,
+    load_baseline,
+    save_baseline,
+)
+from satisfaction.examples.profiling import (
+    TOP_FUNCTIONS,
+    format_top,
+    measure_memory,
+    profile,
+    sample,
+    top_functions,
+)
 from satisfaction.examples.queens import Queens
 from satisfaction.solvers.cdcl import CDCL
 from satisfaction.solvers.dpll import DPLL as NaiveDPLL
@@ -17,20 +41,29 @@ from satisfaction.tseitin import Tseitin
 from satisfaction.utils import numbered_var
 
 
-def make_queens_cnf(n: int):
+def make_queens_cnf(n: int, amo: str | None = None, symmetry: bool = False):
     queens = Queens(n)
+    if amo is not None:
+        return queens.get_cnf(amo=amo, symmetry=symmetry)
+
     formula = queens.get_formula()
     tseitin = Tseitin(formula, rename_vars=False, name_gen=numbered_var("x", 0))
     return tseitin.transform(sort=True)
 
 
-def bench(solver_cls: type[Solver], cnf, runs: int = 1) -> float:
-    total = 0.0
+def bench(solver_cls: type[Solver], cnf, runs: int = 1) -> list[float]:
+    times = []
     for _ in range(runs):
         start = time.perf_counter()
         solver_cls(cnf).check()
-        total += time.perf_counter() - start
-    return total / runs
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def solved(solver_cls: type[Solver], cnf) -> Solver:
+    solver = solver_cls(cnf)
+    solver.check()
+    return solver
 
 
 SOLVERS: list[tuple[str, type[Solver], list[int]]] = [
@@ -40,23 +73,47 @@ SOLVERS: list[tuple[str, type[Solver], list[int]]] = [
 ]
 
 
-def run_benchmark(runs: int) -> None:
+def run_benchmark(
+    runs: int,
+    amo: str | None = None,
+    symmetry: bool = False,
+    sizes: list[int] | None = None,
+    profile_dir: str | None = None,
+    memory: bool = False,
+    top: int = TOP_FUNCTIONS,
+    names: list[str] | None = None,
+    save: str | None = None,
+    baseline: str | None = None,
+    threshold: float = THRESHOLD,
+) -> int:
+    """
+    Print the mean times and return 1 if a comparison with ``baseline``
+    found a regression, 0 otherwise.
+    """
+    # Explicit sizes replace the defaults of every solver except the naive
+    # one, which cannot get past the smallest boards
+    solvers = [
+        (name, solver_cls, ns if sizes is None or name == "naive" else sizes)
+        for name, solver_cls, ns in SOLVERS
+        if names is None or name in names
+    ]
+    options = {"amo": amo, "symmetry": symmetry}
+
     # Collect all N values
-    all_ns: list[int] = sorted({n for _, _, ns in SOLVERS for n in ns})
+    all_ns: list[int] = sorted({n for _, _, ns in solvers for n in ns})
 
     # Pre-generate CNFs
-    cnfs = {n: make_queens_cnf(n) for n in all_ns}
+    cnfs = {n: make_queens_cnf(n, amo, symmetry) for n in all_ns}
 
     # Run benchmarks
-    results: dict[str, dict[int, float]] = {}
-    for name, solver_cls, ns in SOLVERS:
-        results[name] = {}
+    samples: dict[str, dict[int, list[float]]] = {}
+    for name, solver_cls, ns in solvers:
+        samples[name] = {}
         for n in ns:
-            avg = bench(solver_cls, cnfs[n], runs=runs)
-            results[name][n] = avg
+            samples[name][n] = bench(solver_cls, cnfs[n], runs=runs)
 
     # Print table
-    solver_names = [name for name, _, _ in SOLVERS]
+    solver_names = [name for name, _, _ in solvers]
     col_width = 12
 
     header = f"{'N':>4}"
@@ -68,13 +125,87 @@ def run_benchmark(runs: int) -> None:
     for n in all_ns:
         row = f"{n:>4}"
         for name in solver_names:
-            if n in results[name]:
-                secs = results[name][n]
+            if n in samples[name]:
+                secs = sum(samples[name][n]) / runs
                 row += f"{format_time(secs):>{col_width}}"
             else:
                 row += f"{'--':>{col_width}}"
         print(row)
 
+    if profile_dir is not None:
+        run_profiles(solvers, cnfs, profile_dir, top)
+    if memory:
+        run_memory(solvers, cnfs, top)
+
+    if save is not None:
+        with open(save, "w") as f:
+            save_baseline(samples, options, f)
+
+    if baseline is None:
+        return 0
+    with open(baseline) as f:
+        base, base_options = load_baseline(f)
+    if base_options != options:
+        raise ValueError(f"baseline was run with {base_options}, not {options}")
+    comparisons = compare(base, samples)
+    print(f"\nmedian seconds, compared with {baseline}")
+    print(format_comparisons(comparisons, threshold))
+    regressions = [c for c in comparisons if c.regressed(threshold)]
+    if regressions:
+        print(
+            f"\n{len(regressions)} significant slowdowns of more than {threshold:.0%}"
+        )
+        return 1
+    return 0
+
+
+def run_profiles(solvers, cnfs, profile_dir: str, top: int) -> None:
+    """
+    Write the collapsed stacks of each solver and size to
+    ``<profile_dir>/<solver>-<n>.folded`` and print each solver's hottest
+    functions over all its sizes.
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    for name, solver_cls, ns in solvers:
+        total: pstats.Stats | None = None
+        for n in ns:
+            stats = profile(lambda: solver_cls(cnfs[n]).check())
+            sampler = sample(lambda: solver_cls(cnfs[n]).check())
+            path = os.path.join(profile_dir, f"{name}-{n}.folded")
+            with open(path, "w") as f:
+                sampler.write_collapsed(f)
+            if total is None:
+                total = stats
+            else:
+                total.add(stats)
+
+        assert total is not None
+        print(f"\n{name}: top {top} functions by own time, N = {ns}")
+        print(format_top(top_functions(total, top)))
+
+
+def run_memory(solvers, cnfs, top: int) -> None:
+    """
+    Print the tracemalloc peak and the blocks the solver still holds after
+    its search, then the allocation sites of each solver's largest size.
+    """
+    print(f"\n{'solver':>10}{'N':>6}{'peak':>12}{'held':>12}{'blocks':>10}")
+    worst = {}
+    for name, solver_cls, ns in solvers:
+        for n in ns:
+            report = measure_memory(lambda: solved(solver_cls, cnfs[n]), top)
+            print(
+                f"{name:>10}{n:>6}{format_size(report.peak):>12}"
+                f"{format_size(report.current):>12}{report.blocks:>10}"
+            )
+            worst[name] = (n, report)
+
+    for name, (n, report) in worst.items():
+        print(f"\n{name}: allocation sites held at N = {n}")
+        print(f"{'blocks':>10}{'size':>12}  site")
+        for site, blocks, size in report.sites:
+            print(f"{blocks:>10}{format_size(size):>12}  {site}")
+
 
 def format_time(secs: float) -> str:
     if secs < 0.001:
@@ -84,14 +215,107 @@ def format_time(secs: float) -> str:
     return f"{secs:.2f}s"
 
 
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size}B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f}KiB"
+    return f"{size / (1024 * 1024):.1f}MiB"
+
+
 parser = argparse.ArgumentParser(description="Benchmark SAT solvers on N-Queens")
 parser.add_argument(
     "--runs",
     type=int,
     default=1,
-    help="number of runs to average (default: 1)",
+    help="number of runs to average (default: 1), and samples per size for "
+    "--save and --compare",
+)
+parser.add_argument(
+    "--amo",
+    choices=AMO_ENCODINGS,
+    default=None,
+    help="encode clauses directly with this at-most-one encoding instead of "
+    "transforming the formula with Tseitin",
+)
+parser.add_argument(
+    "--symmetry",
+    action="store_true",
+    help="add a symmetry-breaking clause (requires --amo)",
+)
+parser.add_argument(
+    "--sizes",
+    type=int,
+    nargs="+",
+    default=None,
+    help="board sizes for the indexed and cdcl solvers",
+)
+parser.add_argument(
+    "--solvers",
+    nargs="+",
+    choices=[name for name, _, _ in SOLVERS],
+    default=None,
+    help="solvers to run (default: all)",
+)
+parser.add_argument(
+    "--profile",
+    metavar="DIR",
+    default=None,
+    help="also profile every run, writing collapsed stacks for flame graphs "
+    "to DIR and printing each solver's hottest functions",
+)
+parser.add_argument(
+    "--memory",
+    action="store_true",
+    help="also report tracemalloc peaks and allocation sites",
+)
+parser.add_argument(
+    "--top",
+    type=int,
+    default=TOP_FUNCTIONS,
+    help=f"rows in the profile and memory tables (default: {TOP_FUNCTIONS})",
+)
+parser.add_argument(
+    "--save",
+    metavar="FILE",
+    default=None,
+    help="save every run's time to FILE as a baseline",
+)
+parser.add_argument(
+    "--compare",
+    metavar="FILE",
+    default=None,
+    help="compare with the baseline in FILE and exit with status 1 on a "
+    "significant slowdown",
+)
+parser.add_argument(
+    "--threshold",
+    type=float,
+    default=THRESHOLD,
+    help="relative slowdown of the median that counts as a regression "
+    f"(default: {THRESHOLD})",
 )
 
 if __name__ == "__main__":
     args = parser.parse_args()
-    run_benchmark(args.runs)
+    if args.symmetry and args.amo is None:
+        parser.error("--symmetry requires --amo")
+    if args.compare is not None and args.runs < 2:
+        parser.error("--compare needs at least 2 --runs")
+    try:
+        status = run_benchmark(
+            args.runs,
+            args.amo,
+            args.symmetry,
+            args.sizes,
+            profile_dir=args.profile,
+            memory=args.memory,
+            top=args.top,
+            names=args.solvers,
+            save=args.save,
+            baseline=args.compare,
+            threshold=args.threshold,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(status)
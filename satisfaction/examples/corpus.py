@@ -0,0 +1,377 @@
+"""
+Benchmark solvers on a corpus of DIMACS files.
+
+Every solver/instance pair runs in a fresh process, so a crash, a blown
+memory limit or a runaway search cannot affect the other runs.  The solver
+gets the timeout as its time budget and is killed if it has not answered a
+few seconds after it.  Times are measured in the child and cover parsing and
+solving, not process start-up.
+
+Usage:
+    python -m satisfaction.examples.corpus benchmarks/ --timeout 60
+    python -m satisfaction.examples.corpus benchmarks/ --solvers cdcl indexed \\
+        --jobs 4 --json results.json --csv results.csv --cactus cactus.csv
+"""
+
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import csv
+import json
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext, SpawnContext
+import os
+from pathlib import Path
+import resource
+import sys
+import time
+from typing import Any, Iterable, Iterator, TextIO, cast
+
+from satisfaction.dimacs import read_dimacs
+from satisfaction.solvers.batch import SOLVERS
+from satisfaction.solvers.portfolio import default_context, verify
+from satisfaction.solvers.solver import Budget, Result
+
+DEFAULT_TIMEOUT = 60.0
+# seconds past the timeout before an unresponsive run is killed
+KILL_GRACE = 5.0
+SUFFIXES = (".cnf", ".dimacs")
+
+SOLVED = (Result.SAT.value, Result.UNSAT.value)
+TIMEOUT = "TIMEOUT"
+MEMOUT = "MEMOUT"
+ERROR = "ERROR"
+STATUSES = (*SOLVED, TIMEOUT, MEMOUT, ERROR)
+
+CSV_FIELDS = [
+    "instance",
+    "solver",
+    "status",
+    "time",
+    "memory",
+    "conflicts",
+    "decisions",
+    "propagations",
+    "error",
+]
+
+
+class Record:
+    __slots__ = ("instance", "solver", "status", "time", "memory", "stats", "error")
+
+    instance: str
+    solver: str
+    status: str
+    time: float
+    memory: int
+    stats: dict[str, int]
+    error: str | None
+
+    def __init__(
+        self,
+        instance: str,
+        solver: str,
+        status: str,
+        time: float,
+        memory: int = 0,
+        stats: dict[str, int] | None = None,
+        error: str | None = None,
+    ) -> None:
+        """
+        One run.  ``status`` is one of ``STATUSES``, ``time`` is in seconds
+        and ``memory`` is the child's peak resident set size in bytes (0 if
+        it was killed).
+        """
+        self.instance = instance
+        self.solver = solver
+        self.status = status
+        self.time = time
+        self.memory = memory
+        self.stats = stats or {}
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"Record({self.instance!r}, {self.solver!r}, {self.status}, "
+            f"{self.time:.3f}s)"
+        )
+
+    @property
+    def solved(self) -> bool:
+        return self.status in SOLVED
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "instance": self.instance,
+            "solver": self.solver,
+            "status": self.status,
+            "time": self.time,
+            "memory": self.memory,
+            "stats": self.stats,
+            "error": self.error,
+        }
+
+
+def find_instances(root: str | os.PathLike) -> list[Path]:
+    """
+    The DIMACS files under ``root``, recursively, in sorted order.
+    """
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.suffix in SUFFIXES and p.is_file())
+
+
+def _peak_memory() -> int:
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _solve_instance(
+    conn: Connection, solver: str, path: str, timeout: float, memory_limit: int | None
+) -> None:
+    if memory_limit is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    start = time.perf_counter()
+    try:
+        packed = read_dimacs(path)
+        instance = SOLVERS[solver](packed.to_cnf())
+        instance.budget = Budget(time=max(0.0, timeout - (time.perf_counter() - start)))
+        result = instance.check()
+        elapsed = time.perf_counter() - start
+
+        status, error = result.value, None
+        if result is Result.UNKNOWN:
+            status = TIMEOUT
+        elif result is Result.SAT:
+            encode = packed.table.encode
+            if not verify(packed, [encode(lit) for lit in instance.assignments.els]):
+                status, error = ERROR, "invalid model"
+        conn.send((status, elapsed, _peak_memory(), instance.stats.counters, error))
+    except MemoryError:
+        elapsed = time.perf_counter() - start
+        conn.send((MEMOUT, elapsed, _peak_memory(), {}, None))
+    except Exception as e:
+        elapsed = time.perf_counter() - start
+        conn.send((ERROR, elapsed, _peak_memory(), {}, f"{type(e).__name__}: {e}"))
+
+
+def run_instance(
+    path: str | os.PathLike,
+    solver: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    memory_limit: int | None = None,
+    mp_context: BaseContext | None = None,
+) -> Record:
+    """
+    Solve the DIMACS file at ``path`` with ``solver`` (one of ``SOLVERS``)
+    in a new process, limited to ``timeout`` seconds and ``memory_limit``
+    bytes of address space.
+    """
+    # every concrete context has Process, which BaseContext does not declare
+    ctx = cast(SpawnContext, mp_context or default_context())
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_solve_instance,
+        args=(sender, solver, os.fspath(path), timeout, memory_limit),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout + KILL_GRACE):
+            process.kill()
+            return Record(str(path), solver, TIMEOUT, timeout)
+        try:
+            status, elapsed, memory, stats, error = receiver.recv()
+        except EOFError:
+            process.join()
+            # killed by the kernel, usually for running out of memory
+            return Record(
+                str(path),
+                solver,
+                ERROR,
+                timeout,
+                error=f"exited with code {process.exitcode}",
+            )
+    finally:
+        receiver.close()
+        process.join()
+
+    if status == TIMEOUT or elapsed > timeout:
+        status = TIMEOUT
+        elapsed = timeout
+    return Record(str(path), solver, status, elapsed, memory, stats, error)
+
+
+def run_corpus(
+    paths: Iterable[str | os.PathLike],
+    solvers: Iterable[str],
+    timeout: float = DEFAULT_TIMEOUT,
+    jobs: int = 1,
+    memory_limit: int | None = None,
+    mp_context: BaseContext | None = None,
+) -> Iterator[Record]:
+    """
+    Run every solver on every instance, ``jobs`` at a time, yielding
+    records as they finish.
+    """
+    solvers = list(solvers)
+    for solver in solvers:
+        if solver not in SOLVERS:
+            raise ValueError(
+                f"unknown solver {solver!r}, expected one of {list(SOLVERS)}"
+            )
+    return _stream(
+        paths, solvers, timeout, jobs, memory_limit, mp_context or default_context()
+    )
+
+
+def _stream(
+    paths: Iterable[str | os.PathLike],
+    solvers: list[str],
+    timeout: float,
+    jobs: int,
+    memory_limit: int | None,
+    ctx: BaseContext,
+) -> Iterator[Record]:
+    with ThreadPoolExecutor(jobs) as executor:
+        futures = [
+            executor.submit(run_instance, path, solver, timeout, memory_limit, ctx)
+            for path in paths
+            for solver in solvers
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def par2(records: Iterable[Record], timeout: float) -> dict[str, float]:
+    """
+    Each solver's mean PAR-2 score: its time on solved instances and twice
+    the timeout on the rest.
+    """
+    totals: dict[str, list[float]] = {}
+    for record in records:
+        score = record.time if record.solved else 2 * timeout
+        totals.setdefault(record.solver, []).append(score)
+    return {solver: sum(scores) / len(scores) for solver, scores in totals.items()}
+
+
+def cactus(records: Iterable[Record]) -> dict[str, list[float]]:
+    """
+    Each solver's times on the instances it solved, in increasing order:
+    the ``k``-th time is how long the solver needs to solve ``k + 1``
+    instances when it gets that much time on each.
+    """
+    times: dict[str, list[float]] = {}
+    for record in records:
+        solved = times.setdefault(record.solver, [])
+        if record.solved:
+            solved.append(record.time)
+    for solved in times.values():
+        solved.sort()
+    return times
+
+
+def write_json(records: Iterable[Record], f: TextIO) -> None:
+    json.dump([record.to_dict() for record in records], f, indent=2)
+
+
+def write_csv(records: Iterable[Record], f: TextIO) -> None:
+    writer = csv.DictWriter(f, CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow({**record.to_dict(), **record.stats})
+
+
+def write_cactus(data: dict[str, list[float]], f: TextIO) -> None:
+    writer = csv.writer(f)
+    writer.writerow(["solver", "solved", "time"])
+    for solver, times in data.items():
+        for solved, t in enumerate(times, 1):
+            writer.writerow([solver, solved, t])
+
+
+def summary(records: list[Record], timeout: float) -> str:
+    scores = par2(records, timeout)
+    header = f"{'solver':>10}" + "".join(f"{s:>9}" for s in STATUSES)
+    header += f"{'PAR-2':>10}"
+    lines = [header, "-" * len(header)]
+    for solver, score in scores.items():
+        counts = {status: 0 for status in STATUSES}
+        for record in records:
+            if record.solver == solver:
+                counts[record.status] += 1
+        row = f"{solver:>10}" + "".join(f"{counts[s]:>9}" for s in STATUSES)
+        lines.append(row + f"{score:>10.2f}")
+    return "\n".join(lines)
+
+
+parser = argparse.ArgumentParser(description="Benchmark solvers on DIMACS files")
+parser.add_argument("paths", nargs="+", help="DIMACS files or directories of them")
+parser.add_argument(
+    "--solvers",
+    nargs="+",
+    choices=list(SOLVERS),
+    default=["cdcl"],
+    help="solvers to run (default: cdcl)",
+)
+parser.add_argument(
+    "--timeout",
+    type=float,
+    default=DEFAULT_TIMEOUT,
+    help=f"seconds per run (default: {DEFAULT_TIMEOUT:g})",
+)
+parser.add_argument(
+    "--memory-limit",
+    type=int,
+    default=None,
+    metavar="MB",
+    help="address space limit per run, in megabytes",
+)
+parser.add_argument("--jobs", type=int, default=1, help="runs at a time (default: 1)")
+parser.add_argument("--json", metavar="FILE", help="write every run to FILE")
+parser.add_argument("--csv", metavar="FILE", help="write every run to FILE")
+parser.add_argument(
+    "--cactus", metavar="FILE", help="write solved-count cactus data to FILE"
+)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parser.parse_args(argv)
+    paths = [path for root in args.paths for path in find_instances(root)]
+    if not paths:
+        parser.error("no DIMACS files found")
+    memory_limit = None if args.memory_limit is None else args.memory_limit << 20
+
+    records = []
+    for record in run_corpus(
+        paths, args.solvers, args.timeout, args.jobs, memory_limit
+    ):
+        records.append(record)
+        print(
+            f"{record.solver:>10} {record.status:>8} {record.time:>9.3f}s  "
+            f"{record.instance}",
+            file=sys.stderr,
+        )
+    records.sort(key=lambda record: (record.instance, record.solver))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            write_json(records, f)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            write_csv(records, f)
+    if args.cactus:
+        with open(args.cactus, "w", newline="") as f:
+            write_cactus(cactus(records), f)
+    print(summary(records, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
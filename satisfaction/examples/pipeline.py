@@ -0,0 +1,248 @@
+"""
+Benchmark the stages in front of the search, one at a time.
+
+Each family of formulas goes through the pipeline::
+
+    build     the Expr tree                  (throughput in nodes/s)
+    tseitin   Tseitin(formula).transform()   (input nodes/s)
+    index     indexed.Clauses(cnf)           (clauses/s)
+    cdcl      CDCL(cnf)                      (clauses/s)
+
+Every stage is timed on its own, with the previous stage's output prepared
+beforehand, and its tracemalloc peak is measured in a separate run.  The
+clausal families (``ksat``, ``pigeonhole``) are generated as integers first,
+so ``build`` only times turning them into expressions, and they skip
+``tseitin``, whose input is a formula of nested connectives.
+
+Usage:
+    python -m satisfaction.examples.pipeline
+    python -m satisfaction.examples.pipeline --family ksat --sizes 10000 100000
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, cast
+
+from satisfaction.examples.benchmark import format_size, format_time
+from satisfaction.examples.profiling import measure_memory
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import CNF, And, Connective, Expr, Not, Or, Var
+from satisfaction.generators import Generator, Pigeonhole, RandomKSAT
+from satisfaction.solvers import indexed
+from satisfaction.solvers.cdcl import CDCL
+from satisfaction.tseitin import Tseitin
+from satisfaction.utils import numbered_var
+
+STAGES = ("build", "tseitin", "index", "cdcl")
+CLAUSAL = frozenset({"ksat", "pigeonhole"})
+
+DEFAULT_SIZES = {
+    "queens": [8, 12, 16],
+    "ksat": [1000, 5000, 10_000],
+    "pigeonhole": [10, 20, 30],
+}
+
+
+def count_nodes(expr: Expr) -> int:
+    """
+    The size of ``expr`` as a tree, counting shared subexpressions once
+    per occurrence.
+    """
+    count = 0
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        count += 1
+        match node:
+            case Connective(args):
+                stack.extend(args)
+            case Not(sub_expr):
+                stack.append(sub_expr)
+    return count
+
+
+def clauses_to_expr(generator: Generator, clauses: list[list[int]]) -> CNF:
+    vars = [Var(f"x{v}") for v in range(1, generator.num_vars + 1)]
+    return And(
+        *(
+            Or(*(vars[lit - 1] if lit > 0 else Not(vars[-lit - 1]) for lit in clause))
+            for clause in clauses
+        )
+    )
+
+
+def builder(family: str, size: int) -> Callable[[], Expr]:
+    """
+    A function building the ``size``-th formula of ``family``.
+    """
+    if family == "queens":
+        return Queens(size).get_formula
+
+    generator: Generator
+    if family == "ksat":
+        generator = RandomKSAT.phase_transition(size, seed=0)
+    elif family == "pigeonhole":
+        generator = Pigeonhole(size)
+    else:
+        raise ValueError(f"unknown family {family!r}")
+    clauses = list(generator)
+    return lambda: clauses_to_expr(generator, clauses)
+
+
+class StageResult:
+    __slots__ = ("family", "size", "stage", "seconds", "peak", "items", "unit")
+
+    family: str
+    size: int
+    stage: str
+    seconds: float
+    peak: int
+    items: int
+    unit: str
+
+    def __init__(
+        self,
+        family: str,
+        size: int,
+        stage: str,
+        seconds: float,
+        peak: int,
+        items: int,
+        unit: str,
+    ) -> None:
+        """
+        ``seconds`` is the median time of the stage, ``peak`` its tracemalloc
+        peak in bytes (0 if not measured), and ``items`` the number of
+        ``unit`` (nodes or clauses) it processed.
+        """
+        self.family = family
+        self.size = size
+        self.stage = stage
+        self.seconds = seconds
+        self.peak = peak
+        self.items = items
+        self.unit = unit
+
+    def __repr__(self) -> str:
+        return (
+            f"StageResult({self.family!r}, {self.size}, {self.stage!r}, "
+            f"{self.seconds:.4f}s)"
+        )
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else float("inf")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "family": self.family,
+            "size": self.size,
+            "stage": self.stage,
+            "seconds": self.seconds,
+            "peak": self.peak,
+            "items": self.items,
+            "unit": self.unit,
+            "throughput": self.throughput,
+        }
+
+
+def _run_stage[T](fn: Callable[[], T], runs: int, memory: bool) -> tuple[T, float, int]:
+    times = []
+    result: T
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    peak = measure_memory(fn, top=0).peak if memory else 0
+    return result, statistics.median(times), peak
+
+
+def run_pipeline(
+    family: str, size: int, runs: int = 3, memory: bool = True
+) -> list[StageResult]:
+    build = builder(family, size)
+
+    formula, seconds, peak = _run_stage(build, runs, memory)
+    nodes = count_nodes(formula)
+    results = [StageResult(family, size, "build", seconds, peak, nodes, "nodes")]
+
+    def transform() -> CNF:
+        tseitin = Tseitin(formula, rename_vars=False, name_gen=numbered_var("t", 0))
+        return tseitin.transform()
+
+    cnf: CNF
+    if family in CLAUSAL:
+        # built directly as clauses by ``clauses_to_expr``
+        cnf = cast(CNF, formula)
+    else:
+        cnf, seconds, peak = _run_stage(transform, runs, memory)
+        results.append(
+            StageResult(family, size, "tseitin", seconds, peak, nodes, "nodes")
+        )
+
+    clauses = len(cnf.args)
+    for stage, fn in (
+        ("index", lambda: indexed.Clauses(cnf)),
+        ("cdcl", lambda: CDCL(cnf)),
+    ):
+        _, seconds, peak = _run_stage(fn, runs, memory)
+        results.append(
+            StageResult(family, size, stage, seconds, peak, clauses, "clauses")
+        )
+    return results
+
+
+def format_results(results: list[StageResult]) -> str:
+    header = (
+        f"{'family':>10}{'size':>8}{'stage':>9}{'items':>10}{'time':>10}"
+        f"{'peak':>11}{'throughput':>20}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        throughput = f"{r.throughput:,.0f} {r.unit}/s"
+        lines.append(
+            f"{r.family:>10}{r.size:>8}{r.stage:>9}{r.items:>10}"
+            f"{format_time(r.seconds):>10}{format_size(r.peak):>11}{throughput:>20}"
+        )
+    return "\n".join(lines)
+
+
+parser = argparse.ArgumentParser(description="Benchmark the stages before search")
+parser.add_argument(
+    "--family",
+    nargs="+",
+    choices=list(DEFAULT_SIZES),
+    default=list(DEFAULT_SIZES),
+    help="formula families (default: all)",
+)
+parser.add_argument(
+    "--sizes",
+    type=int,
+    nargs="+",
+    default=None,
+    help="sizes for every family: queens board size, ksat variables or "
+    "pigeonhole holes",
+)
+parser.add_argument(
+    "--runs", type=int, default=3, help="runs per stage, of which the median is kept"
+)
+parser.add_argument(
+    "--no-memory",
+    dest="memory",
+    action="store_false",
+    help="skip the tracemalloc runs",
+)
+parser.add_argument("--json", metavar="FILE", help="also write the results to FILE")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    results = []
+    for family in args.family:
+        for size in args.sizes or DEFAULT_SIZES[family]:
+            results.extend(run_pipeline(family, size, args.runs, args.memory))
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([r.to_dict() for r in results], f, indent=2)
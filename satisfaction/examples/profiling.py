@@ -0,0 +1,184 @@
+"""
+Profiling helpers for the benchmark runner.
+
+``profile`` runs a call under cProfile for exact per-function totals.
+``sample`` runs it again while a background thread samples the calling
+thread's stack, and collapses the stacks into the ``frame;frame;frame count``
+format read by flamegraph.pl, speedscope and inferno.  The two are separate
+runs because cProfile would both slow down the sampled code and, since it
+sees every thread, profile the sampler.  Samples are taken when the sampler
+gets the GIL, so the effective interval is at least
+``sys.getswitchinterval()``.
+
+``measure_memory`` runs a call under tracemalloc and reports the peak and
+the allocation sites of whatever the call's result still holds.
+"""
+
+from __future__ import annotations
+from collections import Counter
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from types import FrameType
+from typing import Any, Callable, TextIO
+
+SAMPLE_INTERVAL = 0.001
+TOP_FUNCTIONS = 15
+# frames of tracemalloc tracebacks kept per allocation site
+MEMORY_FRAMES = 1
+
+
+class Sampler:
+    """
+    Collects the stacks of the thread that enters the ``with`` block.
+    """
+
+    __slots__ = ("interval", "stacks", "_thread_id", "_stop", "_thread")
+
+    interval: float
+    stacks: Counter[str]
+
+    _thread_id: int
+    _stop: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> Sampler:
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        assert self._thread is not None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        stacks, thread_id = self.stacks, self._thread_id
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[_collapse(frame)] += 1
+
+    def write_collapsed(self, f: TextIO) -> None:
+        for stack, count in self.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def _collapse(frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        names.append(f"{code.co_qualname} ({filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def profile(fn: Callable[[], Any]) -> pstats.Stats:
+    profiler = cProfile.Profile()
+    profiler.runcall(fn)
+    return pstats.Stats(profiler)
+
+
+def sample(fn: Callable[[], Any], interval: float = SAMPLE_INTERVAL) -> Sampler:
+    with Sampler(interval) as sampler:
+        fn()
+    return sampler
+
+
+def top_functions(
+    stats: pstats.Stats, n: int = TOP_FUNCTIONS
+) -> list[tuple[str, int, float, float]]:
+    """
+    ``(function, calls, own seconds, cumulative seconds)`` of the ``n``
+    functions with the most time of their own.
+    """
+    rows = []
+    # pstats keeps (primitive calls, calls, own, cumulative, callers) per function
+    for (filename, line, name), entry in stats.stats.items():  # type: ignore[attr-defined]
+        _, calls, own, cumulative, _ = entry
+        where = f"{os.path.basename(filename)}:{line}" if line else filename
+        rows.append((f"{name} ({where})", calls, own, cumulative))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:n]
+
+
+def format_top(rows: list[tuple[str, int, float, float]]) -> str:
+    lines = [f"{'own':>10}{'cumulative':>12}{'calls':>12}  function"]
+    for function, calls, own, cumulative in rows:
+        lines.append(f"{own:>10.4f}{cumulative:>12.4f}{calls:>12}  {function}")
+    return "\n".join(lines)
+
+
+class MemoryReport:
+    __slots__ = ("peak", "current", "blocks", "sites")
+
+    peak: int
+    current: int
+    blocks: int
+    sites: list[tuple[str, int, int]]
+
+    def __init__(
+        self, peak: int, current: int, blocks: int, sites: list[tuple[str, int, int]]
+    ) -> None:
+        self.peak = peak
+        self.current = current
+        self.blocks = blocks
+        self.sites = sites
+
+    def __repr__(self) -> str:
+        return (
+            f"MemoryReport(peak={self.peak}, current={self.current}, "
+            f"blocks={self.blocks})"
+        )
+
+
+def measure_memory(fn: Callable[[], Any], top: int = TOP_FUNCTIONS) -> MemoryReport:
+    """
+    Trace ``fn``'s allocations.  ``current``, ``blocks`` and ``sites``
+    (``(file:line, blocks, bytes)``, most blocks first) describe what is
+    still allocated while ``fn``'s result is alive.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(MEMORY_FRAMES)
+    tracemalloc.clear_traces()
+    tracemalloc.reset_peak()
+    try:
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        del result
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    statistics = snapshot.statistics("lineno")
+    statistics.sort(key=lambda stat: stat.count, reverse=True)
+    sites = [
+        (
+            f"{os.path.basename(stat.traceback[0].filename)}:"
+            f"{stat.traceback[0].lineno}",
+            stat.count,
+            stat.size,
+        )
+        for stat in statistics[:top]
+    ]
+    blocks = sum(stat.count for stat in statistics)
+    return MemoryReport(peak, current, blocks, sites)
@@ -4,7 +4,8 @@ import logging
 import re
 from typing import Iterator
 
-from satisfaction.expr import And, Or, Var
+from satisfaction.cardinality import Encoder
+from satisfaction.expr import CNF, And, Clause, Or, Var
 from satisfaction.solvers.indexed import DPLL
 from satisfaction.tseitin import Tseitin
 from satisfaction.utils import chunks, letters, numbered_var
@@ -63,22 +64,12 @@ class Queens:
         return tuple(self[i, j] for j in range(self.n))
 
     def ldiag(self, i: int) -> tuple[Var, ...]:
-        diag = []
-        for j in range(self.d):
-            try:
-                diag.append(self[j + i, j])
-            except IndexError:
-                pass
-        return tuple(diag)
+        rows = range(max(0, -i), min(self.n, self.n - i))
+        return tuple(self[j + i, j] for j in rows)
 
     def rdiag(self, i: int) -> tuple[Var, ...]:
-        diag = []
-        for j in range(self.d):
-            try:
-                diag.append(self[j + i, self.n - 1 - j])
-            except IndexError:
-                pass
-        return tuple(diag)
+        rows = range(max(0, -i), min(self.n, self.n - i))
+        return tuple(self[j + i, self.n - 1 - j] for j in rows)
 
     def get_formula(self) -> And:
         rows = []
@@ -109,6 +100,38 @@ class Queens:
 
         return one_per_row & one_per_col & at_most_one_per_ldiag & at_most_one_per_rdiag
 
+    def get_cnf(
+        self,
+        amo: str = "sequential",
+        symmetry: bool = False,
+        encoder: Encoder | None = None,
+    ) -> CNF:
+        """
+        Encode the same constraints as ``get_formula`` directly as clauses,
+        using the ``amo`` at-most-one encoding from ``satisfaction.cardinality``
+        for every row, column and diagonal.
+
+        With ``symmetry``, the mirror image of each solution is ruled out by
+        requiring the queen in the first row to be in the left half of the
+        board.
+        """
+        if encoder is None:
+            encoder = Encoder(name_gen=numbered_var("x", 0))
+
+        clauses: list[Clause] = []
+        for i in range(self.n):
+            clauses.extend(encoder.exactly_one(self.row(i), amo))
+        for i in range(self.n):
+            clauses.extend(encoder.exactly_one(self.col(i), amo))
+        for i in range(1 - self.n, self.n):
+            clauses.extend(encoder.at_most_one(self.ldiag(i), amo))
+            clauses.extend(encoder.at_most_one(self.rdiag(i), amo))
+
+        if symmetry:
+            clauses.append(Or(*self.row(0)[: (self.n + 1) // 2]))
+
+        return And(*clauses)
+
 
 def row_repr(row):
     inner = "│".join(lit_repr(lit) for lit in row)
@@ -1,2 +1,6 @@
 class ConflictError(Exception):
     pass
+
+
+class ParseError(ValueError):
+    pass
@@ -102,7 +102,7 @@ class Connective[T: Expr](Expr):
     args: tuple[T, ...]
 
     def __init__(self, *args: T):
-        super().__init__(cast(Any, args))
+        self.args = args
 
 
 class And[T: Expr](Connective[T]):
@@ -0,0 +1,493 @@
+"""
+Seeded generators of benchmark formulas.
+
+Each generator yields its clauses one at a time as lists of DIMACS-style
+integer literals, without building expressions, so an instance of millions
+of clauses can be streamed to a file with ``write_dimacs`` or packed with
+``to_packed`` in memory proportional to its literals.  A generator with the
+same parameters and seed always yields the same clauses, and can be
+iterated any number of times.
+
+Usage:
+    python -m satisfaction.generators ksat 1000 --ratio 4.26 --seed 1 > f.cnf
+    python -m satisfaction.generators pigeonhole 8 > php8.cnf
+"""
+
+from __future__ import annotations
+import abc
+from array import array
+import argparse
+import itertools
+import math
+import random
+import sys
+from typing import BinaryIO, Iterator
+
+from satisfaction.expr import CNF
+from satisfaction.packed import PackedCNF
+
+# clauses-to-variables ratio at which uniform random k-SAT goes from mostly
+# satisfiable to mostly unsatisfiable (Mertens, Mézard and Zecchina, 2006)
+PHASE_TRANSITION = {
+    2: 1.0,
+    3: 4.267,
+    4: 9.931,
+    5: 21.117,
+    6: 43.37,
+    7: 87.79,
+}
+
+# clauses written to a file per call to ``write``
+WRITE_CHUNK = 1 << 12
+
+
+def _resolve_seed(seed: int | None) -> int:
+    # draw a missing seed once so that every iteration yields the same clauses
+    return random.randrange(2**63) if seed is None else seed
+
+
+class Generator(abc.ABC):
+    """
+    Base class of the generators.  Subclasses set ``num_vars`` and
+    implement ``__iter__``, and override ``num_clauses`` when they can
+    count their clauses without generating them.
+    """
+
+    __slots__ = ("num_vars",)
+
+    num_vars: int
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[list[int]]: ...
+
+    @property
+    def num_clauses(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_packed(self) -> PackedCNF:
+        """
+        The formula, with variable ``n`` named ``x<n>`` as in ``dimacs``.
+        """
+        lits = array("i")
+        offsets = array("q", [0])
+        for clause in self:
+            lits.extend(clause)
+            offsets.append(len(lits))
+
+        names = "\n".join(f"x{v}" for v in range(1, self.num_vars + 1)).encode()
+        return PackedCNF(
+            memoryview(lits),
+            memoryview(offsets),
+            memoryview(bytes(self.num_vars)),
+            memoryview(names),
+        )
+
+    def to_cnf(self) -> CNF:
+        return self.to_packed().to_cnf()
+
+    def write_dimacs(self, f: BinaryIO) -> None:
+        f.write(f"p cnf {self.num_vars} {self.num_clauses}\n".encode())
+        for chunk in itertools.batched(self, WRITE_CHUNK):
+            f.write(
+                b"".join(
+                    " ".join(map(str, clause)).encode() + b" 0\n" for clause in chunk
+                )
+            )
+
+
+class RandomKSAT(Generator):
+    """
+    ``num_clauses`` clauses, each of ``k`` distinct variables chosen
+    uniformly at random, each negated with probability 1/2.
+    """
+
+    __slots__ = ("clauses", "k", "seed")
+
+    clauses: int
+    k: int
+    seed: int
+
+    def __init__(
+        self, num_vars: int, num_clauses: int, k: int = 3, seed: int | None = None
+    ) -> None:
+        if not 1 <= k <= num_vars:
+            raise ValueError(f"cannot pick {k} distinct variables of {num_vars}")
+        self.num_vars = num_vars
+        self.clauses = num_clauses
+        self.k = k
+        self.seed = _resolve_seed(seed)
+
+    @classmethod
+    def phase_transition(
+        cls, num_vars: int, k: int = 3, seed: int | None = None
+    ) -> RandomKSAT:
+        """
+        An instance at the satisfiability threshold, where random formulas
+        are hardest.
+        """
+        if k not in PHASE_TRANSITION:
+            raise ValueError(f"no known threshold for k = {k}")
+        return cls(num_vars, round(PHASE_TRANSITION[k] * num_vars), k, seed)
+
+    @property
+    def num_clauses(self) -> int:
+        return self.clauses
+
+    def __iter__(self) -> Iterator[list[int]]:
+        rng = random.Random(self.seed)
+        sample, getrandbits = rng.sample, rng.getrandbits
+        variables = range(1, self.num_vars + 1)
+        k = self.k
+        for _ in range(self.clauses):
+            signs = getrandbits(k)
+            yield [
+                -v if signs >> i & 1 else v for i, v in enumerate(sample(variables, k))
+            ]
+
+
+class Pigeonhole(Generator):
+    """
+    ``pigeons`` pigeons (default: one more than the holes) in ``holes``
+    holes, no two in the same hole.  Unsatisfiable when there are more
+    pigeons than holes, and exponentially hard for resolution.  Variable
+    ``p * holes + h + 1`` puts pigeon ``p`` in hole ``h``.
+    """
+
+    __slots__ = ("holes", "pigeons")
+
+    holes: int
+    pigeons: int
+
+    def __init__(self, holes: int, pigeons: int | None = None) -> None:
+        self.holes = holes
+        self.pigeons = holes + 1 if pigeons is None else pigeons
+        self.num_vars = self.pigeons * holes
+
+    @property
+    def num_clauses(self) -> int:
+        return self.pigeons + self.holes * math.comb(self.pigeons, 2)
+
+    def __iter__(self) -> Iterator[list[int]]:
+        holes = self.holes
+        for p in range(self.pigeons):
+            yield list(range(p * holes + 1, (p + 1) * holes + 1))
+        for h in range(holes):
+            for a, b in itertools.combinations(range(self.pigeons), 2):
+                yield [-(a * holes + h + 1), -(b * holes + h + 1)]
+
+
+def _xor3(a: int, b: int, c: int) -> Iterator[list[int]]:
+    # c = a xor b
+    yield [-a, -b, -c]
+    yield [a, b, -c]
+    yield [a, -b, c]
+    yield [-a, b, c]
+
+
+class XorChains(Generator):
+    """
+    Two chains of XORs computing the parity of the same ``num_vars``
+    variables, the second in a random order, required to be different (or,
+    if ``satisfiable``, equal).  Each link of a chain is a fresh variable
+    defined by four clauses.  The unsatisfiable instances are small but
+    hard for solvers without XOR reasoning.
+    """
+
+    __slots__ = ("size", "satisfiable", "seed")
+
+    size: int
+    satisfiable: bool
+    seed: int
+
+    def __init__(
+        self, num_vars: int, satisfiable: bool = False, seed: int | None = None
+    ) -> None:
+        if num_vars < 2:
+            raise ValueError("a chain needs at least 2 variables")
+        self.size = num_vars
+        self.satisfiable = satisfiable
+        self.seed = _resolve_seed(seed)
+        self.num_vars = num_vars + 2 * (num_vars - 1)
+
+    @property
+    def num_clauses(self) -> int:
+        return 2 * (4 * (self.size - 1)) + 2
+
+    def __iter__(self) -> Iterator[list[int]]:
+        n = self.size
+        order = list(range(1, n + 1))
+        random.Random(self.seed).shuffle(order)
+
+        next_var = n + 1
+        outputs = []
+        for chain in (range(1, n + 1), order):
+            acc = chain[0]
+            for v in chain[1:]:
+                yield from _xor3(acc, v, next_var)
+                acc = next_var
+                next_var += 1
+            outputs.append(acc)
+
+        a, b = outputs
+        if self.satisfiable:
+            yield [-a, b]
+            yield [a, -b]
+        else:
+            yield [a, b]
+            yield [-a, -b]
+
+
+class GraphColoring(Generator):
+    """
+    Color a random graph of ``nodes`` nodes and ``edges`` distinct edges,
+    chosen uniformly, with ``colors`` colors so that neighbours differ.
+    Variable ``v * colors + c + 1`` gives node ``v`` color ``c``.  The
+    edges are drawn once, up front.
+    """
+
+    __slots__ = ("nodes", "colors", "edges", "seed", "_edges")
+
+    nodes: int
+    colors: int
+    edges: int
+    seed: int
+
+    _edges: array[int] | None
+
+    def __init__(
+        self, nodes: int, edges: int, colors: int, seed: int | None = None
+    ) -> None:
+        if edges > math.comb(nodes, 2):
+            raise ValueError(
+                f"a graph of {nodes} nodes has at most {math.comb(nodes, 2)} edges"
+            )
+        self.nodes = nodes
+        self.edges = edges
+        self.colors = colors
+        self.seed = _resolve_seed(seed)
+        self.num_vars = nodes * colors
+        self._edges = None
+
+    @classmethod
+    def with_degree(
+        cls, nodes: int, degree: float, colors: int, seed: int | None = None
+    ) -> GraphColoring:
+        """
+        A graph whose nodes have ``degree`` neighbours on average.
+        """
+        return cls(nodes, round(nodes * degree / 2), colors, seed)
+
+    @property
+    def num_clauses(self) -> int:
+        return self.nodes * (1 + math.comb(self.colors, 2)) + self.edges * self.colors
+
+    def edge_list(self) -> array[int]:
+        """
+        The edges, as ``u * nodes + v`` with ``u < v``.
+        """
+        if self._edges is None:
+            rng = random.Random(self.seed)
+            n = self.nodes
+            seen: set[int] = set()
+            edges = array("q")
+            while len(edges) < self.edges:
+                u, v = rng.randrange(n), rng.randrange(n)
+                if u == v:
+                    continue
+                key = min(u, v) * n + max(u, v)
+                if key not in seen:
+                    seen.add(key)
+                    edges.append(key)
+            self._edges = edges
+        return self._edges
+
+    def __iter__(self) -> Iterator[list[int]]:
+        k = self.colors
+        for v in range(self.nodes):
+            first = v * k + 1
+            yield list(range(first, first + k))
+            for a, b in itertools.combinations(range(first, first + k), 2):
+                yield [-a, -b]
+
+        n = self.nodes
+        for key in self.edge_list():
+            u, v = divmod(key, n)
+            for c in range(1, k + 1):
+                yield [-(u * k + c), -(v * k + c)]
+
+
+class Sudoku(Generator):
+    """
+    A Sudoku of ``box`` by ``box`` boxes (``box = 3`` is the usual 9 by 9)
+    with ``givens`` cells of a random solved grid filled in.  The puzzle is
+    always satisfiable, though not necessarily uniquely.  Alternatively,
+    ``puzzle`` gives the cells row by row, with ``0`` or ``.`` for blanks,
+    for boxes of at most 3.  Variable ``(r * n + c) * n + d`` puts digit
+    ``d`` (from 1) in row ``r``, column ``c``.
+    """
+
+    __slots__ = ("box", "size", "givens", "seed", "puzzle")
+
+    box: int
+    size: int
+    givens: int
+    seed: int
+    puzzle: list[int] | None
+
+    def __init__(
+        self,
+        box: int = 3,
+        givens: int = 0,
+        seed: int | None = None,
+        puzzle: str | None = None,
+    ) -> None:
+        n = box * box
+        self.box = box
+        self.size = n
+        self.seed = _resolve_seed(seed)
+        self.num_vars = n**3
+        self.puzzle = None
+        if puzzle is not None:
+            if box > 3:
+                raise ValueError("puzzles can only be given for boxes of at most 3")
+            cells = [c for c in puzzle if not c.isspace()]
+            allowed = ".0" + "".join(map(str, range(1, n + 1)))
+            if len(cells) != n * n or any(c not in allowed for c in cells):
+                raise ValueError(f"expected {n * n} cells of digits 1-{n}, 0 or .")
+            self.puzzle = [0 if c == "." else int(c) for c in cells]
+            givens = sum(1 for d in self.puzzle if d)
+        if not 0 <= givens <= n * n:
+            raise ValueError(f"a {n} by {n} grid has {n * n} cells")
+        self.givens = givens
+
+    @property
+    def num_clauses(self) -> int:
+        n = self.size
+        # exactly one digit per cell, each digit exactly once per unit
+        return 4 * n * n * (1 + math.comb(n, 2)) + self.givens
+
+    def solution(self) -> list[int]:
+        """
+        A random solved grid: the standard pattern with rows and columns
+        shuffled within and between bands, and digits relabelled.
+        """
+        return self._solution(random.Random(self.seed))
+
+    def _solution(self, rng: random.Random) -> list[int]:
+        box, n = self.box, self.size
+
+        def shuffled(xs: range) -> list[int]:
+            xs_list = list(xs)
+            rng.shuffle(xs_list)
+            return xs_list
+
+        bands = shuffled(range(box))
+        rows = [b * box + r for b in bands for r in shuffled(range(box))]
+        stacks = shuffled(range(box))
+        cols = [s * box + c for s in stacks for c in shuffled(range(box))]
+        digits = shuffled(range(1, n + 1))
+        return [
+            digits[(box * (r % box) + r // box + c) % n] for r in rows for c in cols
+        ]
+
+    def __iter__(self) -> Iterator[list[int]]:
+        n = self.size
+        box = self.box
+
+        def var(r: int, c: int, d: int) -> int:
+            return (r * n + c) * n + d
+
+        def exactly_one(lits: list[int]) -> Iterator[list[int]]:
+            yield lits
+            for a, b in itertools.combinations(lits, 2):
+                yield [-a, -b]
+
+        digits = range(1, n + 1)
+        for r in range(n):
+            for c in range(n):
+                yield from exactly_one([var(r, c, d) for d in digits])
+        for d in digits:
+            for r in range(n):
+                yield from exactly_one([var(r, c, d) for c in range(n)])
+            for c in range(n):
+                yield from exactly_one([var(r, c, d) for r in range(n)])
+            for b in range(n):
+                top, left = b // box * box, b % box * box
+                yield from exactly_one(
+                    [var(top + i // box, left + i % box, d) for i in range(n)]
+                )
+
+        if self.puzzle is not None:
+            cells = [(i, d) for i, d in enumerate(self.puzzle) if d]
+        else:
+            rng = random.Random(self.seed)
+            grid = self._solution(rng)
+            cells = [(i, grid[i]) for i in rng.sample(range(n * n), self.givens)]
+        for i, d in cells:
+            yield [var(i // n, i % n, d)]
+
+
+parser = argparse.ArgumentParser(description="Write a generated formula as DIMACS")
+parser.add_argument("--seed", type=int, default=None, help="random seed")
+subparsers = parser.add_subparsers(dest="family", required=True)
+
+ksat = subparsers.add_parser("ksat", help="uniform random k-SAT")
+ksat.add_argument("vars", type=int)
+ksat.add_argument("--k", type=int, default=3)
+ksat_size = ksat.add_mutually_exclusive_group()
+ksat_size.add_argument("--clauses", type=int, help="number of clauses")
+ksat_size.add_argument(
+    "--ratio", type=float, help="clauses per variable (default: the threshold)"
+)
+
+php = subparsers.add_parser("pigeonhole", help="pigeonhole principle")
+php.add_argument("holes", type=int)
+php.add_argument("--pigeons", type=int, default=None)
+
+xor = subparsers.add_parser("xor", help="two XOR chains over the same variables")
+xor.add_argument("vars", type=int)
+xor.add_argument("--sat", action="store_true", help="make the chains agree")
+
+coloring = subparsers.add_parser("coloring", help="random graph coloring")
+coloring.add_argument("nodes", type=int)
+coloring.add_argument("--degree", type=float, default=4.0, help="average degree")
+coloring.add_argument("--colors", type=int, default=3)
+
+sudoku = subparsers.add_parser("sudoku", help="Sudoku")
+sudoku.add_argument("--box", type=int, default=3, help="box size (default: 3)")
+sudoku.add_argument("--givens", type=int, default=0, help="cells filled in")
+sudoku.add_argument("--puzzle", default=None, help="the cells, row by row")
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parser.parse_args(argv)
+    generator: Generator
+    try:
+        match args.family:
+            case "ksat":
+                if args.clauses is not None:
+                    generator = RandomKSAT(args.vars, args.clauses, args.k, args.seed)
+                elif args.ratio is not None:
+                    clauses = round(args.ratio * args.vars)
+                    generator = RandomKSAT(args.vars, clauses, args.k, args.seed)
+                else:
+                    generator = RandomKSAT.phase_transition(
+                        args.vars, args.k, args.seed
+                    )
+            case "pigeonhole":
+                generator = Pigeonhole(args.holes, args.pigeons)
+            case "xor":
+                generator = XorChains(args.vars, args.sat, args.seed)
+            case "coloring":
+                generator = GraphColoring.with_degree(
+                    args.nodes, args.degree, args.colors, args.seed
+                )
+            case _:
+                generator = Sudoku(args.box, args.givens, args.seed, args.puzzle)
+    except ValueError as e:
+        parser.error(str(e))
+    generator.write_dimacs(sys.stdout.buffer)
+
+
+if __name__ == "__main__":
+    main()
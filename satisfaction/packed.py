@@ -0,0 +1,332 @@
+"""
+Compact binary container for CNF formulas.
+
+Layout (little-endian, sections aligned to 8 bytes)::
+
+    header   magic, num_vars, num_clauses, num_lits, names_size
+    lits     int32[num_lits]           DIMACS-style literals (+v / -v)
+    offsets  int64[num_clauses + 1]    clause i is lits[offsets[i]:offsets[i + 1]]
+    flags    uint8[num_vars]           1 if the variable is generated
+    names    utf-8, newline separated  name of variable v at line v - 1
+                                       (names may not contain newlines)
+
+Loading maps the file and casts the sections in place, so no clause data is
+copied or decoded until it is used.  On big-endian machines the integer
+sections are byte-swapped on the way in and out, which costs a copy.
+"""
+
+from __future__ import annotations
+from array import array
+import mmap
+import os
+import struct
+import sys
+from typing import BinaryIO, Iterable, Iterator, cast
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, CNF, Clause, Lit, Not, Or, Var
+
+MAGIC = b"SATCNF01"
+HEADER = struct.Struct("<8sQQQQ")
+
+# flush streamed literals to disk in chunks of this many
+WRITE_CHUNK = 1 << 16
+
+# the file is little-endian while arrays and memoryview casts use the native
+# byte order
+BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _swapped(data: memoryview, code: str) -> array:
+    items = array(code)
+    items.frombytes(data)
+    items.byteswap()
+    return items
+
+
+class VarTable:
+    """
+    Bidirectional mapping between variables and DIMACS-style integers.
+    Variables are numbered from 1 in the order they are first seen.
+
+    The index is keyed by ``(name, generated)`` rather than by ``Var`` since
+    hashing a tuple of builtins is much cheaper than ``Expr.__hash__``.
+    """
+
+    __slots__ = ("vars", "index")
+
+    vars: list[Var]
+    index: dict[tuple[str, bool], int]
+
+    def __init__(self, vars: Iterable[Var] = ()) -> None:
+        self.vars = []
+        self.index = {}
+        for var in vars:
+            self.number(var)
+
+    def __len__(self) -> int:
+        return len(self.vars)
+
+    def number(self, var: Var) -> int:
+        key = (var.name, var.generated)
+        try:
+            return self.index[key]
+        except KeyError:
+            # names are stored one per line
+            if "\n" in var.name:
+                raise ValueError(
+                    f"cannot number {var.name!r}: names must not contain newlines"
+                ) from None
+            self.vars.append(var)
+            n = self.index[key] = len(self.vars)
+            return n
+
+    def encode(self, lit: Lit) -> int:
+        if type(lit) is Var:
+            return self.number(lit)
+        return -self.number(cast(Not[Var], lit).expr)
+
+    def encode_clause(self, clause: Clause) -> list[int]:
+        return [self.encode(lit) for lit in clause.args]
+
+    def decode(self, lit: int) -> Lit:
+        var = self.vars[abs(lit) - 1]
+        return var if lit > 0 else Not(var)
+
+    def decode_clause(self, lits: Iterable[int]) -> Clause:
+        return Or(*(self.decode(lit) for lit in lits))
+
+
+class PackedCNF:
+    __slots__ = (
+        "lits",
+        "offsets",
+        "flags",
+        "names_blob",
+        "_table",
+        "_mmap",
+    )
+
+    lits: memoryview
+    offsets: memoryview
+    flags: memoryview
+    names_blob: memoryview
+
+    _table: VarTable | None
+    _mmap: mmap.mmap | None
+
+    def __init__(
+        self,
+        lits: memoryview,
+        offsets: memoryview,
+        flags: memoryview,
+        names_blob: memoryview,
+        table: VarTable | None = None,
+        mm: mmap.mmap | None = None,
+    ) -> None:
+        self.lits = lits
+        self.offsets = offsets
+        self.flags = flags
+        self.names_blob = names_blob
+        self._table = table
+        self._mmap = mm
+
+    @classmethod
+    def from_clauses(cls, clauses: Iterable[Clause]) -> PackedCNF:
+        table = VarTable()
+        lits = array("i")
+        offsets = array("q", [0])
+        for clause in clauses:
+            lits.extend(table.encode_clause(clause))
+            offsets.append(len(lits))
+
+        flags = bytes(var.generated for var in table.vars)
+        names = "\n".join(var.name for var in table.vars).encode()
+        return cls(
+            memoryview(lits),
+            memoryview(offsets),
+            memoryview(flags),
+            memoryview(names),
+            table=table,
+        )
+
+    @classmethod
+    def from_cnf(cls, cnf: CNF) -> PackedCNF:
+        return cls.from_clauses(cnf.args)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes | bytearray | memoryview | mmap.mmap) -> PackedCNF:
+        """
+        Wrap a packed buffer without copying it.
+        """
+        view = memoryview(buf)
+        if len(view) < HEADER.size:
+            raise ParseError("truncated packed CNF header")
+
+        magic, num_vars, num_clauses, num_lits, names_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ParseError("not a packed CNF buffer")
+
+        lits_at = HEADER.size
+        offsets_at = _align(lits_at + 4 * num_lits)
+        flags_at = offsets_at + 8 * (num_clauses + 1)
+        names_at = flags_at + num_vars
+        end = names_at + names_size
+        if len(view) < end:
+            raise ParseError("truncated packed CNF data")
+
+        lits = view[lits_at : lits_at + 4 * num_lits]
+        offsets = view[offsets_at:flags_at]
+        if BIG_ENDIAN:
+            lits = memoryview(_swapped(lits, "i"))
+            offsets = memoryview(_swapped(offsets, "q"))
+        else:
+            lits = lits.cast("i")
+            offsets = offsets.cast("q")
+        return cls(
+            lits,
+            offsets,
+            view[flags_at:names_at],
+            view[names_at:end],
+            mm=buf if isinstance(buf, mmap.mmap) else None,
+        )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> PackedCNF:
+        """
+        Memory-map a packed file.  Call ``close()`` (or use the instance as a
+        context manager) to release the mapping.
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_bytes(mm)
+
+    def close(self) -> None:
+        if self._mmap is None:
+            return
+
+        for view in (self.lits, self.offsets, self.flags, self.names_blob):
+            view.release()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self) -> PackedCNF:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def num_vars(self) -> int:
+        return len(self.flags)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def clause(self, i: int) -> memoryview:
+        return self.lits[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        lits, offsets = self.lits, self.offsets
+        start = offsets[0]
+        for i in range(1, len(offsets)):
+            end = offsets[i]
+            yield lits[start:end]
+            start = end
+
+    @property
+    def table(self) -> VarTable:
+        """
+        The variable table, decoded from the names section on first use.
+        """
+        if self._table is None:
+            names = bytes(self.names_blob).decode().split("\n")
+            if len(self.flags) == 0:
+                names = []
+            flags = self.flags
+            self._table = VarTable(
+                Var(name, generated=bool(flags[i])) for i, name in enumerate(names)
+            )
+        return self._table
+
+    def to_cnf(self) -> CNF:
+        decode = self.table.decode_clause
+        return And(*(decode(lits) for lits in self))
+
+    def header(self) -> bytes:
+        return HEADER.pack(
+            MAGIC,
+            self.num_vars,
+            len(self),
+            len(self.lits),
+            len(self.names_blob),
+        )
+
+    def sections(self) -> Iterator[bytes | memoryview]:
+        lits_end = HEADER.size + self.lits.nbytes
+        yield self.header()
+        if BIG_ENDIAN:
+            yield _swapped(self.lits.cast("B"), "i").tobytes()
+            yield bytes(_align(lits_end) - lits_end)
+            yield _swapped(self.offsets.cast("B"), "q").tobytes()
+        else:
+            yield self.lits.cast("B")
+            yield bytes(_align(lits_end) - lits_end)
+            yield self.offsets.cast("B")
+        yield self.flags
+        yield self.names_blob
+
+    def dump(self, f: BinaryIO) -> None:
+        for section in self.sections():
+            f.write(section)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self.sections())
+
+
+def _write_array(items: array, f: BinaryIO) -> None:
+    if BIG_ENDIAN:
+        items = array(items.typecode, items)
+        items.byteswap()
+    items.tofile(f)
+
+
+def write_packed(path: str | os.PathLike, clauses: Iterable[Clause]) -> int:
+    """
+    Stream clauses into a packed file without holding the literals in memory.
+    Returns the number of clauses written.
+    """
+    table = VarTable()
+    offsets = array("q", [0])
+    chunk = array("i")
+    num_lits = 0
+
+    with open(path, "wb") as f:
+        f.write(bytes(HEADER.size))
+
+        for clause in clauses:
+            chunk.extend(table.encode_clause(clause))
+            offsets.append(num_lits + len(chunk))
+            if len(chunk) >= WRITE_CHUNK:
+                num_lits += len(chunk)
+                _write_array(chunk, f)
+                del chunk[:]
+
+        num_lits += len(chunk)
+        _write_array(chunk, f)
+
+        lits_end = HEADER.size + 4 * num_lits
+        f.write(bytes(_align(lits_end) - lits_end))
+        _write_array(offsets, f)
+        f.write(bytes(var.generated for var in table.vars))
+        names = "\n".join(var.name for var in table.vars).encode()
+        f.write(names)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(table), len(offsets) - 1, num_lits, len(names)))
+
+    return len(offsets) - 1
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import re
+from typing import Any, Iterable, Iterator, NoReturn, TextIO, cast
+
+from satisfaction import format
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, BinOp, Expr, Not, Var
+
+LPAREN = "("
+RPAREN = ")"
+END = ""
+
+
+class Parser:
+    """
+    Single-pass tokenizer and precedence-climbing parser for the notations
+    produced by ``satisfaction.format``.
+
+    Binding strength is taken from ``Expr.precedence``.  Chains of ``&`` and
+    ``|`` are collected into a single n-ary ``And``/``Or`` while parenthesized
+    groups are kept nested, so ``parse(format(expr)) == expr``.  ``->`` and
+    ``<->`` associate to the right.
+    """
+
+    __slots__ = ("symbols", "token_re")
+
+    symbols: dict[str, type[Expr]]
+    token_re: re.Pattern[str]
+
+    def __init__(self, *symbol_tables: dict[type[Expr], str]) -> None:
+        self.symbols = {}
+        for table in symbol_tables:
+            for expr_type, symbol in table.items():
+                self.symbols[symbol.strip()] = expr_type
+
+        # longest symbols first so that e.g. "<->" wins over "->"
+        ops = sorted(self.symbols, key=lambda op: len(op), reverse=True)
+        ops_re = "|".join(re.escape(op) for op in ops + [LPAREN, RPAREN])
+        self.token_re = re.compile(rf"\s*(?:(\w+)|({ops_re})|(\S))")
+
+    def tokenize(self, text: str) -> Iterator[tuple[str, int]]:
+        """
+        Yield ``(token, position)`` pairs.  Names are yielded as-is, operators
+        are yielded as their symbol and the end of input is yielded as ``""``.
+        """
+        for match in self.token_re.finditer(text):
+            name, op, bad = match.groups()
+            if bad is not None:
+                raise ParseError(f"unexpected character {bad!r} at {match.start(3)}")
+            yield name or op, match.start(1 if name else 2)
+
+        yield END, len(text)
+
+    def parse(self, text: str, names: dict[str, Var] | None = None) -> Expr:
+        """
+        Parse a single formula.  Variables with the same name are shared
+        through ``names``, which may be passed in to share them across calls.
+        """
+        if names is None:
+            names = {}
+
+        state = _ParseState(self, text, names)
+        expr = state.expr(0)
+        if state.tok != END:
+            state.error("expected end of input")
+
+        return expr
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[Expr]:
+        """
+        Lazily parse one formula per line.  Blank lines and lines starting
+        with ``#`` are skipped.
+        """
+        names: dict[str, Var] = {}
+        for lineno, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+
+            try:
+                yield self.parse(stripped, names)
+            except ParseError as e:
+                raise ParseError(f"line {lineno}: {e}") from None
+
+    def read(self, file: TextIO) -> And:
+        """
+        Read a file of formulas (one per line) as their conjunction.
+        """
+        return And(*self.parse_lines(file))
+
+
+class _ParseState:
+    __slots__ = ("parser", "names", "tokens", "tok", "pos")
+
+    parser: Parser
+    names: dict[str, Var]
+    tokens: Iterator[tuple[str, int]]
+    tok: str
+    pos: int
+
+    def __init__(self, parser: Parser, text: str, names: dict[str, Var]) -> None:
+        self.parser = parser
+        self.names = names
+        self.tokens = parser.tokenize(text)
+        self.advance()
+
+    def advance(self) -> None:
+        self.tok, self.pos = next(self.tokens)
+
+    def error(self, msg: str) -> NoReturn:
+        found = repr(self.tok) if self.tok != END else "end of input"
+        raise ParseError(f"{msg} at {self.pos}, found {found}")
+
+    def op(self) -> type[Expr] | None:
+        return self.parser.symbols.get(self.tok)
+
+    def expr(self, min_prec: int) -> Expr:
+        lhs = self.unary()
+
+        while (op := self.op()) is not None and op is not Not:
+            prec = cast(int, op.precedence)
+            if prec < min_prec:
+                break
+
+            if issubclass(op, BinOp):
+                # right associative
+                self.advance()
+                lhs = cast(Any, op)(lhs, self.expr(prec))
+            else:
+                # flatten chains of the same connective into one n-ary node
+                args = [lhs]
+                while self.op() is op:
+                    self.advance()
+                    args.append(self.expr(prec + 1))
+                lhs = cast(Any, op)(*args)
+
+        return lhs
+
+    def unary(self) -> Expr:
+        tok = self.tok
+
+        if self.op() is Not:
+            self.advance()
+            return Not(self.unary())
+
+        if tok == LPAREN:
+            self.advance()
+            expr = self.expr(0)
+            if self.tok != RPAREN:
+                self.error("expected ')'")
+            self.advance()
+            return expr
+
+        if tok and (tok[0].isalnum() or tok[0] == "_"):
+            self.advance()
+            try:
+                return self.names[tok]
+            except KeyError:
+                var = self.names[tok] = Var(tok)
+                return var
+
+        self.error("expected variable, '~' or '('")
+
+
+pythonic = Parser(format.pythonic.symbols)
+standard = Parser(format.standard.symbols)
+
+parser = Parser(format.pythonic.symbols, format.standard.symbols)
+
+
+def parse_expr(text: str) -> Expr:
+    return parser.parse(text)
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[Expr]:
+    return parser.parse_lines(lines)
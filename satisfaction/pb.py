@@ -0,0 +1,314 @@
+"""
+Clause encodings of linear pseudo-Boolean constraints ``Σ wᵢxᵢ ≤ k``.
+
+Constraints are first normalized to positive weights (``w·x`` with ``w < 0``
+is rewritten as ``|w|·~x - |w|``), terms that can never be true are fixed to
+false and trivially satisfied constraints produce no clauses at all.  What
+remains is encoded with one of:
+
+* ``bdd``: a decision diagram over the terms in descending weight order with
+  shared nodes, one auxiliary variable per node (Eén & Sörensson 2006)
+* ``gte``: a generalized totalizer that counts reachable sums up to ``k + 1``
+  (Joshi, Martins & Manquinho 2015)
+* ``adder``: a network of binary adders and a comparator against ``k``
+
+With ``encoding="auto"`` the choice is made from the coefficient structure;
+see ``choose_encoding``.
+"""
+
+from __future__ import annotations
+from typing import Sequence
+
+from satisfaction.cardinality import Encoder
+from satisfaction.expr import Clause, Lit, Or
+
+type Term = tuple[int, Lit]
+
+PB_ENCODINGS = ("auto", "bdd", "gte", "adder")
+
+# use the generalized totalizer when there are at most this many distinct
+# weights, since the number of distinct partial sums stays small
+GTE_MAX_WEIGHTS = 4
+
+# use the decision diagram while its worst-case size n * (k + 1) is at most
+# this, and binary adders beyond it
+BDD_MAX_NODES = 100_000
+
+
+def choose_encoding(weights: Sequence[int], k: int) -> str:
+    """
+    Pick an encoding for normalized positive ``weights`` and bound ``k``.
+    Equal weights are a cardinality constraint and are handled separately.
+    """
+    if len(set(weights)) <= GTE_MAX_WEIGHTS:
+        return "gte"
+    if len(weights) * (k + 1) <= BDD_MAX_NODES:
+        return "bdd"
+    return "adder"
+
+
+class PBEncoder(Encoder):
+    __slots__ = ()
+
+    def at_most(
+        self, terms: Sequence[Term], k: int, encoding: str = "auto"
+    ) -> list[Clause]:
+        if encoding not in PB_ENCODINGS:
+            raise ValueError(f"unsupported pseudo-Boolean encoding: {encoding}")
+
+        clauses: list[Clause] = []
+        terms, k = self.normalize(terms, k, clauses)
+        if k < 0:
+            return [Or()]
+        if sum(w for w, _ in terms) <= k:
+            return clauses
+
+        weights = [w for w, _ in terms]
+        lits = [lit for _, lit in terms]
+        if encoding == "auto":
+            if len(set(weights)) == 1:
+                clauses.extend(self.at_most_k(lits, k // weights[0], "totalizer"))
+                return clauses
+            encoding = choose_encoding(weights, k)
+
+        match encoding:
+            case "bdd":
+                clauses.extend(self._pb_bdd(terms, k))
+            case "gte":
+                clauses.extend(self._pb_gte(terms, k))
+            case "adder":
+                clauses.extend(self._pb_adder(terms, k))
+
+        return clauses
+
+    def at_least(
+        self, terms: Sequence[Term], k: int, encoding: str = "auto"
+    ) -> list[Clause]:
+        return self.at_most([(-w, lit) for w, lit in terms], -k, encoding)
+
+    def exactly(
+        self, terms: Sequence[Term], k: int, encoding: str = "auto"
+    ) -> list[Clause]:
+        return self.at_most(terms, k, encoding) + self.at_least(terms, k, encoding)
+
+    @staticmethod
+    def normalize(
+        terms: Sequence[Term], k: int, clauses: list[Clause]
+    ) -> tuple[list[Term], int]:
+        """
+        Rewrite ``terms ≤ k`` with positive weights no greater than ``k``.
+        Unit clauses for terms that must be false are appended to ``clauses``.
+        """
+        positive: list[Term] = []
+        for w, lit in terms:
+            if w < 0:
+                positive.append((-w, ~lit))
+                k -= w
+            elif w > 0:
+                positive.append((w, lit))
+
+        if k < 0:
+            return [], k
+
+        result: list[Term] = []
+        for w, lit in positive:
+            if w > k:
+                clauses.append(Or(~lit))
+            else:
+                result.append((w, lit))
+
+        # heaviest first keeps decision diagrams narrow
+        result.sort(key=lambda t: t[0], reverse=True)
+        return result, k
+
+    def _pb_bdd(self, terms: Sequence[Term], k: int) -> list[Clause]:
+        # suffix[i] is the largest sum terms[i:] can reach
+        suffix = [0] * (len(terms) + 1)
+        for i in range(len(terms) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + terms[i][0]
+
+        # Node (i, rem) states that terms[i:] sum to at most rem.  It is
+        # trivially true when rem >= suffix[i] and false when rem < 0, which
+        # are represented by True/False instead of a variable.
+        def node(i: int, rem: int) -> Lit | bool:
+            if rem < 0:
+                return False
+            if rem >= suffix[i]:
+                return True
+            try:
+                return nodes[i, rem]
+            except KeyError:
+                var = nodes[i, rem] = self.new_var()
+                pending.append((i, rem, var))
+                return var
+
+        nodes: dict[tuple[int, int], Lit] = {}
+        pending: list[tuple[int, int, Lit]] = []
+
+        root = node(0, k)
+        assert not isinstance(root, bool)
+        clauses = [Or(root)]
+
+        while pending:
+            i, rem, var = pending.pop()
+            w, lit = terms[i]
+            hi = node(i + 1, rem - w)
+            lo = node(i + 1, rem)
+
+            if hi is False:
+                clauses.append(Or(~var, ~lit))
+            elif hi is not True:
+                clauses.append(Or(~var, ~lit, hi))
+
+            # rem >= 0 at every node, so lo is never False
+            assert lo is not False
+            if lo is not True:
+                clauses.append(Or(~var, lo))
+
+        return clauses
+
+    def _pb_gte(self, terms: Sequence[Term], k: int) -> list[Clause]:
+        clauses: list[Clause] = []
+        cap = k + 1
+        root = self._gte(terms, cap, clauses)
+        for s, out in root.items():
+            if s > k:
+                clauses.append(Or(~out))
+        return clauses
+
+    def _gte(
+        self, terms: Sequence[Term], cap: int, clauses: list[Clause]
+    ) -> dict[int, Lit]:
+        """
+        Map from each reachable sum ``s`` of ``terms`` (capped at ``cap``) to
+        a literal that is implied when the sum is at least ``s``.
+        """
+        if len(terms) == 1:
+            w, lit = terms[0]
+            return {min(w, cap): lit}
+
+        mid = len(terms) // 2
+        a = self._gte(terms[:mid], cap, clauses)
+        b = self._gte(terms[mid:], cap, clauses)
+
+        out: dict[int, Lit] = {}
+
+        def output(s: int) -> Lit:
+            s = min(s, cap)
+            try:
+                return out[s]
+            except KeyError:
+                var = out[s] = self.new_var()
+                return var
+
+        for sa, la in a.items():
+            clauses.append(Or(~la, output(sa)))
+        for sb, lb in b.items():
+            clauses.append(Or(~lb, output(sb)))
+        for sa, la in a.items():
+            for sb, lb in b.items():
+                clauses.append(Or(~la, ~lb, output(sa + sb)))
+
+        return out
+
+    def _pb_adder(self, terms: Sequence[Term], k: int) -> list[Clause]:
+        clauses: list[Clause] = []
+
+        # bucket literals by the bits of their weights, then add each bucket
+        # down to a single bit, carrying into the next bucket
+        buckets: list[list[Lit]] = []
+        for w, lit in terms:
+            bit = 0
+            while w:
+                if w & 1:
+                    while len(buckets) <= bit:
+                        buckets.append([])
+                    buckets[bit].append(lit)
+                w >>= 1
+                bit += 1
+
+        total: list[Lit | None] = []
+        j = 0
+        while j < len(buckets):
+            bucket = buckets[j]
+            while len(bucket) >= 2:
+                if len(bucket) >= 3:
+                    a, b, c = bucket.pop(), bucket.pop(), bucket.pop()
+                    s, carry = self._full_adder(a, b, c, clauses)
+                else:
+                    a, b = bucket.pop(), bucket.pop()
+                    s, carry = self._half_adder(a, b, clauses)
+                bucket.insert(0, s)
+                if len(buckets) <= j + 1:
+                    buckets.append([])
+                buckets[j + 1].append(carry)
+            total.append(bucket[0] if bucket else None)
+            j += 1
+
+        # the total has len(total) bits, so it can never exceed a k with a set
+        # bit at or above that
+        if k >> len(total):
+            return clauses
+
+        # forbid total > k: for every bit where k has a 0, the total must not
+        # have a 1 there while agreeing with k on all higher bits.  A missing
+        # sum bit is constant 0, so it can't agree with a 1 in k (the clause
+        # is already satisfied) and always agrees with a 0 (its literal drops)
+        for j, s in enumerate(total):
+            if s is None or (k >> j) & 1:
+                continue
+            clause: list[Lit] = [~s]
+            for i in range(j + 1, len(total)):
+                t = total[i]
+                if t is None:
+                    if (k >> i) & 1:
+                        break
+                    continue
+                clause.append(~t if (k >> i) & 1 else t)
+            else:
+                clauses.append(Or(*clause))
+
+        return clauses
+
+    def _half_adder(self, a: Lit, b: Lit, clauses: list[Clause]) -> tuple[Lit, Lit]:
+        s, c = self.new_var(), self.new_var()
+        clauses.extend(
+            (
+                # s <-> a ^ b
+                Or(~a, ~b, ~s),
+                Or(a, b, ~s),
+                Or(~a, b, s),
+                Or(a, ~b, s),
+                # c <-> a & b
+                Or(~c, a),
+                Or(~c, b),
+                Or(~a, ~b, c),
+            )
+        )
+        return s, c
+
+    def _full_adder(
+        self, a: Lit, b: Lit, c: Lit, clauses: list[Clause]
+    ) -> tuple[Lit, Lit]:
+        s, carry = self.new_var(), self.new_var()
+        clauses.extend(
+            (
+                # s <-> a ^ b ^ c
+                Or(a, b, c, ~s),
+                Or(a, ~b, ~c, ~s),
+                Or(~a, b, ~c, ~s),
+                Or(~a, ~b, c, ~s),
+                Or(~a, ~b, ~c, s),
+                Or(~a, b, c, s),
+                Or(a, ~b, c, s),
+                Or(a, b, ~c, s),
+                # carry <-> at least two of a, b, c
+                Or(~a, ~b, carry),
+                Or(~a, ~c, carry),
+                Or(~b, ~c, carry),
+                Or(a, b, ~carry),
+                Or(a, c, ~carry),
+                Or(b, c, ~carry),
+            )
+        )
+        return s, carry
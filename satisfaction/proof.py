@@ -0,0 +1,536 @@
+"""
+DRAT and LRAT proofs of unsatisfiability.
+
+A DRAT proof lists the clauses a solver added and deleted, ending with the
+empty clause; each added clause must follow from the ones before it by unit
+propagation (RUP) or be a resolution asymmetric tautology (RAT).  LRAT adds
+clause IDs and, for every added clause, the IDs of the clauses that unit
+propagation goes through, so it can be checked without search.  Input
+clauses have IDs 1 to n in order.
+
+``ProofWriter`` streams either format, as text or in the binary encoding
+(``a``/``d`` followed by variable-length literals, see
+https://github.com/marijnheule/drat-trim), through a buffer.
+``check_drat`` checks DRAT proofs backwards from the empty clause, only
+verifying the lemmas that the refutation depends on, and propagating
+through the clauses already known to be needed before the others.
+``check_lrat`` checks LRAT proofs forwards.
+
+Usage:
+    python -m satisfaction.proof formula.cnf proof.drat
+"""
+
+from __future__ import annotations
+import argparse
+from collections import defaultdict
+import sys
+from typing import BinaryIO, Iterable, Iterator, Sequence
+
+from satisfaction.exceptions import ParseError
+
+# bytes buffered before a write to the proof file
+PROOF_BUFFER = 1 << 16
+
+ADD = 0x61  # "a"
+DELETE = 0x64  # "d"
+
+
+class ProofError(Exception):
+    pass
+
+
+def _varint(n: int, out: bytearray) -> None:
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_binary(
+    out: bytearray, tag: int, *sections: Iterable[int], id: int | None = None
+) -> None:
+    # an LRAT clause ID comes right after the tag, with no terminating 0
+    out.append(tag)
+    if id is not None:
+        _varint(2 * id, out)
+    for section in sections:
+        for lit in section:
+            _varint(2 * lit if lit > 0 else -2 * lit + 1, out)
+        out.append(0)
+
+
+class ProofWriter:
+    """
+    Writes proof steps to ``f``, in LRAT if ``lrat`` and in the binary
+    encoding if ``binary``.  Literals are DIMACS-style integers.  IDs and
+    hints are only written for LRAT; ``num_inputs`` is the number of input
+    clauses, which LRAT deletions refer back to.
+    """
+
+    __slots__ = (
+        "f",
+        "binary",
+        "lrat",
+        "additions",
+        "deletions",
+        "_buffer",
+        "_last_id",
+    )
+
+    f: BinaryIO
+    binary: bool
+    lrat: bool
+    additions: int
+    deletions: int
+
+    _buffer: bytearray
+    _last_id: int
+
+    def __init__(
+        self,
+        f: BinaryIO,
+        binary: bool = False,
+        lrat: bool = False,
+        num_inputs: int = 0,
+    ) -> None:
+        self.f = f
+        self.binary = binary
+        self.lrat = lrat
+        self.additions = 0
+        self.deletions = 0
+        self._buffer = bytearray()
+        self._last_id = num_inputs
+
+    def add(self, lits: Sequence[int], id: int = 0, hints: Sequence[int] = ()) -> None:
+        buffer = self._buffer
+        if self.lrat:
+            if self.binary:
+                _write_binary(buffer, ADD, lits, hints, id=id)
+            else:
+                buffer += " ".join(map(str, [id, *lits, 0, *hints, 0])).encode() + b"\n"
+            self._last_id = id
+        elif self.binary:
+            _write_binary(buffer, ADD, lits)
+        else:
+            buffer += " ".join(map(str, [*lits, 0])).encode() + b"\n"
+        self.additions += 1
+        if len(buffer) >= PROOF_BUFFER:
+            self.flush()
+
+    def delete(self, lits: Sequence[int], id: int = 0) -> None:
+        """
+        Delete the clause ``lits``, which is clause ``id`` for LRAT.
+        """
+        buffer = self._buffer
+        if self.lrat:
+            if self.binary:
+                _write_binary(buffer, DELETE, (id,))
+            else:
+                buffer += f"{self._last_id} d {id} 0\n".encode()
+        elif self.binary:
+            _write_binary(buffer, DELETE, lits)
+        else:
+            buffer += b"d " + " ".join(map(str, [*lits, 0])).encode() + b"\n"
+        self.deletions += 1
+        if len(buffer) >= PROOF_BUFFER:
+            self.flush()
+
+    def flush(self) -> None:
+        self.f.write(self._buffer)
+        self._buffer.clear()
+        self.f.flush()
+
+    def close(self) -> None:
+        """
+        Flush the buffer.  The file stays open.
+        """
+        self.flush()
+
+    def __enter__(self) -> ProofWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _is_binary(data: bytes) -> bool:
+    # text proofs only contain these, and binary ones start with "a" or "d"
+    # followed by bytes that are rarely all printable
+    text = set(b"0123456789-d \t\r\nc")
+    return any(byte not in text for byte in data[:64])
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ParseError("truncated binary proof")
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return (n >> 1 if n & 1 == 0 else -(n >> 1)), pos
+
+
+def _read_varints(data: bytes, pos: int) -> tuple[list[int], int]:
+    values = []
+    while True:
+        value, pos = _read_varint(data, pos)
+        if value == 0:
+            return values, pos
+        values.append(value)
+
+
+def _text_lines(data: bytes) -> Iterator[list[bytes]]:
+    for line in data.splitlines():
+        fields = line.split()
+        if fields and fields[0] != b"c":
+            yield fields
+
+
+def _ints(fields: list[bytes]) -> list[int]:
+    try:
+        return [int(field) for field in fields]
+    except ValueError:
+        raise ParseError(f"expected integers, found {b' '.join(fields)!r}") from None
+
+
+def parse_drat(data: bytes) -> list[tuple[bool, list[int]]]:
+    """
+    The steps of a text or binary DRAT proof as ``(deleted, lits)``.
+    """
+    steps = []
+    if _is_binary(data):
+        pos = 0
+        while pos < len(data):
+            tag = data[pos]
+            if tag not in (ADD, DELETE):
+                raise ParseError(f"unexpected byte {tag:#x} in binary proof")
+            lits, pos = _read_varints(data, pos + 1)
+            steps.append((tag == DELETE, lits))
+        return steps
+
+    for fields in _text_lines(data):
+        deleted = fields[0] == b"d"
+        lits = _ints(fields[1:] if deleted else fields)
+        if lits[-1:] != [0]:
+            raise ParseError("proof line is not terminated by 0")
+        steps.append((deleted, lits[:-1]))
+    return steps
+
+
+type LratStep = tuple[int, list[int] | None, list[int]]
+
+
+def parse_lrat(data: bytes) -> list[LratStep]:
+    """
+    The steps of a text or binary LRAT proof as ``(id, lits, hints)`` for
+    additions and ``(0, None, ids)`` for deletions.
+    """
+    steps: list[LratStep] = []
+    if _is_binary(data):
+        pos = 0
+        while pos < len(data):
+            tag = data[pos]
+            if tag == ADD:
+                id, pos = _read_varint(data, pos + 1)
+                lits, pos = _read_varints(data, pos)
+                hints, pos = _read_varints(data, pos)
+                steps.append((id, lits, hints))
+            elif tag == DELETE:
+                ids, pos = _read_varints(data, pos + 1)
+                steps.append((0, None, ids))
+            else:
+                raise ParseError(f"unexpected byte {tag:#x} in binary proof")
+        return steps
+
+    for fields in _text_lines(data):
+        if len(fields) > 1 and fields[1] == b"d":
+            ids = _ints(fields[2:])
+            if ids[-1:] != [0]:
+                raise ParseError("deletion is not terminated by 0")
+            steps.append((0, None, ids[:-1]))
+            continue
+        values = _ints(fields)
+        try:
+            end = values.index(0, 1)
+        except ValueError:
+            raise ParseError("clause is not terminated by 0") from None
+        if values[-1] != 0 or end == len(values) - 1:
+            raise ParseError("hints are not terminated by 0")
+        steps.append((values[0], values[1:end], values[end + 1 : -1]))
+    return steps
+
+
+class DratChecker:
+    """
+    Backward DRAT checking.  The proof is first replayed to the empty
+    clause, then the lemmas are checked in reverse against the clauses
+    present before them.  Only lemmas marked as core, that is used by the
+    refutation or by a later core lemma, are checked, and propagation tries
+    the core clauses before the others so that the set stays small.
+    """
+
+    __slots__ = ("clauses", "occurs", "active", "core", "num_inputs", "checked")
+
+    clauses: list[tuple[int, ...]]
+    occurs: defaultdict[int, list[int]]
+    active: bytearray
+    core: bytearray
+    num_inputs: int
+    checked: int
+
+    def __init__(self, clauses: Iterable[Sequence[int]]) -> None:
+        self.clauses = []
+        self.occurs = defaultdict(list)
+        self.active = bytearray()
+        self.core = bytearray()
+        for clause in clauses:
+            self._add(clause)
+        self.num_inputs = len(self.clauses)
+        self.checked = 0
+
+    def _add(self, lits: Sequence[int]) -> int:
+        idx = len(self.clauses)
+        clause = tuple(dict.fromkeys(lits))
+        self.clauses.append(clause)
+        for lit in clause:
+            self.occurs[lit].append(idx)
+        self.active.append(1)
+        self.core.append(0)
+        return idx
+
+    def check(self, steps: Iterable[tuple[bool, Sequence[int]]]) -> None:
+        """
+        Raise ``ProofError`` unless ``steps`` refute the clauses.
+        """
+        by_key: defaultdict[tuple[int, ...], list[int]] = defaultdict(list)
+        for idx, clause in enumerate(self.clauses):
+            by_key[tuple(sorted(clause))].append(idx)
+
+        # (added, clause index) in proof order, up to the empty clause
+        replay: list[tuple[bool, int]] = []
+        for deleted, lits in steps:
+            key = tuple(sorted(set(lits)))
+            if deleted:
+                # deleting a clause that is not there is ignored, as drat-trim does
+                while by_key.get(key):
+                    idx = by_key[key].pop()
+                    if self.active[idx]:
+                        self.active[idx] = 0
+                        replay.append((False, idx))
+                        break
+                continue
+            if not lits:
+                break
+            idx = self._add(lits)
+            by_key[key].append(idx)
+            replay.append((True, idx))
+
+        used = self._rup(())
+        if used is None:
+            raise ProofError("the proof does not derive the empty clause")
+        self._mark(used)
+
+        for added, idx in reversed(replay):
+            if not added:
+                self.active[idx] = 1
+                continue
+            self.active[idx] = 0
+            if self.core[idx]:
+                self._check_lemma(idx)
+
+    def _check_lemma(self, idx: int) -> None:
+        lemma = self.clauses[idx]
+        self.checked += 1
+        used = self._rup(lemma)
+        if used is not None:
+            self._mark(used)
+            return
+        if not lemma:
+            raise ProofError(f"lemma {idx - self.num_inputs + 1} is not implied")
+
+        # RAT on the first literal: every resolvent must be RUP
+        pivot = lemma[0]
+        for other in self.occurs[-pivot]:
+            if not self.active[other]:
+                continue
+            resolvent = lemma + tuple(
+                lit for lit in self.clauses[other] if lit != -pivot
+            )
+            used = self._rup(resolvent)
+            if used is None:
+                raise ProofError(
+                    f"lemma {idx - self.num_inputs + 1} {list(lemma)} is neither "
+                    "RUP nor RAT"
+                )
+            self._mark(used)
+            self.core[other] = 1
+
+    def _mark(self, used: list[int]) -> None:
+        core = self.core
+        for idx in used:
+            core[idx] = 1
+
+    def _rup(self, lits: Sequence[int]) -> list[int] | None:
+        """
+        The clauses that unit propagation from the negation of ``lits``
+        uses to reach a conflict, or ``None`` if it reaches none.
+        """
+        clauses, occurs, active, core = (
+            self.clauses,
+            self.occurs,
+            self.active,
+            self.core,
+        )
+        # true literals, each with the clause that implied it (-1 if assumed)
+        reasons: dict[int, int] = {}
+        trail: list[int] = []
+        for lit in lits:
+            if lit in reasons:
+                # both lit and -lit: a tautology
+                return []
+            if -lit not in reasons:
+                reasons[-lit] = -1
+                trail.append(-lit)
+
+        for idx, clause in enumerate(clauses):
+            if active[idx] and len(clause) <= 1:
+                if not clause or -clause[0] in reasons:
+                    return self._analyze(idx, reasons, trail)
+                if clause[0] not in reasons:
+                    reasons[clause[0]] = idx
+                    trail.append(clause[0])
+
+        def visit(lit: int, in_core: int) -> int | None:
+            """
+            Propagate through the clauses of ``in_core`` that ``lit`` falsifies,
+            returning a conflicting clause.
+            """
+            for idx in occurs[-lit]:
+                if not active[idx] or core[idx] != in_core:
+                    continue
+                unit = 0
+                for other in clauses[idx]:
+                    if other in reasons:
+                        break
+                    if -other not in reasons:
+                        if unit:
+                            break
+                        unit = other
+                else:
+                    if not unit:
+                        return idx
+                    reasons[unit] = idx
+                    trail.append(unit)
+            return None
+
+        core_head = other_head = 0
+        while True:
+            while core_head < len(trail):
+                conflict = visit(trail[core_head], 1)
+                core_head += 1
+                if conflict is not None:
+                    return self._analyze(conflict, reasons, trail)
+            if other_head == len(trail):
+                return None
+            conflict = visit(trail[other_head], 0)
+            other_head += 1
+            if conflict is not None:
+                return self._analyze(conflict, reasons, trail)
+
+    def _analyze(
+        self, conflict: int, reasons: dict[int, int], trail: list[int]
+    ) -> list[int]:
+        clauses = self.clauses
+        used = [conflict]
+        seen = {abs(lit) for lit in clauses[conflict]}
+        for lit in reversed(trail):
+            reason = reasons[lit]
+            if abs(lit) in seen and reason >= 0:
+                used.append(reason)
+                seen.update(abs(other) for other in clauses[reason])
+        return used
+
+
+def check_drat(clauses: Iterable[Sequence[int]], proof: bytes) -> int:
+    """
+    Check a text or binary DRAT ``proof`` that ``clauses`` are
+    unsatisfiable, raising ``ProofError`` if it is invalid.  Returns the
+    number of lemmas that had to be checked.
+    """
+    checker = DratChecker(clauses)
+    checker.check(parse_drat(proof))
+    return checker.checked
+
+
+def check_lrat(clauses: Iterable[Sequence[int]], proof: bytes) -> int:
+    """
+    Check a text or binary LRAT ``proof`` that ``clauses`` are
+    unsatisfiable, raising ``ProofError`` if it is invalid.  Returns the
+    number of lemmas checked.
+    """
+    db: dict[int, tuple[int, ...]] = {
+        id: tuple(clause) for id, clause in enumerate(clauses, 1)
+    }
+    checked = 0
+    for id, lits, hints in parse_lrat(proof):
+        if lits is None:
+            for deleted in hints:
+                db.pop(deleted, None)
+            continue
+        if id in db:
+            raise ProofError(f"clause {id} is added twice")
+
+        true = {-lit for lit in lits}
+        for hint in hints:
+            clause = db.get(hint)
+            if clause is None:
+                raise ProofError(f"lemma {id} uses missing clause {hint}")
+            if any(lit in true for lit in clause):
+                raise ProofError(f"lemma {id}: clause {hint} is satisfied")
+            open_lits = [lit for lit in clause if -lit not in true]
+            if not open_lits:
+                break
+            if len(open_lits) > 1:
+                raise ProofError(f"lemma {id}: clause {hint} is not unit")
+            true.add(open_lits[0])
+        else:
+            raise ProofError(f"lemma {id} is not implied by its hints")
+
+        checked += 1
+        if not lits:
+            return checked
+        db[id] = tuple(lits)
+    raise ProofError("the proof does not derive the empty clause")
+
+
+parser = argparse.ArgumentParser(description="Check a DRAT or LRAT proof")
+parser.add_argument("formula", help="DIMACS file")
+parser.add_argument("proof", help="proof file, text or binary")
+parser.add_argument("--lrat", action="store_true", help="the proof is in LRAT")
+
+
+def main(argv: list[str] | None = None) -> int:
+    from satisfaction.dimacs import read_dimacs
+
+    args = parser.parse_args(argv)
+    try:
+        packed = read_dimacs(args.formula)
+        with open(args.proof, "rb") as f:
+            proof = f.read()
+        clauses = [list(clause) for clause in packed]
+        check = check_lrat if args.lrat else check_drat
+        checked = check(clauses, proof)
+    except (OSError, ParseError, ProofError) as e:
+        print(f"c {e}")
+        print("s NOT VERIFIED")
+        return 1
+    print(f"c {checked} lemmas checked")
+    print("s VERIFIED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
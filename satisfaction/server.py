@@ -0,0 +1,535 @@
+"""
+A local solver service over HTTP, on TCP or a Unix socket.
+
+Jobs are DIMACS text or a packed CNF (see ``packed``), posted with a
+priority and an optional budget.  They wait in a bounded priority queue and
+are handed to a pool of warm solver processes only as processes become free,
+so a high-priority job overtakes everything still queued.  A full queue
+rejects new jobs with ``503`` and a ``Retry-After`` header.
+
+Endpoints, all answering JSON::
+
+    POST   /jobs?priority=&solver=&time=&conflicts=&decisions=&propagations=&wait=
+    GET    /jobs/<id>?wait=
+    DELETE /jobs/<id>       cancel a queued job
+    GET    /stats
+
+``wait`` holds the response for up to that many seconds until the job is
+done.  Models are lists of DIMACS literals in the job's own numbering.
+"""
+
+from __future__ import annotations
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import logging
+from multiprocessing.context import BaseContext
+from multiprocessing.sharedctypes import Synchronized
+import os
+import socketserver
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from satisfaction.dimacs import parse_dimacs
+from satisfaction.packed import MAGIC, PackedCNF
+from satisfaction.solvers.batch import SOLVERS, init_worker, solve_chunk
+from satisfaction.solvers.portfolio import default_context, verify
+from satisfaction.solvers.solver import Budget, Result
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = 1024
+# finished jobs whose results can still be fetched
+MAX_FINISHED = 10_000
+# longest a request may ask to wait for a result, in seconds
+MAX_WAIT = 300.0
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    __slots__ = (
+        "id",
+        "priority",
+        "solver",
+        "budget",
+        "packed",
+        "status",
+        "result",
+        "model",
+        "time",
+        "stats",
+        "submitted",
+        "finished",
+    )
+
+    id: int
+    priority: int
+    solver: str
+    budget: Budget
+    packed: PackedCNF | None
+    status: str
+    result: Result | None
+    model: list[int] | None
+    time: float
+    stats: dict[str, int]
+    submitted: float
+    finished: threading.Event
+
+    def __init__(
+        self, id: int, priority: int, solver: str, budget: Budget, packed: PackedCNF
+    ) -> None:
+        self.id = id
+        self.priority = priority
+        self.solver = solver
+        self.budget = budget
+        self.packed = packed
+        self.status = QUEUED
+        self.result = None
+        self.model = None
+        self.time = 0.0
+        self.stats = {}
+        self.submitted = time.monotonic()
+        self.finished = threading.Event()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "solver": self.solver,
+            "result": None if self.result is None else self.result.value,
+            "model": self.model,
+            "time": self.time,
+            "stats": self.stats,
+        }
+
+
+class SolverService:
+    """
+    The job queue and worker pool, independent of the transport.
+    """
+
+    __slots__ = (
+        "workers",
+        "max_queue",
+        "budget",
+        "jobs",
+        "counts",
+        "solve_time",
+        "started",
+        "_queue",
+        "_queued",
+        "_done",
+        "_ids",
+        "_cond",
+        "_closed",
+        "_running",
+        "_stop",
+        "_executor",
+        "_threads",
+    )
+
+    workers: int
+    max_queue: int
+    budget: Budget
+    jobs: dict[int, Job]
+    counts: dict[str, int]
+    solve_time: float
+    started: float
+
+    _queue: list[tuple[int, int, Job]]
+    _queued: int
+    _done: OrderedDict[int, None]
+    _ids: itertools.count[int]
+    _cond: threading.Condition
+    _closed: bool
+    _running: int
+    _stop: Synchronized[int]
+    _executor: ProcessPoolExecutor
+    _threads: list[threading.Thread]
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_queue: int = MAX_QUEUE,
+        budget: Budget | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """
+        ``budget`` is the default for jobs that do not set their own.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.budget = budget or Budget()
+        self.jobs = {}
+        self.counts = dict.fromkeys(
+            ["submitted", "rejected", "cancelled", "completed"]
+            + [result.value for result in Result],
+            0,
+        )
+        self.solve_time = 0.0
+        self.started = time.monotonic()
+
+        self._queue = []
+        self._queued = 0
+        self._done = OrderedDict()
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._running = 0
+
+        ctx = mp_context or default_context()
+        self._stop = ctx.RawValue("b", 0)
+        self._executor = ProcessPoolExecutor(
+            self.workers,
+            mp_context=ctx,
+            initializer=init_worker,
+            initargs=(self._stop,),
+        )
+        # one dispatcher per process, so a job only leaves the priority
+        # queue once a process is free to run it
+        self._threads = [
+            threading.Thread(target=self._dispatch, daemon=True)
+            for _ in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        packed: PackedCNF,
+        priority: int = 0,
+        solver: str = "cdcl",
+        budget: Budget | None = None,
+    ) -> Job:
+        """
+        Queue a job; higher priorities run first, equal ones in order of
+        submission.  Raises ``QueueFull`` when ``max_queue`` jobs are waiting.
+        """
+        if solver not in SOLVERS:
+            raise ValueError(
+                f"unknown solver {solver!r}, expected one of {list(SOLVERS)}"
+            )
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("the service is closed")
+            if self._queued >= self.max_queue:
+                self.counts["rejected"] += 1
+                raise QueueFull
+            job = Job(next(self._ids), priority, solver, budget or self.budget, packed)
+            self.jobs[job.id] = job
+            heapq.heappush(self._queue, (-priority, job.id, job))
+            self._queued += 1
+            self.counts["submitted"] += 1
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job that has not started yet.
+        """
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return False
+            # left in the heap and skipped by the dispatcher
+            job.status = CANCELLED
+            self._queued -= 1
+            self.counts["cancelled"] += 1
+            self._finish(job)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            uptime = time.monotonic() - self.started
+            completed = self.counts["completed"]
+            return {
+                **self.counts,
+                "queued": self._queued,
+                "running": self._running,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "uptime": uptime,
+                "throughput": completed / uptime if uptime else 0.0,
+                "mean_time": self.solve_time / completed if completed else 0.0,
+            }
+
+    def close(self) -> None:
+        """
+        Stop taking jobs, interrupt the running ones and shut the pool down.
+        Jobs still queued are cancelled.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            for *_, job in self._queue:
+                if job.status == QUEUED:
+                    job.status = CANCELLED
+                    self.counts["cancelled"] += 1
+                    self._finish(job)
+            self._queue.clear()
+            self._queued = 0
+            self._cond.notify_all()
+
+        self._stop.value = 1
+        for thread in self._threads:
+            thread.join()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> SolverService:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _take(self) -> Job | None:
+        with self._cond:
+            while True:
+                while self._queue:
+                    *_, job = heapq.heappop(self._queue)
+                    if job.status == QUEUED:
+                        job.status = RUNNING
+                        self._queued -= 1
+                        self._running += 1
+                        return job
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def _dispatch(self) -> None:
+        while (job := self._take()) is not None:
+            assert job.packed is not None
+            try:
+                future = self._executor.submit(
+                    solve_chunk,
+                    job.solver,
+                    job.budget,
+                    [(job.id, job.packed.to_bytes())],
+                )
+                [(_, value, model, elapsed, stats)] = future.result()
+                result = Result(value)
+            except Exception:
+                logger.exception("job %d failed", job.id)
+                result, model, elapsed, stats = Result.UNKNOWN, [], 0.0, {}
+
+            if result is Result.SAT and not verify(job.packed, model):
+                logger.error("discarding invalid model for job %d", job.id)
+                result = Result.UNKNOWN
+
+            with self._cond:
+                job.result = result
+                job.model = model if result is Result.SAT else None
+                job.time = elapsed
+                job.stats = stats
+                job.status = DONE
+                self._running -= 1
+                self.counts["completed"] += 1
+                self.counts[result.value] += 1
+                self.solve_time += elapsed
+                self._finish(job)
+
+    def _finish(self, job: Job) -> None:
+        job.packed = None
+        job.finished.set()
+        self._done[job.id] = None
+        while len(self._done) > MAX_FINISHED:
+            old, _ = self._done.popitem(last=False)
+            del self.jobs[old]
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: Server
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return str(self.client_address[0]) if self.client_address else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s " + format, self.address_string(), *args)
+
+    def _reply(
+        self,
+        status: HTTPStatus,
+        body: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: HTTPStatus, message: str, **headers: str) -> None:
+        self._reply(status, {"error": message}, headers)
+
+    def _route(self) -> tuple[list[str], dict[str, str]]:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        return [part for part in url.path.split("/") if part], query
+
+    def _job(self, parts: list[str]) -> Job | None:
+        if len(parts) != 2 or parts[0] != "jobs" or not parts[1].isdigit():
+            self._error(HTTPStatus.NOT_FOUND, "no such resource")
+            return None
+        job = self.server.service.get(int(parts[1]))
+        if job is None:
+            self._error(HTTPStatus.NOT_FOUND, "no such job")
+        return job
+
+    def do_GET(self) -> None:
+        parts, query = self._route()
+        if parts == ["stats"]:
+            self._reply(HTTPStatus.OK, self.server.service.stats())
+            return
+        try:
+            wait = min(float(query.get("wait", 0)), MAX_WAIT)
+        except ValueError:
+            self._error(HTTPStatus.BAD_REQUEST, "invalid wait")
+            return
+        if (job := self._job(parts)) is None:
+            return
+        if wait > 0:
+            job.finished.wait(wait)
+        self._reply(HTTPStatus.OK, job.to_dict())
+
+    def do_DELETE(self) -> None:
+        parts, _ = self._route()
+        if (job := self._job(parts)) is None:
+            return
+        if not self.server.service.cancel(job.id):
+            self._error(HTTPStatus.CONFLICT, f"job is {job.status}")
+            return
+        self._reply(HTTPStatus.OK, job.to_dict())
+
+    def do_POST(self) -> None:
+        parts, query = self._route()
+        if parts != ["jobs"]:
+            self._error(HTTPStatus.NOT_FOUND, "no such resource")
+            return
+
+        service = self.server.service
+        try:
+            data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            wait = min(float(query.get("wait", 0)), MAX_WAIT)
+            if data.startswith(MAGIC):
+                packed = PackedCNF.from_bytes(data)
+            else:
+                packed = parse_dimacs(data)
+
+            def limit(name: str, kind: type[int] | type[float]) -> Any:
+                value = query.get(name)
+                return getattr(service.budget, name) if value is None else kind(value)
+
+            budget = Budget(
+                limit("time", float),
+                limit("conflicts", int),
+                limit("decisions", int),
+                limit("propagations", int),
+            )
+            job = service.submit(
+                packed,
+                int(query.get("priority", 0)),
+                query.get("solver", "cdcl"),
+                budget,
+            )
+        except QueueFull:
+            self._error(
+                HTTPStatus.SERVICE_UNAVAILABLE, "queue is full", **{"Retry-After": "1"}
+            )
+            return
+        except ValueError as e:
+            # including ParseError
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        if wait > 0:
+            job.finished.wait(wait)
+        status = HTTPStatus.OK if job.finished.is_set() else HTTPStatus.ACCEPTED
+        self._reply(status, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    service: SolverService
+
+    def __init__(self, address: tuple[str, int], service: SolverService) -> None:
+        self.service = service
+        super().__init__(address, Handler)
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    service: SolverService
+
+    def __init__(self, path: str, service: SolverService) -> None:
+        self.service = service
+        super().__init__(path, Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        path = self.server_address
+        assert isinstance(path, str)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def make_server(
+    service: SolverService, address: tuple[str, int] | str
+) -> Server | UnixServer:
+    """
+    Serve ``service`` on a ``(host, port)`` address or a Unix socket path.
+    """
+    if isinstance(address, str):
+        return UnixServer(address, service)
+    return Server(address, service)
+
+
+parser = argparse.ArgumentParser(description="Serve SAT solving jobs over HTTP")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+parser.add_argument("--workers", type=int, help="solver processes (default: CPUs)")
+parser.add_argument("--max-queue", type=int, default=MAX_QUEUE)
+parser.add_argument("--time", type=float, help="default time limit per job")
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    service = SolverService(args.workers, args.max_queue, Budget(time=args.time))
+    address = args.unix or (args.host, args.port)
+    with service, make_server(service, address) as server:
+        logger.info("serving on %s", server.server_address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
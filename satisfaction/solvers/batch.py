@@ -0,0 +1,247 @@
+"""
+Solving many independent formulas in parallel.
+
+Formulas are packed into integer form before they leave the calling process,
+so workers never unpickle ``Expr`` trees, and models come back as integer
+literals.  The pool's processes stay up for the whole batch and each one
+imports the solvers once.  Only a bounded window of formulas is in flight at
+a time, so ``cnfs`` may be a lazy stream of any length.
+"""
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import logging
+from multiprocessing.context import BaseContext
+from multiprocessing.sharedctypes import Synchronized
+import os
+import threading
+import time
+from typing import Iterable, Iterator
+
+from satisfaction.expr import CNF, Lit
+from satisfaction.packed import PackedCNF
+
+from . import dpll, indexed
+from .cdcl import CDCL
+from .portfolio import POLL_INTERVAL, default_context, verify
+from .solver import Budget, Result, Solver
+
+logger = logging.getLogger(__name__)
+
+SOLVERS: dict[str, type[Solver]] = {
+    "cdcl": CDCL,
+    "dpll": dpll.DPLL,
+    "indexed": indexed.DPLL,
+}
+
+# chunks in flight (running, queued or finished but not yet yielded) per worker
+WINDOW_PER_WORKER = 4
+
+
+class BatchResult:
+    __slots__ = ("index", "result", "model", "time", "stats")
+
+    index: int
+    result: Result
+    model: set[Lit] | None
+    time: float
+    stats: dict[str, int]
+
+    def __init__(
+        self,
+        index: int,
+        result: Result,
+        model: set[Lit] | None,
+        time: float,
+        stats: dict[str, int],
+    ) -> None:
+        """
+        The outcome for the ``index``-th formula.  ``model`` is the set of
+        true literals if it is satisfiable; ``time`` is the solving time in
+        the worker, in seconds, and ``stats`` the solver's search counters.
+        """
+        self.index = index
+        self.result = result
+        self.model = model
+        self.time = time
+        self.stats = stats
+
+    def __repr__(self) -> str:
+        return f"BatchResult({self.index}, {self.result.value}, {self.time:.3f}s)"
+
+
+type Task = tuple[int, bytes]
+type Answer = tuple[int, str, list[int], float, dict[str, int]]
+
+# the solver a worker is running, so the stop flag can interrupt it
+_current: Solver | None = None
+_stop: Synchronized[int] | None = None
+
+
+def init_worker(stop: Synchronized[int]) -> None:
+    """
+    Pool initializer: interrupt the running solver once ``stop`` is set.
+    """
+    global _stop
+    _stop = stop
+
+    # keeps interrupting, since the pool may start chunks it had already
+    # queued after the stop
+    def watch() -> None:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = _current
+            if stop.value and current is not None:
+                current.interrupt()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def solve_chunk(solver: str, budget: Budget, tasks: list[Task]) -> list[Answer]:
+    """
+    Solve packed formulas in a worker set up by ``init_worker``.  Each
+    answer is ``(index, result value, model, seconds, counters)``.
+    """
+    global _current
+    assert _stop is not None
+    answers = []
+    for index, data in tasks:
+        if _stop.value:
+            answers.append((index, Result.UNKNOWN.value, [], 0.0, {}))
+            continue
+        packed = PackedCNF.from_bytes(data)
+        table = packed.table
+        start = time.perf_counter()
+        instance = _current = SOLVERS[solver](packed.to_cnf())
+        instance.budget = budget
+        result = instance.check()
+        elapsed = time.perf_counter() - start
+
+        model = []
+        if result is Result.SAT:
+            model = [table.encode(lit) for lit in instance.assignments.els]
+        answers.append((index, result.value, model, elapsed, instance.stats.counters))
+    _current = None
+    return answers
+
+
+def _pack(cnf: CNF | PackedCNF) -> PackedCNF:
+    return cnf if isinstance(cnf, PackedCNF) else PackedCNF.from_cnf(cnf)
+
+
+def _chunks(
+    cnfs: Iterable[CNF | PackedCNF], size: int
+) -> Iterator[list[tuple[int, PackedCNF]]]:
+    chunk: list[tuple[int, PackedCNF]] = []
+    for index, cnf in enumerate(cnfs):
+        chunk.append((index, _pack(cnf)))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_many(
+    cnfs: Iterable[CNF | PackedCNF],
+    solver: str = "cdcl",
+    workers: int | None = None,
+    budget: Budget | None = None,
+    ordered: bool = True,
+    chunksize: int = 1,
+    mp_context: BaseContext | None = None,
+) -> Iterator[BatchResult]:
+    """
+    Solve each formula with ``solver`` (one of ``SOLVERS``) on ``workers``
+    processes (default: one per CPU), yielding results as they finish, or in
+    input order if ``ordered``.  ``budget`` applies to each formula on its
+    own.  Formulas are sent to the workers ``chunksize`` at a time, which
+    saves round trips when they are tiny.
+
+    Closing the iterator early cancels the formulas not yet started and
+    interrupts the ones running.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}, expected one of {list(SOLVERS)}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+
+    return _stream(
+        cnfs,
+        solver,
+        workers or os.cpu_count() or 1,
+        budget or Budget(),
+        ordered,
+        chunksize,
+        mp_context or default_context(),
+    )
+
+
+def _stream(
+    cnfs: Iterable[CNF | PackedCNF],
+    solver: str,
+    workers: int,
+    budget: Budget,
+    ordered: bool,
+    chunksize: int,
+    ctx: BaseContext,
+) -> Iterator[BatchResult]:
+    stop = ctx.RawValue("b", 0)
+    executor = ProcessPoolExecutor(
+        workers, mp_context=ctx, initializer=init_worker, initargs=(stop,)
+    )
+
+    window = WINDOW_PER_WORKER * workers
+    chunks = _chunks(cnfs, chunksize)
+    # the packed formulas are kept to decode and verify models
+    packed: dict[int, PackedCNF] = {}
+    pending: set[Future[list[Answer]]] = set()
+    finished: dict[int, BatchResult] = {}
+    next_index = 0
+    exhausted = False
+
+    def submit() -> None:
+        nonlocal exhausted
+        while not exhausted and len(pending) + len(finished) // chunksize < window:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                exhausted = True
+                return
+            tasks = [(index, cnf.to_bytes()) for index, cnf in chunk]
+            packed.update(chunk)
+            pending.add(executor.submit(solve_chunk, solver, budget, tasks))
+
+    def collect(answer: Answer) -> BatchResult:
+        index, value, ints, elapsed, stats = answer
+        cnf = packed.pop(index)
+        result = Result(value)
+        model = None
+        if result is Result.SAT:
+            if verify(cnf, ints):
+                decode = cnf.table.decode
+                model = {decode(lit) for lit in ints}
+            else:
+                logger.error("discarding invalid model for formula %d", index)
+                result = Result.UNKNOWN
+        return BatchResult(index, result, model, elapsed, stats)
+
+    try:
+        submit()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(done)
+            for future in done:
+                for answer in future.result():
+                    batch_result = collect(answer)
+                    if ordered:
+                        finished[batch_result.index] = batch_result
+                    else:
+                        yield batch_result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+            submit()
+    finally:
+        stop.value = 1
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,340 @@
+"""
+Content-addressed cache of solver results.
+
+A formula is canonicalized before it is hashed: duplicate literals and
+clauses are dropped, variables are renumbered by their color after a few
+rounds of color refinement on the formula's graph (see ``symmetry``), which
+does not depend on the original names, and the clauses are sorted.  Renamed
+copies of a formula therefore usually share a key.  Variables that
+refinement cannot tell apart keep their original relative order, so some
+isomorphic formulas still miss, but a hit is always for the same canonical
+formula.
+
+Results are kept in an in-memory LRU in front of an optional SQLite store
+that evicts its least recently used entries beyond a size limit.  Models are
+stored in canonical numbering, mapped back to the caller's variables and
+checked against every clause before they are returned.
+"""
+
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from satisfaction.expr import CNF
+from satisfaction.layered import AddLayers
+from satisfaction.packed import PackedCNF
+from satisfaction.symmetry import Graph
+
+from .cdcl import CDCL
+from .portfolio import verify
+from .solver import Result, Solver
+from .stats import timed
+
+# rounds of color refinement spent on canonical numbering
+REFINE_ROUNDS = 4
+MAX_ENTRIES = 1024
+MAX_BYTES = 64 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    model BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+)
+"""
+
+type Entry = tuple[Result, array[int]]
+
+
+class Canonical:
+    """
+    The canonical form of a formula.  Canonical variable ``i`` is original
+    variable ``variables[i - 1]``; variables that occur in no clause are left
+    out.
+    """
+
+    __slots__ = ("key", "clauses", "variables", "numbers")
+
+    key: str
+    clauses: list[list[int]]
+    variables: list[int]
+    numbers: dict[int, int]
+
+    def __init__(
+        self, packed: PackedCNF, refine_rounds: int | None = REFINE_ROUNDS
+    ) -> None:
+        clauses = sorted({tuple(sorted(set(clause))) for clause in packed})
+        graph = Graph(clauses, packed.num_vars)
+        colors = graph.refine(graph.colors, refine_rounds)
+
+        used = sorted({abs(lit) for clause in clauses for lit in clause})
+        self.variables = sorted(
+            used, key=lambda v: (colors[2 * v - 2], colors[2 * v - 1], v)
+        )
+        self.numbers = {v: i for i, v in enumerate(self.variables, 1)}
+
+        numbers = self.numbers
+        self.clauses = sorted(
+            (
+                sorted((numbers[lit] if lit > 0 else -numbers[-lit]) for lit in clause)
+                for clause in clauses
+            ),
+            key=lambda clause: (len(clause), clause),
+        )
+
+        lits = array("i", [len(self.variables)])
+        for clause in self.clauses:
+            lits.extend(clause)
+            lits.append(0)
+        self.key = hashlib.sha256(lits.tobytes()).hexdigest()
+
+    def to_canonical(self, model: list[int]) -> array[int]:
+        numbers = self.numbers
+        return array(
+            "i",
+            (
+                numbers[abs(lit)] if lit > 0 else -numbers[-lit]
+                for lit in model
+                if abs(lit) in numbers
+            ),
+        )
+
+    def from_canonical(self, model: array[int]) -> list[int]:
+        variables = self.variables
+        return [
+            variables[lit - 1] if lit > 0 else -variables[-lit - 1] for lit in model
+        ]
+
+
+class ResultCache:
+    """
+    Definite results by canonical key.  ``path`` adds a SQLite store that
+    survives the process and is shared by every cache opened on it.
+    """
+
+    __slots__ = (
+        "max_entries",
+        "max_bytes",
+        "hits",
+        "misses",
+        "_memory",
+        "_db",
+        "_lock",
+    )
+
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+
+    _memory: OrderedDict[str, Entry]
+    _db: sqlite3.Connection | None
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            with self._db:
+                self._db.execute(SCHEMA)
+
+    def get(self, key: str) -> Entry | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT result, model FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    model = array("i")
+                    model.frombytes(row[1])
+                    entry = (Result(row[0]), model)
+                    with self._db:
+                        self._db.execute(
+                            "UPDATE results SET used = ? WHERE key = ?",
+                            (time.time(), key),
+                        )
+                    self._remember(key, entry)
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(self, key: str, result: Result, model: array[int]) -> None:
+        if result is Result.UNKNOWN:
+            raise ValueError("only definite results can be cached")
+
+        with self._lock:
+            self._remember(key, (result, model))
+            if self._db is None:
+                return
+
+            blob = model.tobytes()
+            size = len(key) + len(blob)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (key, result.value, blob, size, time.time()),
+                )
+                self._evict()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def stored_bytes(self) -> int:
+        if self._db is None:
+            return 0
+        with self._lock:
+            (total,) = self._db.execute("SELECT TOTAL(size) FROM results").fetchone()
+            return int(total)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __enter__(self) -> ResultCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _remember(self, key: str, entry: Entry) -> None:
+        memory = self._memory
+        memory[key] = entry
+        memory.move_to_end(key)
+        while len(memory) > self.max_entries:
+            memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        assert self._db is not None
+        db = self._db
+        (total,) = db.execute("SELECT TOTAL(size) FROM results").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        stale = []
+        for key, size in db.execute(
+            "SELECT key, size FROM results ORDER BY used, rowid"
+        ):
+            if excess <= 0:
+                break
+            stale.append((key,))
+            excess -= size
+        db.executemany("DELETE FROM results WHERE key = ?", stale)
+
+
+class CachedSolver(Solver):
+    """
+    Looks the formula up in ``cache`` and only runs ``solver_cls`` on a miss,
+    caching its answer if it is definite.
+    """
+
+    __slots__ = (
+        "packed",
+        "canonical",
+        "cache",
+        "solver_cls",
+        "solver",
+        "hit",
+        "assignments",
+    )
+
+    packed: PackedCNF
+    canonical: Canonical
+    cache: ResultCache
+    solver_cls: Callable[[CNF], Solver]
+    solver: Solver | None
+    hit: bool
+    assignments: AddLayers
+
+    def __init__(
+        self,
+        cnf: CNF,
+        cache: ResultCache,
+        solver_cls: Callable[[CNF], Solver] = CDCL,
+    ) -> None:
+        super().__init__(cnf)
+        self.packed = PackedCNF.from_cnf(cnf)
+        self.canonical = Canonical(self.packed)
+        self.cache = cache
+        self.solver_cls = solver_cls
+        self.solver = None
+        self.hit = False
+        self.assignments = AddLayers(set())
+
+    def interrupt(self) -> None:
+        super().interrupt()
+        if self.solver is not None:
+            self.solver.interrupt()
+
+    @timed("search")
+    def check(self) -> Result:
+        if self._interrupt.is_set():
+            self._interrupt.clear()
+            return Result.UNKNOWN
+
+        canonical = self.canonical
+        entry = self.cache.get(canonical.key)
+        if entry is not None:
+            result, stored = entry
+            model = canonical.from_canonical(stored)
+            if result is Result.UNSAT or verify(self.packed, model):
+                self.hit = True
+                self._set_model(result, model)
+                return result
+            self.cache.discard(canonical.key)
+
+        self.hit = False
+        if self.solver is None:
+            self.solver = self.solver_cls(self.packed.to_cnf())
+        solver = self.solver
+        solver.budget = self.budget
+        result = solver.check()
+        self.conflicts = solver.conflicts
+        self.decisions = solver.decisions
+        self.propagations = solver.propagations
+        if result is Result.UNKNOWN:
+            return result
+
+        model = []
+        if result is Result.SAT:
+            encode = self.packed.table.encode
+            model = [encode(lit) for lit in solver.assignments.els]
+        self.cache.put(canonical.key, result, canonical.to_canonical(model))
+        self._set_model(result, model)
+        return result
+
+    def _set_model(self, result: Result, model: list[int]) -> None:
+        decode = self.packed.table.decode
+        self.assignments = AddLayers(
+            {decode(lit) for lit in model} if result is Result.SAT else set()
+        )
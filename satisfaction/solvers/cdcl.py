@@ -1,18 +1,142 @@
 from __future__ import annotations
-import logging
+from array import array
+import io
+import os
+import struct
 from collections import defaultdict
+import heapq
+import random
+from typing import TYPE_CHECKING, BinaryIO, Callable, Sequence
+import zlib
 
-from satisfaction.expr import CNF, Lit, Not, Var
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, CNF, Clause, Lit, Not, Var
 from satisfaction.layered import AddLayers
 
-from .solver import Solver
-
-logger = logging.getLogger(__name__)
+from .events import EVENTS, Handler, Observable
+from .solver import Result, Solver
+from .stats import timed
+
+if TYPE_CHECKING:
+    from satisfaction.proof import ProofWriter
+
+HEURISTICS = ("order", "vsids")
+RESTART_POLICIES = ("none", "luby", "geometric")
+PHASE_POLICIES = ("true", "false", "saved", "random")
+
+# rebuild the VSIDS heap once stale entries make it this many times larger
+# than the number of variables
+HEAP_SLACK = 4
+ACTIVITY_LIMIT = 1e100
+
+# Checkpoint layout: a fixed header followed by a zlib-compressed body of
+#
+#   lits       int32[num_lits]       all clauses, input and learned, back to back
+#   sizes      int32[num_clauses]    length of each clause
+#   trail      int32[trail_len]      assigned literals in order
+#   reasons    int32[trail_len]      clause index for each, -1 for decisions
+#   trail_lim  int32[level]          trail position of each decision
+#   assumed    int32[num_assumed]    assumptions of the suspended search
+#   activity   float64[num_vars]     VSIDS activities
+#   phases     uint8[num_vars]       saved phases
+#   rng        uint32[rng_len]       state of the random generator, if any
+#   flags      uint8[num_vars]       1 if the variable is generated
+#   names      utf-8, newline separated
+#
+# Literals are +/-(index + 1) for the variable at ``index`` in ``variables``.
+# The header also holds the counters and the configuration, with policies
+# stored as indices into HEURISTICS, RESTART_POLICIES and PHASE_POLICIES.
+CHECKPOINT_MAGIC = b"SATCDCL1"
+CHECKPOINT_HEADER = struct.Struct("<8sQQQQQQQQQQ?BBB?qQdddQQQQQQQQ")
+
+
+def luby(i: int) -> int:
+    """
+    The ``i``-th element, counting from 1, of the Luby sequence
+    1 1 2 1 1 2 4 1 1 2 1 1 2 4 8 ...
+    """
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class Config:
+    """
+    Search parameters.  The defaults are the plain algorithm: branch on
+    variables in input order, try true first and never restart.
+
+    * ``heuristic``: ``order`` or ``vsids`` (activity bumped for every
+      variable seen during conflict analysis, decayed geometrically)
+    * ``restarts``: ``none``, ``luby`` (``restart_base`` times the Luby
+      sequence) or ``geometric`` (``restart_base`` growing by
+      ``restart_factor``) conflicts between restarts
+    * ``phase``: ``true``, ``false``, ``saved`` (the last value the variable
+      had, false at first) or ``random``
+    * ``seed``: seeds the random phases and breaks ties between equal
+      activities at random.  Without one, activities start out tied and
+      random phases use the stream of seed 0, so a configuration with
+      ``phase="random"`` differs from its ``seed=0`` twin only in tie-breaking
+    """
 
+    __slots__ = (
+        "heuristic",
+        "restarts",
+        "phase",
+        "seed",
+        "restart_base",
+        "restart_factor",
+        "decay",
+    )
 
-class CDCL(Solver):
+    heuristic: str
+    restarts: str
+    phase: str
+    seed: int | None
+    restart_base: int
+    restart_factor: float
+    decay: float
+
+    def __init__(
+        self,
+        heuristic: str = "order",
+        restarts: str = "none",
+        phase: str = "true",
+        seed: int | None = None,
+        restart_base: int = 100,
+        restart_factor: float = 1.5,
+        decay: float = 0.95,
+    ) -> None:
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"unsupported branching heuristic: {heuristic}")
+        if restarts not in RESTART_POLICIES:
+            raise ValueError(f"unsupported restart policy: {restarts}")
+        if phase not in PHASE_POLICIES:
+            raise ValueError(f"unsupported phase policy: {phase}")
+
+        self.heuristic = heuristic
+        self.restarts = restarts
+        self.phase = phase
+        self.seed = seed
+        self.restart_base = restart_base
+        self.restart_factor = restart_factor
+        self.decay = decay
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Config({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Config):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+
+class CDCL(Observable, Solver):
     __slots__ = (
         "variables",
+        "var_index",
         "clauses",
         "by_lit",
         "trail",
@@ -22,10 +146,39 @@ class CDCL(Solver):
         "reasons",
         "prop_head",
         "level",
+        "unsat",
+        "assumptions",
+        "config",
+        "activity",
+        "var_inc",
+        "heap",
+        "phases",
+        "rng",
+        "restarts",
+        "restart_at",
+        "learned",
+        "backjumps",
+        "backjump_levels",
+        "max_level",
         "assignments",
+        "proof",
+        "_proof_encode",
+        "_chain",
+        "_subscribers",
+        "_on_decide",
+        "_on_propagate",
+        "_on_conflict",
+        "_on_learn",
+        "_on_backjump",
+        "_on_restart",
     )
 
+    EVENTS = EVENTS
+
+    resumable = True
+
     variables: list[Var]
+    var_index: dict[Var, int]
     clauses: list[tuple[Lit, ...]]
     by_lit: dict[Lit, list[int]]
 
@@ -36,26 +189,47 @@ class CDCL(Solver):
     reasons: dict[Var, int | None]
     prop_head: int
     level: int
+    unsat: bool
+    assumptions: tuple[Lit, ...]
+
+    config: Config
+    activity: list[float]
+    var_inc: float
+    heap: list[tuple[float, int]] | None
+    phases: list[bool]
+    rng: random.Random | None
+    restarts: int
+    restart_at: int
+    learned: int
+    backjumps: int
+    # levels undone by conflict backjumps, not counting restarts
+    backjump_levels: int
+    max_level: int
+
+    _on_decide: Handler | None
+    _on_propagate: Handler | None
+    _on_conflict: Handler | None
+    _on_learn: Handler | None
+    _on_backjump: Handler | None
+    _on_restart: Handler | None
 
     assignments: AddLayers[Lit]
 
-    def __init__(self, cnf: CNF) -> None:
+    proof: ProofWriter | None
+    _proof_encode: Callable[[Lit], int]
+    # clauses resolved by the last conflict analysis, for LRAT hints
+    _chain: list[int] | None
+
+    def __init__(self, cnf: CNF, config: Config | None = None) -> None:
+        super().__init__(cnf)
+        if config is None:
+            config = Config()
+
         self.variables = []
+        self.var_index = {}
         self.clauses = []
         self.by_lit = defaultdict(list)
 
-        seen: set[Var] = set()
-        for clause_expr in cnf.args:
-            lits = tuple(clause_expr.args)
-            clause_idx = len(self.clauses)
-            self.clauses.append(lits)
-            for lit in lits:
-                self.by_lit[lit].append(clause_idx)
-                var = lit.atom()
-                if var not in seen:
-                    seen.add(var)
-                    self.variables.append(var)
-
         self.trail = []
         self.trail_lim = []
         self.assigns = {}
@@ -63,35 +237,210 @@ class CDCL(Solver):
         self.reasons = {}
         self.prop_head = 0
         self.level = 0
+        self.unsat = False
+        self.assumptions = ()
+
+        self.config = config
+        self.activity = []
+        self.var_inc = 1.0
+        self.heap = [] if config.heuristic == "vsids" else None
+        self.phases = []
+        self.rng = None
+        if config.seed is not None or config.phase == "random":
+            self.rng = random.Random(config.seed if config.seed is not None else 0)
+        self.restarts = 0
+        self.restart_at = self._restart_limit()
+        self.learned = 0
+        self.backjumps = 0
+        self.backjump_levels = 0
+        self.max_level = 0
+
         self.assignments = AddLayers(set())
+        self.proof = None
+        self._proof_encode = self._encode
+        self._chain = None
+        self._init_events()
+
+        for clause_expr in cnf.args:
+            self.add_clause(clause_expr)
+
+    def _counters(self) -> dict[str, int]:
+        return {
+            **super()._counters(),
+            "learned": self.learned,
+            "restarts": self.restarts,
+            "backjumps": self.backjumps,
+            "backjump_levels": self.backjump_levels,
+            "max_level": self.max_level,
+        }
+
+    def add_clause(self, clause_expr: Clause) -> None:
+        """
+        Add an input clause.  Clauses may be streamed in before solving or
+        between calls to ``check``, in which case the search restarts from
+        level 0 and keeps its learned clauses.
+        """
+        if self.level > 0:
+            self._backjump(0)
+        # re-examine level 0 assignments against the new clause
+        self.prop_head = 0
+
+        lits = tuple(clause_expr.args)
+        clause_idx = len(self.clauses)
+        self.clauses.append(lits)
+        for lit in lits:
+            self.by_lit[lit].append(clause_idx)
+            var = lit.atom()
+            if var not in self.var_index:
+                self._new_var(var)
 
-    def check(self) -> bool:
+    def attach_proof(
+        self, proof: ProofWriter, encode: Callable[[Lit], int] | None = None
+    ) -> None:
+        """
+        Write a DRAT or LRAT proof of unsatisfiability to ``proof`` while
+        solving.  Literals are written as ``encode(lit)``, which defaults to
+        numbering variables by first appearance, as ``PackedCNF.from_cnf``
+        does.  The proof refers to the input clauses added before the first
+        call to ``check``; LRAT clause IDs are their positions, from 1.
+        """
+        self.proof = proof
+        self._proof_encode = encode or self._encode
+        self._chain = [] if proof.lrat else None
+
+    def _prove_empty(self, conflict_idx: int) -> None:
+        """
+        Write the empty clause, refuted by ``conflict_idx`` at level 0.
+        """
+        proof = self.proof
+        assert proof is not None
+        hints = []
+        if proof.lrat:
+            # the level 0 reasons that the conflict depends on, in trail order
+            seen = {lit.atom() for lit in self.clauses[conflict_idx]}
+            for lit in reversed(self.trail):
+                var = lit.atom()
+                reason = self.reasons[var]
+                if var in seen and reason is not None:
+                    hints.append(reason + 1)
+                    seen.update(other.atom() for other in self.clauses[reason])
+            hints.reverse()
+            hints.append(conflict_idx + 1)
+        proof.add((), len(self.clauses) + 1, hints)
+        proof.flush()
+
+    def _new_var(self, var: Var) -> None:
+        idx = self.var_index[var] = len(self.variables)
+        self.variables.append(var)
+        # a tiny random initial activity breaks ties differently per seed
+        act = 0.0
+        if self.config.seed is not None:
+            assert self.rng is not None
+            act = self.rng.random() * 1e-5
+        self.activity.append(act)
+        self.phases.append(False)
+        if self.heap is not None:
+            heapq.heappush(self.heap, (-act, idx))
+
+    @timed("search")
+    def check(self, assumptions: Sequence[Lit] = ()) -> Result:
         """
         Conflict-Driven Clause Learning (CDCL) SAT algorithm.
+
+        Returns ``Result.UNKNOWN`` when the budget runs out or the solver is
+        interrupted.  The search is suspended with its trail and learned
+        clauses intact, and the next call picks up where it stopped.
+
+        ``assumptions`` are literals that are decided first, one per level,
+        so ``Result.UNSAT`` means unsatisfiable together with them.  Learned
+        clauses never depend on assumptions and are kept for later calls.
         """
-        # Enqueue initial unit clauses at decision level 0
-        for idx, clause in enumerate(self.clauses):
-            if len(clause) == 1:
-                lit = clause[0]
-                if lit.atom() not in self.assigns:
-                    self._enqueue(lit, idx)
-
-        if self._propagate() is not None:
-            return False
-
-        while len(self.assigns) < len(self.variables):
-            self._decide()
-
-            while (conflict := self._propagate()) is not None:
-                if self.level == 0:
-                    return False
-                learned, btlevel = self._analyze(conflict)
-                clause_idx = self._add_clause(learned)
-                self._backjump(btlevel)
-                self._enqueue(learned[0], clause_idx)
-
-        self.assignments = AddLayers(set(self.trail))
-        return True
+        self._start_budget()
+        if self.unsat:
+            return Result.UNSAT
+
+        assumptions = tuple(assumptions)
+        if assumptions != self.assumptions:
+            if self.level > 0:
+                self._backjump(0)
+            for lit in assumptions:
+                if lit.atom() not in self.var_index:
+                    self._new_var(lit.atom())
+            self.assumptions = assumptions
+
+        if self.level == 0:
+            # Enqueue initial unit clauses at decision level 0
+            for idx, clause in enumerate(self.clauses):
+                if len(clause) == 0:
+                    self.unsat = True
+                    if self.proof is not None:
+                        self._prove_empty(idx)
+                    return Result.UNSAT
+                if len(clause) == 1:
+                    lit = clause[0]
+                    if lit.atom() not in self.assigns:
+                        self._enqueue(lit, idx)
+
+        while True:
+            conflict = self._propagate()
+            if conflict is None:
+                if self.level < len(assumptions):
+                    lit = assumptions[self.level]
+                    value = self._value(lit)
+                    if value is False:
+                        return Result.UNSAT
+                    # an assumption that already holds still gets its level
+                    self._new_level()
+                    if self._on_decide is not None:
+                        self._on_decide(lit, self.level)
+                    if value is None:
+                        self._enqueue(lit, None)
+                    continue
+                if len(self.assigns) == len(self.variables):
+                    self.assignments = AddLayers(set(self.trail))
+                    return Result.SAT
+                if self._exhausted():
+                    return Result.UNKNOWN
+                self._decide()
+                continue
+
+            self.conflicts += 1
+            if self._on_conflict is not None:
+                self._on_conflict(conflict, self.level)
+            if self.level == 0:
+                self.unsat = True
+                if self.proof is not None:
+                    self._prove_empty(conflict)
+                return Result.UNSAT
+            learned, btlevel = self._analyze(conflict)
+            clause_idx = self._add_clause(learned)
+            self.learned += 1
+            if self.proof is not None:
+                self._prove(learned, clause_idx, conflict)
+            if self._on_learn is not None:
+                self._on_learn(learned)
+            self.backjumps += 1
+            self.backjump_levels += self.level - btlevel
+            if self._on_backjump is not None:
+                self._on_backjump(self.level, btlevel)
+            self._backjump(btlevel)
+            self._enqueue(learned[0], clause_idx)
+
+            if self.conflicts >= self.restart_at:
+                self._restart()
+            if self._exhausted():
+                return Result.UNKNOWN
+
+    def _prove(self, learned: list[Lit], clause_idx: int, conflict_idx: int) -> None:
+        proof = self.proof
+        assert proof is not None
+        encode = self._proof_encode
+        hints: list[int] = []
+        if self._chain is not None:
+            # the reasons resolved on, in trail order, then the conflict
+            hints = [idx + 1 for idx in reversed(self._chain)]
+            hints.append(conflict_idx + 1)
+        proof.add([encode(lit) for lit in learned], clause_idx + 1, hints)
 
     def _value(self, lit: Lit) -> bool | None:
         match lit:
@@ -113,15 +462,93 @@ class CDCL(Solver):
         self.trail.append(lit)
 
     def _decide(self) -> None:
-        for var in self.variables:
-            if var not in self.assigns:
-                self.level += 1
-                self.trail_lim.append(len(self.trail))
-                logger.debug("decide: %s at level %d", var, self.level)
-                self._enqueue(var, None)
-                return
+        var = self._pick_var()
+        idx = self.var_index[var]
+        match self.config.phase:
+            case "true":
+                value = True
+            case "false":
+                value = False
+            case "saved":
+                value = self.phases[idx]
+            case _:
+                assert self.rng is not None
+                value = self.rng.random() < 0.5
+
+        self._new_level()
+        lit = var if value else Not(var)
+        if self._on_decide is not None:
+            self._on_decide(lit, self.level)
+        self._enqueue(lit, None)
+
+    def _new_level(self) -> None:
+        self.level += 1
+        self.decisions += 1
+        if self.level > self.max_level:
+            self.max_level = self.level
+        self.trail_lim.append(len(self.trail))
+
+    def _pick_var(self) -> Var:
+        heap = self.heap
+        if heap is None:
+            assigns = self.assigns
+            return next(var for var in self.variables if var not in assigns)
+
+        if len(heap) > HEAP_SLACK * len(self.variables):
+            self._rebuild_heap()
+
+        # Entries are (-activity, index).  Entries whose activity has since
+        # been bumped are stale and skipped, as are assigned variables, which
+        # are pushed again when they are unassigned.
+        activity, variables, assigns = self.activity, self.variables, self.assigns
+        while True:
+            neg_act, idx = heapq.heappop(heap)
+            var = variables[idx]
+            if var not in assigns and -neg_act == activity[idx]:
+                return var
+
+    def _rebuild_heap(self) -> None:
+        activity, assigns = self.activity, self.assigns
+        self.heap = [
+            (-activity[idx], idx)
+            for idx, var in enumerate(self.variables)
+            if var not in assigns
+        ]
+        heapq.heapify(self.heap)
+
+    def _bump(self, var: Var) -> None:
+        idx = self.var_index[var]
+        act = self.activity[idx] = self.activity[idx] + self.var_inc
+        if act > ACTIVITY_LIMIT:
+            self.activity = [a / ACTIVITY_LIMIT for a in self.activity]
+            self.var_inc /= ACTIVITY_LIMIT
+            self._rebuild_heap()
+        else:
+            assert self.heap is not None
+            heapq.heappush(self.heap, (-act, idx))
+
+    def _restart_limit(self) -> int:
+        config = self.config
+        match config.restarts:
+            case "luby":
+                interval = config.restart_base * luby(self.restarts + 1)
+            case "geometric":
+                interval = int(
+                    config.restart_base * config.restart_factor**self.restarts
+                )
+            case _:
+                return 1 << 62
+        return self.conflicts + interval
+
+    def _restart(self) -> None:
+        if self._on_restart is not None:
+            self._on_restart(self.conflicts)
+        self._backjump(0)
+        self.restarts += 1
+        self.restart_at = self._restart_limit()
 
     def _propagate(self) -> int | None:
+        on_propagate = self._on_propagate
         while self.prop_head < len(self.trail):
             lit = self.trail[self.prop_head]
             self.prop_head += 1
@@ -149,9 +576,9 @@ class CDCL(Solver):
                 if num_unassigned == 0 or first_unassigned is None:
                     return clause_idx
 
-                logger.debug(
-                    "propagate: %s from clause %d", first_unassigned, clause_idx
-                )
+                if on_propagate is not None:
+                    on_propagate(first_unassigned, clause_idx)
+                self.propagations += 1
                 self._enqueue(first_unassigned, clause_idx)
 
         return None
@@ -166,6 +593,10 @@ class CDCL(Solver):
         seen: set[Var] = set()
         learned: list[Lit] = []
         counter = 0
+        bump = self.heap is not None
+        chain = self._chain
+        if chain is not None:
+            chain.clear()
 
         def process_clause(clause_idx: int, skip_var: Var | None = None) -> None:
             nonlocal counter
@@ -174,6 +605,8 @@ class CDCL(Solver):
                 if var == skip_var or var in seen:
                     continue
                 seen.add(var)
+                if bump:
+                    self._bump(var)
                 if self.levels[var] == self.level:
                     counter += 1
                 else:
@@ -192,6 +625,8 @@ class CDCL(Solver):
 
             reason = self.reasons[p.atom()]
             assert reason is not None
+            if chain is not None:
+                chain.append(reason)
             process_clause(reason, skip_var=p.atom())
 
         # Find the UIP on the trail
@@ -209,7 +644,9 @@ class CDCL(Solver):
             if lvl > btlevel:
                 btlevel = lvl
 
-        logger.debug("learned: %s, backjump to level %d", learned, btlevel)
+        if bump:
+            self.var_inc /= self.config.decay
+
         return learned, btlevel
 
     def _add_clause(self, lits: list[Lit]) -> int:
@@ -226,12 +663,250 @@ class CDCL(Solver):
             if btlevel < len(self.trail_lim)
             else len(self.trail)
         )
+        save_phase = self.config.phase == "saved"
+        heap = self.heap
         while len(self.trail) > target:
             lit = self.trail.pop()
             var = lit.atom()
+            if save_phase or heap is not None:
+                idx = self.var_index[var]
+                if save_phase:
+                    self.phases[idx] = self.assigns[var]
+                if heap is not None:
+                    heapq.heappush(heap, (-self.activity[idx], idx))
             del self.assigns[var]
             del self.levels[var]
             del self.reasons[var]
         del self.trail_lim[btlevel:]
         self.level = btlevel
         self.prop_head = len(self.trail)
+
+    # checkpoints
+
+    def _encode(self, lit: Lit) -> int:
+        if type(lit) is Var:
+            return self.var_index[lit] + 1
+        return -self.var_index[lit.atom()] - 1
+
+    def dump(self, f: BinaryIO) -> None:
+        """
+        Write the complete search state, so that a solver restored with
+        ``load`` or ``from_bytes`` continues exactly where this one is.
+        """
+        encode = self._encode
+        lits = array("i")
+        sizes = array("i")
+        for clause in self.clauses:
+            lits.extend(encode(lit) for lit in clause)
+            sizes.append(len(clause))
+
+        trail = array("i", (encode(lit) for lit in self.trail))
+        reasons = array("i")
+        for lit in self.trail:
+            reason = self.reasons[lit.atom()]
+            reasons.append(-1 if reason is None else reason)
+        trail_lim = array("i", self.trail_lim)
+        assumed = array("i", (encode(lit) for lit in self.assumptions))
+        activity = array("d", self.activity)
+        phases = bytes(self.phases)
+        rng = array("I")
+        if self.rng is not None:
+            rng.extend(self.rng.getstate()[1])
+        flags = bytes(var.generated for var in self.variables)
+        names = "\n".join(var.name for var in self.variables).encode()
+
+        compress = zlib.compressobj(1)
+        sections = (
+            lits,
+            sizes,
+            trail,
+            reasons,
+            trail_lim,
+            assumed,
+            activity,
+            phases,
+            rng,
+            flags,
+            names,
+        )
+        body = b"".join(compress.compress(section) for section in sections)
+        body += compress.flush()
+
+        config = self.config
+
+        f.write(
+            CHECKPOINT_HEADER.pack(
+                CHECKPOINT_MAGIC,
+                len(self.variables),
+                len(self.clauses),
+                len(lits),
+                len(trail),
+                len(names),
+                self.level,
+                self.prop_head,
+                self.conflicts,
+                self.decisions,
+                self.propagations,
+                self.unsat,
+                HEURISTICS.index(config.heuristic),
+                RESTART_POLICIES.index(config.restarts),
+                PHASE_POLICIES.index(config.phase),
+                config.seed is not None,
+                config.seed if config.seed is not None else 0,
+                config.restart_base,
+                config.restart_factor,
+                config.decay,
+                self.var_inc,
+                self.restarts,
+                self.restart_at,
+                len(rng),
+                self.learned,
+                self.backjumps,
+                self.backjump_levels,
+                self.max_level,
+                len(assumed),
+            )
+        )
+        f.write(body)
+
+    def to_bytes(self) -> bytes:
+        f = io.BytesIO()
+        self.dump(f)
+        return f.getvalue()
+
+    def save(self, path: str | os.PathLike) -> None:
+        with open(path, "wb") as f:
+            self.dump(f)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes | bytearray | memoryview) -> CDCL:
+        view = memoryview(buf)
+        if len(view) < CHECKPOINT_HEADER.size:
+            raise ParseError("truncated CDCL checkpoint header")
+        (
+            magic,
+            num_vars,
+            num_clauses,
+            num_lits,
+            trail_len,
+            names_size,
+            level,
+            prop_head,
+            conflicts,
+            decisions,
+            propagations,
+            unsat,
+            heuristic,
+            restart_policy,
+            phase_policy,
+            has_seed,
+            seed,
+            restart_base,
+            restart_factor,
+            decay,
+            var_inc,
+            restarts,
+            restart_at,
+            rng_len,
+            learned,
+            backjumps,
+            backjump_levels,
+            max_level,
+            num_assumed,
+        ) = CHECKPOINT_HEADER.unpack_from(view)
+        if magic != CHECKPOINT_MAGIC:
+            raise ParseError("not a CDCL checkpoint")
+
+        try:
+            body = zlib.decompress(view[CHECKPOINT_HEADER.size :])
+        except zlib.error as e:
+            raise ParseError(f"corrupt CDCL checkpoint: {e}") from None
+
+        pos = 0
+
+        def section(typecode: str, n: int) -> array:
+            nonlocal pos
+            values = array(typecode)
+            end = pos + values.itemsize * n
+            values.frombytes(body[pos:end])
+            pos = end
+            return values
+
+        lits = section("i", num_lits)
+        sizes = section("i", num_clauses)
+        trail = section("i", trail_len)
+        reasons = section("i", trail_len)
+        trail_lim = section("i", level)
+        assumed = section("i", num_assumed)
+        activity = section("d", num_vars)
+        phases = section("B", num_vars)
+        rng = section("I", rng_len)
+        flags = section("B", num_vars)
+        names = body[pos : pos + names_size].decode()
+        if pos + names_size != len(body):
+            raise ParseError("truncated CDCL checkpoint data")
+
+        config = Config(
+            HEURISTICS[heuristic],
+            RESTART_POLICIES[restart_policy],
+            PHASE_POLICIES[phase_policy],
+            seed=seed if has_seed else None,
+            restart_base=restart_base,
+            restart_factor=restart_factor,
+            decay=decay,
+        )
+        solver = cls(And(), config)
+        variables = [
+            Var(name, generated=bool(flag))
+            for name, flag in zip(names.split("\n") if num_vars else [], flags)
+        ]
+        # one shared object per literal: table[v] is +v, table[-v] is -v and
+        # table[0] is unused
+        negated: list[Lit] = [Not(var) for var in reversed(variables)]
+        table: list[Lit] = [*negated[-1:], *variables, *negated]
+
+        solver.variables = variables
+        solver.var_index = {var: i for i, var in enumerate(variables)}
+        solver.activity = activity.tolist()
+        solver.phases = [bool(phase) for phase in phases]
+        if solver.rng is not None:
+            solver.rng.setstate((3, tuple(rng), None))
+        solver.var_inc = var_inc
+        solver.restarts = restarts
+        solver.restart_at = restart_at
+        start = 0
+        for size in sizes:
+            solver._add_clause([table[lit] for lit in lits[start : start + size]])
+            start += size
+
+        # a level opened by an assumption that already held has no trail
+        # entry of its own, so several levels can start at the same position
+        opened = 0
+        for i, (lit, reason) in enumerate(zip(trail, reasons)):
+            while opened < level and trail_lim[opened] <= i:
+                opened += 1
+            solver.level = opened
+            solver._enqueue(table[lit], None if reason < 0 else reason)
+        solver.level = level
+        solver.trail_lim = list(trail_lim)
+        solver.assumptions = tuple(table[lit] for lit in assumed)
+        if solver.heap is not None:
+            solver._rebuild_heap()
+
+        solver.prop_head = prop_head
+        solver.conflicts = conflicts
+        solver.decisions = decisions
+        solver.propagations = propagations
+        solver.learned = learned
+        solver.backjumps = backjumps
+        solver.backjump_levels = backjump_levels
+        solver.max_level = max_level
+        solver.unsat = unsat
+        if len(solver.assigns) == num_vars and not unsat:
+            solver.assignments = AddLayers(set(solver.trail))
+        return solver
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> CDCL:
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
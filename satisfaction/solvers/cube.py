@@ -0,0 +1,272 @@
+"""
+Cube-and-conquer.
+
+A lookahead ``Cuber`` splits the formula into cubes, partial assignments
+that together cover every assignment not already refuted by propagation.
+``CubeAndConquer`` then solves the formula under each cube with CDCL in a
+pool of worker processes.  Each worker keeps one warm solver, whose learned
+clauses stay valid across cubes, and takes the next cube as soon as it is
+free.  The first satisfiable cube ends the search.
+"""
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import logging
+import math
+from multiprocessing.context import BaseContext
+from multiprocessing.sharedctypes import Synchronized
+import os
+import threading
+import time
+
+from satisfaction.expr import CNF, Lit, Var
+from satisfaction.layered import AddLayers
+from satisfaction.packed import PackedCNF, VarTable
+
+from .cdcl import CDCL, Config
+from .indexed import DPLL
+from .portfolio import POLL_INTERVAL, default_context, verify
+from .solver import Budget, Result, Solver
+from .stats import timed
+
+logger = logging.getLogger(__name__)
+
+# only the variables occurring most often are looked ahead on
+LOOKAHEAD_CANDIDATES = 16
+
+
+class Cuber(DPLL):
+    """
+    Lookahead on the indexed DPLL's clause layers.  At each node the most
+    frequent unassigned variables are propagated both ways; a literal whose
+    propagation fails is refuted on the spot, and otherwise the variable
+    whose two branches assign the most literals (by product) is split on.
+    """
+
+    __slots__ = ("candidates",)
+
+    candidates: int
+
+    def __init__(self, expr: CNF, candidates: int = LOOKAHEAD_CANDIDATES) -> None:
+        super().__init__(expr)
+        self.candidates = candidates
+
+    def cubes(self, target: int) -> list[list[Lit]]:
+        """
+        About ``target`` cubes, fewer where branches are refuted.  No cubes
+        at all means the formula is unsatisfiable.
+        """
+        depth = max(0, math.ceil(math.log2(max(target, 1))))
+        cubes: list[list[Lit]] = []
+        self._push()
+        self._split([], depth, cubes)
+        self._pop()
+        return cubes
+
+    def _propagate_units(self) -> bool:
+        """
+        Propagate to a fixpoint; false on conflict.
+        """
+        while units := self.find_units():
+            self.unit_propagate(*units)
+        return len(self.clauses.with_count(0)) == 0
+
+    def _push(self) -> None:
+        self.assignments.push_layer()
+        self.clauses.push_layer()
+
+    def _pop(self) -> None:
+        self.assignments.pop_layer()
+        self.clauses.pop_layer()
+
+    def _split(self, path: list[Lit], depth: int, cubes: list[list[Lit]]) -> None:
+        if not self._propagate_units():
+            return
+        if depth == 0 or len(self.clauses.els) == 0:
+            cubes.append(list(path))
+            return
+
+        lit = self._choose()
+        if lit is None:
+            # refuted, unless failed literals satisfied every clause
+            if len(self.clauses.els) == 0:
+                cubes.append(list(path))
+            return
+
+        for branch in (lit, ~lit):
+            self._push()
+            self.unit_propagate(branch)
+            path.append(branch)
+            self._split(path, depth - 1, cubes)
+            path.pop()
+            self._pop()
+
+    def _lookahead(self, lit: Lit) -> int | None:
+        """
+        Number of literals assigned by propagating ``lit``, or ``None`` if
+        that leads to a conflict.
+        """
+        before = len(self.assignments.els)
+        self._push()
+        self.unit_propagate(lit)
+        ok = self._propagate_units()
+        gained = len(self.assignments.els) - before
+        self._pop()
+        return gained if ok else None
+
+    def _choose(self) -> Lit | None:
+        """
+        The literal to split on, or ``None`` if failed literals refuted the
+        node or left nothing to split on.
+        """
+        while True:
+            counts: dict[Var, int] = {}
+            for clause in self.clauses.els:
+                for lit in clause.els:
+                    var = lit.atom()
+                    counts[var] = counts.get(var, 0) + 1
+            if not counts:
+                return None
+
+            ranked = sorted(counts, key=lambda v: (-counts[v], v.name))
+            best: Lit | None = None
+            best_score = -1
+            for var in ranked[: self.candidates]:
+                pos = self._lookahead(var)
+                neg = self._lookahead(~var)
+                if pos is None or neg is None:
+                    break
+                score = (pos + 1) * (neg + 1)
+                if score > best_score:
+                    best, best_score = var, score
+            else:
+                return best
+
+            # a failed literal: its negation holds at this node
+            if pos is None and neg is None:
+                return None
+            self.unit_propagate(~var if pos is None else var)
+            if not self._propagate_units():
+                return None
+
+
+# per-process state of a conquer worker
+_solver: CDCL | None = None
+_table: VarTable | None = None
+
+
+def _init_worker(data: bytes, config: Config, stop: Synchronized[int]) -> None:
+    global _solver, _table
+    packed = PackedCNF.from_bytes(data)
+    _table = packed.table
+    solver = _solver = CDCL(packed.to_cnf(), config)
+
+    def watch() -> None:
+        while not stop.value:
+            time.sleep(POLL_INTERVAL)
+        solver.interrupt()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def _conquer(cube: list[int], budget: Budget) -> tuple[str, list[int]]:
+    assert _solver is not None and _table is not None
+    _solver.budget = budget
+    result = _solver.check([_table.decode(lit) for lit in cube])
+    model = []
+    if result is Result.SAT:
+        model = [_table.encode(lit) for lit in _solver.trail]
+    return result.value, model
+
+
+class CubeAndConquer(Solver):
+    __slots__ = (
+        "packed",
+        "num_cubes",
+        "workers",
+        "config",
+        "mp_context",
+        "cubes",
+        "assignments",
+    )
+
+    packed: PackedCNF
+    num_cubes: int
+    workers: int
+    config: Config
+    mp_context: BaseContext
+    cubes: list[list[Lit]]
+    assignments: AddLayers
+
+    def __init__(
+        self,
+        cnf: CNF,
+        cubes: int | None = None,
+        workers: int | None = None,
+        config: Config | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """
+        Split into about ``cubes`` cubes (default: eight per worker) and solve
+        them with ``workers`` processes (default: one per CPU).
+        """
+        super().__init__(cnf)
+        self.workers = workers or os.cpu_count() or 1
+        self.num_cubes = cubes or 8 * self.workers
+        self.packed = PackedCNF.from_cnf(cnf)
+        self.config = config or Config("vsids", "luby", "saved")
+        self.mp_context = mp_context or default_context()
+        self.cubes = []
+        self.assignments = AddLayers(set())
+
+    @timed("search")
+    def check(self) -> Result:
+        """
+        The budget applies to each cube; the wall-clock limit and
+        ``interrupt`` also stop the whole search.
+        """
+        self._start_budget()
+        table = self.packed.table
+        self.cubes = Cuber(self.packed.to_cnf()).cubes(self.num_cubes)
+        logger.debug("split into %d cubes", len(self.cubes))
+        if not self.cubes:
+            return Result.UNSAT
+
+        stop = self.mp_context.RawValue("b", 0)
+        executor = ProcessPoolExecutor(
+            min(self.workers, len(self.cubes)),
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(self.packed.to_bytes(), self.config, stop),
+        )
+
+        result = Result.UNSAT
+        pending: set[Future[tuple[str, list[int]]]] = set()
+        try:
+            # the pool hands each cube to the next idle worker
+            for cube in self.cubes:
+                ints = [table.encode(lit) for lit in cube]
+                pending.add(executor.submit(_conquer, ints, self.budget))
+
+            while pending:
+                if self._exhausted():
+                    return Result.UNKNOWN
+                done, pending = wait(
+                    pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    value, model = future.result()
+                    answer = Result(value)
+                    if answer is Result.SAT and not verify(self.packed, model):
+                        logger.error("discarding invalid model for a cube")
+                        answer = Result.UNKNOWN
+                    if answer is Result.UNKNOWN:
+                        result = Result.UNKNOWN
+                    elif answer is Result.SAT:
+                        decode = table.decode
+                        self.assignments = AddLayers({decode(lit) for lit in model})
+                        return Result.SAT
+            return result
+        finally:
+            stop.value = 1
+            executor.shutdown(wait=True, cancel_futures=True)
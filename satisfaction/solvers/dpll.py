@@ -6,7 +6,8 @@ from satisfaction.expr import And, CNF, Lit, Or
 from satisfaction.layered import AddLayers
 from satisfaction.typing import ChooseLit
 
-from .solver import Solver
+from .solver import Result, SearchInterrupted, Solver
+from .stats import timed
 
 logger = logging.getLogger(__name__)
 
@@ -19,20 +20,35 @@ class DPLL(Solver):
     assignments: AddLayers
 
     def __init__(self, expr: CNF, choose_lit: ChooseLit = common_lit) -> None:
+        super().__init__(expr)
         self.expr = expr
         self.choose_lit = choose_lit
         self.assignments = AddLayers(set())
 
-    def check(self, expr: CNF | None = None) -> bool:
+    @timed("search")
+    def check(self, expr: CNF | None = None) -> Result:
         """
         The Davis-Putnam-Logemann-Loveland (DPLL) SAT algorithm.
 
         Implementation based on the following description:
         https://en.wikipedia.org/wiki/DPLL_algorithm
+
+        Returns ``Result.UNKNOWN`` when the budget runs out or the solver is
+        interrupted, after undoing every branch taken.
         """
         if expr is None:
             expr = self.expr
 
+        self._start_budget()
+        depth = self.assignments.depth
+        try:
+            return Result.SAT if self._search(expr) else Result.UNSAT
+        except SearchInterrupted:
+            while self.assignments.depth > depth:
+                self.assignments.pop_layer()
+            return Result.UNKNOWN
+
+    def _search(self, expr: CNF) -> bool:
         while lit := self.find_unit(expr):
             expr = self.unit_propagate(lit, expr)
 
@@ -54,19 +70,24 @@ class DPLL(Solver):
         # evaluate to `false`.
         for or_expr in expr.args:
             if len(or_expr.args) == 0:
+                self.conflicts += 1
                 return False
 
+        if self._exhausted():
+            raise SearchInterrupted
+        self.decisions += 1
+
         lit = self.choose_lit(expr)
 
         logger.debug("+++++++++++++ branching +++++++++++++")
         self.assignments.push_layer()
-        if self.check(self.unit_propagate(lit, expr)):
+        if self._search(self.unit_propagate(lit, expr)):
             return True
         self.assignments.pop_layer()
 
         logger.debug("------------ backtracking -----------")
         self.assignments.push_layer()
-        if self.check(self.unit_propagate(~lit, expr)):
+        if self._search(self.unit_propagate(~lit, expr)):
             return True
         self.assignments.pop_layer()
 
@@ -80,6 +101,7 @@ class DPLL(Solver):
 
     def unit_propagate(self, lit: Lit, and_expr: CNF) -> CNF:
         logger.debug("assigning unit literal: %s", lit)
+        self.propagations += 1
         self.assignments.update({lit})
 
         not_lit = ~lit
@@ -0,0 +1,314 @@
+"""
+Search events and trace recording.
+
+Solvers that support events hold one handler slot per event, ``None`` while
+nobody subscribes, so an unobserved search pays a single ``is None`` test
+per event.  Handlers are called synchronously with these arguments::
+
+    decide(lit, level)          a decision opened ``level``
+    propagate(lit, reason)      a unit clause (index ``reason``, if known)
+    conflict(clause, level)     a falsified clause (index, if known)
+    learn(clause)               the literals of a learned clause
+    backjump(level, target)     undoing levels after a conflict
+    restart(conflicts)          a restart after that many conflicts
+
+``TraceRecorder`` stores events in compact integer columns and exports them
+as Chrome trace-event JSON (for ``chrome://tracing`` or Perfetto) or as a
+binary log.
+"""
+
+from __future__ import annotations
+from array import array
+import json
+import logging
+import struct
+import time
+from typing import Any, Callable, ClassVar, Iterable, Iterator, TextIO
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import Var
+from satisfaction.packed import VarTable
+
+EVENTS = ("decide", "propagate", "conflict", "learn", "backjump", "restart")
+
+type Handler = Callable[..., object]
+
+# Binary log layout (little-endian, sections aligned to 8 bytes):
+#
+#   header   magic, num_events, names_size
+#   times    int64[num_events]    nanoseconds since recording started
+#   kinds    uint8[num_events]    index into EVENTS
+#   a, b     int32[num_events]    event arguments, see TraceRecorder
+#   names    utf-8, newline separated names of the literals' variables
+TRACE_MAGIC = b"SATTRC01"
+TRACE_HEADER = struct.Struct("<8sQQ")
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class Observable:
+    """
+    Mixin for solvers with events.  Subclasses list their ``EVENTS`` and
+    declare a ``_subscribers`` slot plus an ``_on_<event>`` slot for each.
+    """
+
+    __slots__ = ()
+
+    EVENTS: ClassVar[tuple[str, ...]]
+
+    _subscribers: dict[str, list[Handler]]
+
+    def _init_events(self) -> None:
+        self._subscribers = {}
+        for event in self.EVENTS:
+            setattr(self, f"_on_{event}", None)
+
+    def subscribe(self, event: str, handler: Handler) -> None:
+        if event not in self.EVENTS:
+            raise ValueError(
+                f"{type(self).__name__} has no {event!r} event, "
+                f"expected one of {list(self.EVENTS)}"
+            )
+        self._subscribers.setdefault(event, []).append(handler)
+        self._refresh(event)
+
+    def unsubscribe(self, event: str, handler: Handler) -> None:
+        self._subscribers.get(event, []).remove(handler)
+        self._refresh(event)
+
+    def _refresh(self, event: str) -> None:
+        handlers = tuple(self._subscribers.get(event, ()))
+        dispatch: Handler | None
+        if not handlers:
+            dispatch = None
+        elif len(handlers) == 1:
+            dispatch = handlers[0]
+        else:
+
+            def dispatch(*args: Any) -> None:
+                for handler in handlers:
+                    handler(*args)
+
+        setattr(self, f"_on_{event}", dispatch)
+
+
+def log_events(solver: Observable, logger: logging.Logger) -> None:
+    """
+    Log every event at debug level.  Formatting happens only when the
+    logger is enabled, but each event still costs a call.
+    """
+    messages = {
+        "decide": "decide: %s at level %d",
+        "propagate": "propagate: %s from clause %s",
+        "conflict": "conflict: clause %s at level %d",
+        "learn": "learned: %s",
+        "backjump": "backjump: level %d to %d",
+        "restart": "restart after %d conflicts",
+    }
+    for event in solver.EVENTS:
+        message = messages[event]
+
+        def handler(*args: Any, message: str = message) -> None:
+            logger.debug(message, *args)
+
+        solver.subscribe(event, handler)
+
+
+class TraceRecorder:
+    """
+    Records events with a nanosecond timestamp and two integer arguments:
+    literals are numbered as in ``table``, and missing clause indices
+    are -1.  ``learn`` records the clause size and its first literal.
+    """
+
+    __slots__ = ("solver", "table", "times", "kinds", "a", "b", "start", "_handlers")
+
+    solver: Observable | None
+    table: VarTable
+    times: array[int]
+    kinds: array[int]
+    a: array[int]
+    b: array[int]
+    start: int
+
+    _handlers: dict[str, Handler]
+
+    def __init__(
+        self, solver: Observable | None = None, events: Iterable[str] | None = None
+    ) -> None:
+        """
+        Record ``events`` (default: all the solver has) from ``solver``
+        until ``close``.
+        """
+        self.solver = solver
+        self.table = VarTable()
+        self.times = array("q")
+        self.kinds = array("B")
+        self.a = array("i")
+        self.b = array("i")
+        self.start = time.perf_counter_ns()
+        self._handlers = {}
+        if solver is None:
+            return
+
+        for event in solver.EVENTS if events is None else events:
+            handler = self._handler(event)
+            self._handlers[event] = handler
+            solver.subscribe(event, handler)
+
+    def _handler(self, event: str) -> Handler:
+        kind = EVENTS.index(event)
+        now, start = time.perf_counter_ns, self.start
+        add_time, add_kind = self.times.append, self.kinds.append
+        add_a, add_b = self.a.append, self.b.append
+        encode = self.table.encode
+
+        def record(a: int, b: int) -> None:
+            add_time(now() - start)
+            add_kind(kind)
+            add_a(a)
+            add_b(b)
+
+        match event:
+            case "decide":
+                return lambda lit, level: record(encode(lit), level)
+            case "propagate":
+                return lambda lit, reason: record(
+                    encode(lit), -1 if reason is None else reason
+                )
+            case "conflict":
+                return lambda clause, level: record(
+                    -1 if clause is None else clause, level
+                )
+            case "learn":
+                return lambda clause: record(len(clause), encode(clause[0]))
+            case "backjump":
+                return record
+            case "restart":
+                return lambda conflicts: record(conflicts, 0)
+            case _:
+                raise ValueError(f"unknown event {event!r}")
+
+    def close(self) -> None:
+        if self.solver is not None:
+            for event, handler in self._handlers.items():
+                self.solver.unsubscribe(event, handler)
+            self.solver = None
+            self._handlers = {}
+
+    def __enter__(self) -> TraceRecorder:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def events(self) -> Iterator[tuple[int, str, int, int]]:
+        """
+        ``(nanoseconds, event, a, b)`` in the order they happened.
+        """
+        for t, kind, a, b in zip(self.times, self.kinds, self.a, self.b):
+            yield t, EVENTS[kind], a, b
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        Instant events with decoded arguments, plus a counter track of the
+        decision level.
+        """
+        names = [var.name for var in self.table.vars]
+
+        def lit_name(lit: int) -> str:
+            return names[abs(lit) - 1] if lit > 0 else "~" + names[abs(lit) - 1]
+
+        trace = []
+        for t, event, a, b in self.events():
+            ts = t / 1000
+            match event:
+                case "decide":
+                    args: dict[str, Any] = {"lit": lit_name(a), "level": b}
+                case "propagate":
+                    args = {"lit": lit_name(a), "reason": b}
+                case "conflict":
+                    args = {"clause": a, "level": b}
+                case "learn":
+                    args = {"size": a, "asserting": lit_name(b)}
+                case "backjump":
+                    args = {"from": a, "to": b}
+                case _:
+                    args = {"conflicts": a}
+            trace.append(
+                {
+                    "name": event,
+                    "ph": "i",
+                    "s": "t",
+                    "ts": ts,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+            if event in ("decide", "backjump"):
+                level = b
+                trace.append(
+                    {
+                        "name": "level",
+                        "ph": "C",
+                        "ts": ts,
+                        "pid": 0,
+                        "args": {"level": level},
+                    }
+                )
+        return {"traceEvents": trace, "displayTimeUnit": "ns"}
+
+    def write_chrome_trace(self, f: TextIO) -> None:
+        json.dump(self.to_chrome_trace(), f)
+
+    def to_bytes(self) -> bytes:
+        n = len(self)
+        names = "\n".join(var.name for var in self.table.vars).encode()
+        sections = (
+            TRACE_HEADER.pack(TRACE_MAGIC, n, len(names)),
+            self.times.tobytes(),
+            self.kinds.tobytes() + bytes(_align(n) - n),
+            self.a.tobytes(),
+            self.b.tobytes(),
+            names,
+        )
+        return b"".join(sections)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> TraceRecorder:
+        """
+        A detached recorder holding a saved log.  Variables keep their
+        names but not whether they were generated.
+        """
+        if len(buf) < TRACE_HEADER.size:
+            raise ParseError("truncated trace header")
+        magic, n, names_size = TRACE_HEADER.unpack_from(buf)
+        if magic != TRACE_MAGIC:
+            raise ParseError("not a trace log")
+
+        times_at = TRACE_HEADER.size
+        kinds_at = times_at + 8 * n
+        a_at = kinds_at + _align(n)
+        b_at = a_at + 4 * n
+        names_at = b_at + 4 * n
+        if len(buf) < names_at + names_size:
+            raise ParseError("truncated trace data")
+
+        recorder = cls()
+        recorder.times.frombytes(buf[times_at:kinds_at])
+        recorder.kinds.frombytes(buf[kinds_at : kinds_at + n])
+        recorder.a.frombytes(buf[a_at:b_at])
+        recorder.b.frombytes(buf[b_at : b_at + 4 * n])
+        if any(kind >= len(EVENTS) for kind in recorder.kinds):
+            raise ParseError("unknown event kind in trace")
+
+        names = buf[names_at : names_at + names_size].decode()
+        for name in names.split("\n") if names else []:
+            recorder.table.number(Var(name))
+        return recorder
@@ -1,35 +1,70 @@
 from __future__ import annotations
 from collections import defaultdict
-import logging
 
 from satisfaction.expr import CNF, Clause as ClauseExpr, Lit
 from satisfaction.layered import RemoveLayers, AddLayers
 
-from .solver import Solver
+from .events import Handler, Observable
+from .solver import Result, SearchInterrupted, Solver
+from .stats import timed
 
-logger = logging.getLogger(__name__)
 
+class DPLL(Observable, Solver):
+    __slots__ = (
+        "expr",
+        "clauses",
+        "assignments",
+        "_subscribers",
+        "_on_decide",
+        "_on_propagate",
+        "_on_conflict",
+        "_on_backjump",
+    )
 
-class DPLL(Solver):
-    __slots__ = ("expr", "clauses", "assignments")
+    EVENTS = ("decide", "propagate", "conflict", "backjump")
 
     expr: CNF
     clauses: Clauses
     assignments: AddLayers
 
+    _on_decide: Handler | None
+    _on_propagate: Handler | None
+    _on_conflict: Handler | None
+    _on_backjump: Handler | None
+
     def __init__(self, expr: CNF) -> None:
+        super().__init__(expr)
         self.expr = expr
         self.clauses = Clauses(expr)
         self.assignments = AddLayers(set())
+        self._init_events()
 
-    def check(self) -> bool:
+    @timed("search")
+    def check(self) -> Result:
         """
         The Davis-Putnam-Logemann-Loveland (DPLL) SAT algorithm.
 
         Implementation based on the following description:
         https://en.wikipedia.org/wiki/DPLL_algorithm
+
+        Returns ``Result.UNKNOWN`` when the budget runs out or the solver is
+        interrupted, after undoing every branch taken.
         """
+        self._start_budget()
+        depth = self.clauses.depth
+        try:
+            return Result.SAT if self._search() else Result.UNSAT
+        except SearchInterrupted:
+            while self.clauses.depth > depth:
+                self.assignments.pop_layer()
+                self.clauses.pop_layer()
+            return Result.UNKNOWN
+
+    def _search(self) -> bool:
         while units := self.find_units():
+            if self._on_propagate is not None:
+                for unit in units:
+                    self._on_propagate(unit, None)
             self.unit_propagate(*units)
 
         # If the root conjunction is empty, then the overall formula is
@@ -45,28 +80,30 @@ class DPLL(Solver):
         # disjunction evaluates to `false` and the root conjunction also
         # evaluate to `false`.
         if len(self.clauses.with_count(0)) > 0:
+            self.conflicts += 1
+            if self._on_conflict is not None:
+                self._on_conflict(None, self.clauses.depth)
             return False
 
+        if self._exhausted():
+            raise SearchInterrupted
+        self.decisions += 1
+
         first_clause = next(iter(self.clauses.els))
         lit = next(iter(first_clause.els))
 
-        logger.debug("+++++++++++++ branching +++++++++++++")
-        self.assignments.push_layer()
-        self.clauses.push_layer()
-        self.unit_propagate(lit)
-        if self.check():
-            return True
-        self.assignments.pop_layer()
-        self.clauses.pop_layer()
-
-        logger.debug("------------ backtracking -----------")
-        self.assignments.push_layer()
-        self.clauses.push_layer()
-        self.unit_propagate(~lit)
-        if self.check():
-            return True
-        self.assignments.pop_layer()
-        self.clauses.pop_layer()
+        for branch in (lit, ~lit):
+            self.assignments.push_layer()
+            self.clauses.push_layer()
+            if self._on_decide is not None:
+                self._on_decide(branch, self.clauses.depth)
+            self.unit_propagate(branch)
+            if self._search():
+                return True
+            if self._on_backjump is not None:
+                self._on_backjump(self.clauses.depth, self.clauses.depth - 1)
+            self.assignments.pop_layer()
+            self.clauses.pop_layer()
 
         return False
 
@@ -82,7 +119,7 @@ class DPLL(Solver):
         return set(units.values())
 
     def unit_propagate(self, *units: Lit) -> None:
-        logger.debug("assigning unit literals: %s", units)
+        self.propagations += len(units)
         self.assignments.update(set(units))
 
         for unit in units:
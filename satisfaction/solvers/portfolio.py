@@ -0,0 +1,232 @@
+"""
+Parallel portfolio of diversified CDCL configurations.
+
+Every configuration runs on the same formula in its own process.  The first
+definite answer wins and the other workers are told to stop: each worker
+polls a shared flag from a helper thread and interrupts its solver, so it
+returns at its next decision or conflict.  Workers that do not stop in
+time are terminated.
+
+The formula is shipped to the workers in packed integer form, and models
+come back as integer literals which are checked against every clause before
+they are accepted.  With ``share`` the workers also exchange short learned
+clauses through shared memory (see ``sharing``).
+"""
+
+from __future__ import annotations
+import logging
+import multiprocessing as mp
+from multiprocessing.context import BaseContext, SpawnContext
+from multiprocessing.queues import Queue
+from multiprocessing.sharedctypes import Synchronized
+import os
+import queue
+import threading
+import time
+from typing import cast
+
+from satisfaction.expr import CNF
+from satisfaction.layered import AddLayers
+from satisfaction.packed import PackedCNF
+
+from .cdcl import CDCL, Config
+from .sharing import ClauseExchange, ClauseRing, SharingCDCL
+from .solver import Budget, Result, Solver
+from .stats import timed
+
+logger = logging.getLogger(__name__)
+
+# how often the coordinating process checks its own budget and workers check
+# whether to stop, in seconds
+POLL_INTERVAL = 0.05
+# how long a cancelled worker gets to return before it is terminated
+JOIN_TIMEOUT = 1.0
+
+# a spread of branching, restart and phase policies; further workers reuse
+# them with different seeds
+BASE_CONFIGS = (
+    Config("vsids", "luby", "saved"),
+    Config("vsids", "geometric", "saved"),
+    Config("vsids", "luby", "false"),
+    Config("vsids", "luby", "random"),
+    Config("vsids", "geometric", "true"),
+    Config("vsids", "none", "saved"),
+    Config("order", "luby", "saved"),
+    Config("vsids", "geometric", "random"),
+)
+
+
+def default_context() -> BaseContext:
+    """
+    ``forkserver`` where available: forking a multi-threaded process (such
+    as a server) can deadlock the child, and the fork server only has to
+    import the solver once.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return mp.get_context("spawn")
+
+
+def default_configs(n: int) -> list[Config]:
+    configs = []
+    for i in range(n):
+        base = BASE_CONFIGS[i % len(BASE_CONFIGS)]
+        seed = None if i < len(BASE_CONFIGS) else i
+        configs.append(
+            Config(
+                base.heuristic,
+                base.restarts,
+                base.phase,
+                seed=seed,
+                restart_base=base.restart_base,
+            )
+        )
+    return configs
+
+
+def _work(
+    idx: int,
+    data: bytes,
+    config: Config,
+    budget: Budget,
+    stop: Synchronized[int],
+    results: Queue[tuple[int, str, list[int]]],
+    ring_names: list[str] | None,
+) -> None:
+    packed = PackedCNF.from_bytes(data)
+    table = packed.table
+    exchange = None
+    if ring_names is None:
+        solver = CDCL(packed.to_cnf(), config)
+    else:
+        exchange = ClauseExchange.attach(ring_names, idx)
+        solver = SharingCDCL(packed.to_cnf(), config, exchange)
+    solver.budget = budget
+
+    # A multiprocessing.Event would be simpler, but setting one blocks
+    # forever if a process that waited on it has since exited.
+    def watch() -> None:
+        while not stop.value:
+            time.sleep(POLL_INTERVAL)
+        solver.interrupt()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+    try:
+        result = solver.check()
+    finally:
+        if exchange is not None:
+            exchange.close()
+
+    model = []
+    if result is Result.SAT:
+        model = [table.encode(lit) for lit in solver.trail]
+    results.put((idx, result.value, model))
+
+
+def verify(packed: PackedCNF, model: list[int]) -> bool:
+    true = set(model)
+    return all(any(lit in true for lit in clause) for clause in packed)
+
+
+class PortfolioSolver(Solver):
+    __slots__ = ("packed", "configs", "share", "mp_context", "winner", "assignments")
+
+    packed: PackedCNF
+    configs: list[Config]
+    share: bool
+    mp_context: BaseContext
+    winner: Config | None
+    assignments: AddLayers
+
+    def __init__(
+        self,
+        cnf: CNF,
+        configs: list[Config] | None = None,
+        workers: int | None = None,
+        share: bool = True,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """
+        Run ``configs``, or ``workers`` (default: one per CPU) diversified
+        configurations, each in its own process.  ``share`` turns on
+        learned-clause exchange between them.
+        """
+        super().__init__(cnf)
+        if configs is None:
+            configs = default_configs(workers or os.cpu_count() or 1)
+
+        self.packed = PackedCNF.from_cnf(cnf)
+        self.configs = configs
+        self.share = share
+        self.mp_context = mp_context or default_context()
+        self.winner = None
+        self.assignments = AddLayers(set())
+
+    @timed("search")
+    def check(self) -> Result:
+        """
+        Returns the first definite answer from any worker.  The budget
+        applies to each worker; the wall-clock limit and ``interrupt`` also
+        stop the whole portfolio.
+        """
+        self._start_budget()
+        # every concrete context has Process, which BaseContext does not declare
+        ctx = cast(SpawnContext, self.mp_context)
+        stop = ctx.RawValue("b", 0)
+        results: Queue[tuple[int, str, list[int]]] = ctx.Queue()
+        data = self.packed.to_bytes()
+        rings = [ClauseRing.create() for _ in self.configs] if self.share else []
+        ring_names = [ring.name for ring in rings] if self.share else None
+
+        procs = [
+            ctx.Process(
+                target=_work,
+                args=(i, data, config, self.budget, stop, results, ring_names),
+                daemon=True,
+            )
+            for i, config in enumerate(self.configs)
+        ]
+        for proc in procs:
+            proc.start()
+
+        result = Result.UNKNOWN
+        try:
+            pending = len(procs)
+            while pending and not self._exhausted():
+                try:
+                    idx, value, model = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    # every worker died without answering
+                    if not any(proc.is_alive() for proc in procs) and results.empty():
+                        break
+                    continue
+
+                pending -= 1
+                answer = Result(value)
+                if answer is Result.SAT and not verify(self.packed, model):
+                    logger.error("discarding invalid model from %s", self.configs[idx])
+                    continue
+                if answer is Result.UNKNOWN:
+                    continue
+
+                self.winner = self.configs[idx]
+                if answer is Result.SAT:
+                    decode = self.packed.table.decode
+                    self.assignments = AddLayers({decode(lit) for lit in model})
+                result = answer
+                break
+        finally:
+            stop.value = 1
+            for proc in procs:
+                proc.join(JOIN_TIMEOUT)
+                if proc.is_alive():
+                    proc.terminate()
+                    proc.join()
+            results.close()
+            for ring in rings:
+                ring.unlink()
+
+        return result
@@ -0,0 +1,245 @@
+"""
+Learned-clause exchange between CDCL processes.
+
+Each worker owns a ring buffer in a ``multiprocessing.shared_memory`` block
+that only it writes to and every other worker reads from, so no locks are
+needed.  A ring is an int64 write position followed by int32 slots holding
+records ``[n, lit_1, ..., lit_n]`` in the DIMACS-style numbering of the
+solver's variables.  Readers keep their own cursor per ring.  A record is
+at most a quarter of the ring, and since the writer fills a record's slots
+before publishing the new position, a reader counts as lapped as soon as a
+record in progress could reach the slots it reads.  A lapped reader skips
+ahead and loses those clauses, which is harmless: shared clauses are only
+hints.
+"""
+
+from __future__ import annotations
+from multiprocessing.shared_memory import SharedMemory
+import sys
+from typing import Sequence
+
+from satisfaction.expr import CNF, Lit, Not
+
+from .cdcl import CDCL, Config
+
+# int32 slots per ring
+RING_SIZE = 1 << 18
+
+# export learned clauses with at most this many literals ...
+EXPORT_MAX_SIZE = 8
+# ... spanning at most this many decision levels
+EXPORT_MAX_LBD = 4
+
+
+class ClauseRing:
+    __slots__ = ("shm", "pos", "data", "max_record")
+
+    shm: SharedMemory
+    pos: memoryview
+    data: memoryview
+    # slots in the longest record, count included
+    max_record: int
+
+    def __init__(self, shm: SharedMemory) -> None:
+        buf = shm.buf
+        assert buf is not None
+        self.shm = shm
+        self.pos = buf[:8].cast("q")
+        self.data = buf[8:].cast("i")
+        self.max_record = len(self.data) // 4
+
+    @classmethod
+    def create(cls, capacity: int = RING_SIZE) -> ClauseRing:
+        shm = SharedMemory(create=True, size=8 + 4 * capacity)
+        assert shm.buf is not None
+        shm.buf[:8] = bytes(8)
+        return cls(shm)
+
+    @classmethod
+    def attach(cls, name: str) -> ClauseRing:
+        """
+        Map a ring created by another process.  The creator owns the block
+        and unlinks it.  Workers share their parent's resource tracker, so
+        registering the block again before Python 3.13 is harmless.
+        """
+        if sys.version_info >= (3, 13):
+            return cls(SharedMemory(name, track=False))
+        return cls(SharedMemory(name))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def capacity(self) -> int:
+        return len(self.data)
+
+    def write(self, lits: Sequence[int]) -> None:
+        data, cap = self.data, len(self.data)
+        n = len(lits)
+        if n + 1 > self.max_record:
+            return
+
+        start = self.pos[0]
+        data[start % cap] = n
+        for i, lit in enumerate(lits, start + 1):
+            data[i % cap] = lit
+        # publish only once the record is complete
+        self.pos[0] = start + n + 1
+
+    def read(self, cursor: int) -> tuple[list[list[int]], int]:
+        """
+        Records written since ``cursor``, and the cursor to read from next.
+        """
+        data, cap = self.data, len(self.data)
+        # slots up to this far past the published position may be mid-write
+        ahead = self.max_record
+        end = self.pos[0]
+        if end + ahead - cursor > cap:
+            return [], end
+
+        clauses = []
+        at = cursor
+        while at < end:
+            n = data[at % cap]
+            if n < 0 or at + n + 1 > end:
+                # torn record
+                return [], end
+            clauses.append([data[i % cap] for i in range(at + 1, at + n + 1)])
+            at += n + 1
+
+        # the writer may have lapped us while we were reading, including
+        # with a record it has not published yet
+        end = self.pos[0]
+        if end + ahead - cursor > cap:
+            return [], end
+        return clauses, at
+
+    def close(self) -> None:
+        self.pos.release()
+        self.data.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.close()
+        self.shm.unlink()
+
+
+class ClauseExchange:
+    """
+    One worker's view of the rings: it writes to ``rings[index]`` and reads
+    from all the others.
+    """
+
+    __slots__ = ("rings", "index", "cursors")
+
+    rings: list[ClauseRing]
+    index: int
+    cursors: list[int]
+
+    def __init__(self, rings: list[ClauseRing], index: int) -> None:
+        self.rings = rings
+        self.index = index
+        self.cursors = [ring.pos[0] for ring in rings]
+
+    @classmethod
+    def attach(cls, names: list[str], index: int) -> ClauseExchange:
+        return cls([ClauseRing.attach(name) for name in names], index)
+
+    def export(self, lits: Sequence[int]) -> None:
+        self.rings[self.index].write(lits)
+
+    def collect(self) -> list[list[int]]:
+        clauses = []
+        for i, ring in enumerate(self.rings):
+            if i == self.index:
+                continue
+            new, self.cursors[i] = ring.read(self.cursors[i])
+            clauses.extend(new)
+        return clauses
+
+    def close(self) -> None:
+        for ring in self.rings:
+            ring.close()
+
+
+class SharingCDCL(CDCL):
+    """
+    CDCL that exports short, low-LBD learned clauses and imports the other
+    workers' clauses whenever the search is back at level 0: at restarts and
+    before each decision there, so workers that never restart import too.
+    All workers must number variables the same way, which they do when
+    built from the same clauses in the same order.
+    """
+
+    __slots__ = ("exchange", "max_size", "max_lbd", "exported", "imported")
+
+    exchange: ClauseExchange
+    max_size: int
+    max_lbd: int
+    exported: int
+    imported: int
+
+    def __init__(
+        self,
+        cnf: CNF,
+        config: Config | None,
+        exchange: ClauseExchange,
+        max_size: int = EXPORT_MAX_SIZE,
+        max_lbd: int = EXPORT_MAX_LBD,
+    ) -> None:
+        super().__init__(cnf, config)
+        self.exchange = exchange
+        self.max_size = max_size
+        self.max_lbd = max_lbd
+        self.exported = 0
+        self.imported = 0
+
+    def _counters(self) -> dict[str, int]:
+        return {
+            **super()._counters(),
+            "exported": self.exported,
+            "imported": self.imported,
+        }
+
+    def _analyze(self, conflict_idx: int) -> tuple[list[Lit], int]:
+        learned, btlevel = super()._analyze(conflict_idx)
+        if len(learned) <= self.max_size:
+            levels = self.levels
+            lbd = len({levels[lit.atom()] for lit in learned})
+            if lbd <= self.max_lbd:
+                self.exchange.export([self._encode(lit) for lit in learned])
+                self.exported += 1
+        return learned, btlevel
+
+    def _restart(self) -> None:
+        super()._restart()
+        self._import()
+
+    def _decide(self) -> None:
+        # propagate imported clauses before deciding
+        if self.level == 0 and self._import():
+            return
+        super()._decide()
+
+    def _import(self) -> bool:
+        variables = self.variables
+        n = len(variables)
+        imported = 0
+        for ints in self.exchange.collect():
+            if not all(0 < abs(lit) <= n for lit in ints):
+                continue
+            lits: list[Lit] = [
+                variables[lit - 1] if lit > 0 else Not(variables[-lit - 1])
+                for lit in ints
+            ]
+            clause_idx = self._add_clause(lits)
+            if len(lits) == 1 and lits[0].atom() not in self.assigns:
+                self._enqueue(lits[0], clause_idx)
+            imported += 1
+
+        if imported:
+            # check the new clauses against the level 0 assignments
+            self.prop_head = 0
+            self.imported += imported
+        return imported > 0
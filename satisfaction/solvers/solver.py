@@ -1,11 +1,304 @@
+from __future__ import annotations
 import abc
+import asyncio
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager
+import enum
+import math
+import threading
+import time
+from typing import Callable, ClassVar
 
-from satisfaction.expr import CNF
+from satisfaction.expr import CNF, Lit
+from satisfaction.layered import AddLayers
+
+from .stats import Stats, timed_phase
+
+# seconds between progress events of ``check_async``
+PROGRESS_INTERVAL = 0.1
+
+
+class Result(enum.Enum):
+    SAT = "SAT"
+    UNSAT = "UNSAT"
+    UNKNOWN = "UNKNOWN"
+
+    def __bool__(self) -> bool:
+        """
+        ``SAT`` is true and ``UNSAT`` is false.  ``UNKNOWN`` has no truth value
+        so that an exhausted budget is never mistaken for either answer.
+        """
+        if self is Result.UNKNOWN:
+            raise ValueError("an UNKNOWN result has no truth value")
+        return self is Result.SAT
+
+
+class Budget:
+    """
+    Limits on a single call to ``Solver.check``.  ``time`` is in seconds of
+    wall-clock time, the rest are counts.  ``None`` means unlimited.
+    """
+
+    __slots__ = ("time", "conflicts", "decisions", "propagations")
+
+    time: float | None
+    conflicts: int | None
+    decisions: int | None
+    propagations: int | None
+
+    def __init__(
+        self,
+        time: float | None = None,
+        conflicts: int | None = None,
+        decisions: int | None = None,
+        propagations: int | None = None,
+    ) -> None:
+        self.time = time
+        self.conflicts = conflicts
+        self.decisions = decisions
+        self.propagations = propagations
+
+
+class Progress:
+    """
+    A snapshot of a running ``check_async``.  ``elapsed`` is in seconds.
+    """
+
+    __slots__ = ("conflicts", "decisions", "propagations", "elapsed")
+
+    conflicts: int
+    decisions: int
+    propagations: int
+    elapsed: float
+
+    def __init__(
+        self, conflicts: int, decisions: int, propagations: int, elapsed: float
+    ) -> None:
+        self.conflicts = conflicts
+        self.decisions = decisions
+        self.propagations = propagations
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return (
+            f"Progress(conflicts={self.conflicts}, decisions={self.decisions}, "
+            f"propagations={self.propagations}, elapsed={self.elapsed:.3f})"
+        )
+
+
+class SearchInterrupted(Exception):
+    """
+    Raised inside a recursive search to unwind it when the budget runs out.
+    """
 
 
 class Solver(abc.ABC):
+    __slots__ = (
+        "budget",
+        "conflicts",
+        "decisions",
+        "propagations",
+        "times",
+        "_interrupt",
+        "_interrupted",
+        "_deadline",
+        "_max_conflicts",
+        "_max_decisions",
+        "_max_propagations",
+    )
+
+    # whether ``check`` picks up where an exhausted call stopped, which
+    # ``check_async`` needs to solve in time slices
+    resumable: ClassVar[bool] = False
+
+    budget: Budget
+    conflicts: int
+    decisions: int
+    propagations: int
+    # seconds by phase, see ``stats``
+    times: dict[str, float]
+    # the model of the last ``Result.SAT``; subclasses provide the slot
+    assignments: AddLayers[Lit]
+
+    _interrupt: threading.Event
+    # whether the current call to ``check`` stopped for ``interrupt``
+    _interrupted: bool
+    _deadline: float
+    _max_conflicts: float
+    _max_decisions: float
+    _max_propagations: float
+
     @abc.abstractmethod
-    def __init__(self, cnf: CNF) -> None: ...
+    def __init__(self, cnf: CNF) -> None:
+        self.budget = Budget()
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.times = {}
+        self._interrupt = threading.Event()
+        self._interrupted = False
 
     @abc.abstractmethod
-    def check(self) -> bool: ...
+    def check(self) -> Result: ...
+
+    @property
+    def stats(self) -> Stats:
+        """
+        A snapshot of the search counters and phase timings.
+        """
+        return Stats(self._counters(), dict(self.times))
+
+    def _counters(self) -> dict[str, int]:
+        return {
+            "conflicts": self.conflicts,
+            "decisions": self.decisions,
+            "propagations": self.propagations,
+        }
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        """
+        Time a ``with`` block as phase ``name``, such as ``"preprocess"``.
+        """
+        return timed_phase(self.times, name)
+
+    def set_budget(
+        self,
+        time: float | None = None,
+        conflicts: int | None = None,
+        decisions: int | None = None,
+        propagations: int | None = None,
+    ) -> None:
+        """
+        Limit each following call to ``check``.  Once a limit is reached the
+        call returns ``Result.UNKNOWN``.
+        """
+        self.budget = Budget(time, conflicts, decisions, propagations)
+
+    def interrupt(self) -> None:
+        """
+        Make the running (or next) call to ``check`` return
+        ``Result.UNKNOWN`` as soon as possible.  Safe to call from any thread.
+        """
+        self._interrupt.set()
+
+    def _start_budget(self) -> None:
+        budget = self.budget
+        self._interrupted = False
+
+        def limit(used: float, allowed: float | None) -> float:
+            return math.inf if allowed is None else used + allowed
+
+        self._deadline = limit(time.monotonic(), budget.time)
+        self._max_conflicts = limit(self.conflicts, budget.conflicts)
+        self._max_decisions = limit(self.decisions, budget.decisions)
+        self._max_propagations = limit(self.propagations, budget.propagations)
+
+    def _exhausted(self) -> bool:
+        """
+        Whether the search must stop.  Called once per decision and conflict,
+        so propagations may overshoot their limit by one round of propagation.
+        """
+        if self._interrupt.is_set():
+            self._interrupt.clear()
+            self._interrupted = True
+            return True
+        if (
+            self.conflicts >= self._max_conflicts
+            or self.decisions >= self._max_decisions
+            or self.propagations >= self._max_propagations
+            or time.monotonic() >= self._deadline
+        ):
+            return True
+        return False
+
+    async def check_async(
+        self,
+        *,
+        time_slice: float | None = None,
+        executor: Executor | None = None,
+        progress: Callable[[Progress], object] | None = None,
+        interval: float = PROGRESS_INTERVAL,
+    ) -> Result:
+        """
+        ``check`` without blocking the event loop.
+
+        By default the search runs in ``executor`` (the loop's default thread
+        pool if ``None``), and ``progress`` is called on the loop every
+        ``interval`` seconds.  With ``time_slice`` a resumable solver instead
+        runs on the loop itself, yielding to other tasks after every slice of
+        that many seconds and reporting progress after each one.
+
+        Cancelling the task stops the search; it raises ``CancelledError``
+        once the solver is back in a consistent state.  The budget applies to
+        the whole call.
+        """
+        if time_slice is None:
+            return await self._check_in_executor(executor, progress, interval)
+        if not self.resumable:
+            raise ValueError(f"{type(self).__name__} cannot solve in time slices")
+        if time_slice <= 0:
+            raise ValueError("time_slice must be positive")
+        return await self._check_in_slices(time_slice, progress)
+
+    def _progress(self, start: float) -> Progress:
+        return Progress(
+            self.conflicts,
+            self.decisions,
+            self.propagations,
+            time.monotonic() - start,
+        )
+
+    async def _check_in_executor(
+        self,
+        executor: Executor | None,
+        progress: Callable[[Progress], object] | None,
+        interval: float,
+    ) -> Result:
+        start = time.monotonic()
+        future = asyncio.get_running_loop().run_in_executor(executor, self.check)
+        try:
+            while True:
+                done, _ = await asyncio.wait({future}, timeout=interval)
+                if done:
+                    return future.result()
+                if progress is not None:
+                    progress(self._progress(start))
+        except asyncio.CancelledError:
+            self.interrupt()
+            await asyncio.wait({future})
+            # the search may have finished before it saw the interrupt
+            self._interrupt.clear()
+            raise
+
+    async def _check_in_slices(
+        self, time_slice: float, progress: Callable[[Progress], object] | None
+    ) -> Result:
+        budget = self.budget
+        start = time.monotonic()
+        used = (self.conflicts, self.decisions, self.propagations)
+
+        def remaining(allowed: int | None, now: int, before: int) -> int | None:
+            return None if allowed is None else allowed - (now - before)
+
+        try:
+            while True:
+                left = [
+                    remaining(budget.conflicts, self.conflicts, used[0]),
+                    remaining(budget.decisions, self.decisions, used[1]),
+                    remaining(budget.propagations, self.propagations, used[2]),
+                ]
+                limit = time_slice
+                if budget.time is not None:
+                    limit = min(limit, budget.time - (time.monotonic() - start))
+                if limit <= 0 or any(n is not None and n <= 0 for n in left):
+                    return Result.UNKNOWN
+
+                self.budget = Budget(limit, *left)
+                result = self.check()
+                if progress is not None:
+                    progress(self._progress(start))
+                if result is not Result.UNKNOWN or self._interrupted:
+                    return result
+                await asyncio.sleep(0)
+        finally:
+            self.budget = budget
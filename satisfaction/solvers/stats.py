@@ -0,0 +1,123 @@
+"""
+Search statistics.
+
+Solvers keep their counters as plain integer attributes, which is as cheap
+as counting gets in the hot loops, and only gather them into a ``Stats``
+snapshot when asked.  Phase timings (``parse``, ``encode``, ``preprocess``,
+``search``) accumulate in a dict of seconds: solvers time their own searches,
+and callers time the other phases with ``timed_phase`` or ``Solver.phase``.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+import functools
+import json
+import time
+from typing import Any, Callable, Concatenate, Iterator, Protocol
+
+PHASES = ("parse", "encode", "preprocess", "search")
+
+# counters that can go down, exported to Prometheus as gauges
+GAUGES = frozenset({"max_level"})
+
+
+class Stats:
+    __slots__ = ("counters", "times")
+
+    counters: dict[str, int]
+    times: dict[str, float]
+
+    def __init__(self, counters: dict[str, int], times: dict[str, float]) -> None:
+        self.counters = counters
+        self.times = times
+
+    def __getitem__(self, name: str) -> int:
+        return self.counters[name]
+
+    def __repr__(self) -> str:
+        return f"Stats({self.counters}, {self.times})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**self.counters, "times": dict(self.times)}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def to_prometheus(
+        self, prefix: str = "satisfaction", labels: dict[str, str] | None = None
+    ) -> str:
+        """
+        The Prometheus text exposition format.  Counters are ``<prefix>_<name>
+        _total``, gauges ``<prefix>_<name>`` and phase timings
+        ``<prefix>_phase_seconds{phase="..."}``.
+        """
+
+        def label_str(extra: dict[str, str]) -> str:
+            pairs = {**(labels or {}), **extra}
+            if not pairs:
+                return ""
+            body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items())
+            return "{" + body + "}"
+
+        lines = []
+        for name, value in self.counters.items():
+            if name in GAUGES:
+                metric, kind = f"{prefix}_{name}", "gauge"
+            else:
+                metric, kind = f"{prefix}_{name}_total", "counter"
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{label_str({})} {value}")
+
+        if self.times:
+            metric = f"{prefix}_phase_seconds"
+            lines.append(f"# TYPE {metric} gauge")
+            for phase, seconds in self.times.items():
+                lines.append(f"{metric}{label_str({'phase': phase})} {seconds}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@contextmanager
+def timed_phase(times: dict[str, float], phase: str) -> Iterator[None]:
+    """
+    Add the time spent in the ``with`` block to ``times[phase]``.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        times[phase] = times.get(phase, 0.0) + time.perf_counter() - start
+
+
+class _Timed(Protocol):
+    times: dict[str, float]
+
+
+class _TimedDecorator(Protocol):
+    def __call__[S: _Timed, **P, R](
+        self, method: Callable[Concatenate[S, P], R], /
+    ) -> Callable[Concatenate[S, P], R]: ...
+
+
+def timed(phase: str) -> _TimedDecorator:
+    """
+    Decorate a method to add the time spent in each call to
+    ``self.times[phase]``.
+    """
+
+    # the type parameters belong to ``decorate`` so that ``wrapper`` shares
+    # them, and each decorated method keeps its own signature
+    def decorate[S: _Timed, **P, R](
+        method: Callable[Concatenate[S, P], R],
+    ) -> Callable[Concatenate[S, P], R]:
+        @functools.wraps(method)
+        def wrapper(self: S, /, *args: P.args, **kwargs: P.kwargs) -> R:
+            with timed_phase(self.times, phase):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
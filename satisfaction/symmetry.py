@@ -0,0 +1,304 @@
+"""
+Static symmetry breaking.
+
+A CNF is turned into a colored graph with one vertex per literal and one per
+clause.  Each literal is joined to its complement and to the clauses it
+occurs in; literal vertices and clause vertices get different colors.  Every
+automorphism of that graph permutes literals (consistently with negation)
+and maps the clause set onto itself, so it is a syntactic symmetry of the
+formula.
+
+Generators of the automorphism group are found with color refinement plus
+individualization, in the style of nauty and saucy but kept deliberately
+simple, and each generator is broken with a lex-leader predicate (Aloul,
+Markov & Sakallah 2003) over a bounded number of variables.
+"""
+
+from __future__ import annotations
+import itertools
+from typing import Iterator, Sequence
+
+from satisfaction.expr import And, CNF, Clause, Lit, Or, Var
+from satisfaction.packed import VarTable
+from satisfaction.utils import numbered_var
+
+type Perm = list[int]
+type Coloring = list[int]
+
+
+class SearchBudgetExceeded(Exception):
+    pass
+
+
+class Graph:
+    __slots__ = ("adj", "edges", "colors", "num_vars")
+
+    adj: list[list[int]]
+    edges: set[tuple[int, int]]
+    colors: Coloring
+    num_vars: int
+
+    def __init__(self, clauses: Sequence[Sequence[int]], num_vars: int) -> None:
+        """
+        The graph of ``clauses`` over DIMACS-style variables ``1..num_vars``.
+        """
+        size = 2 * num_vars + len(clauses)
+
+        # literal +v is vertex 2(v - 1), literal -v is vertex 2(v - 1) + 1
+        self.num_vars = num_vars
+        self.adj = [[] for _ in range(size)]
+        self.edges = set()
+        self.colors = [0] * (2 * num_vars) + [1] * len(clauses)
+
+        for v in range(num_vars):
+            self._connect(2 * v, 2 * v + 1)
+        for i, clause in enumerate(clauses):
+            node = 2 * num_vars + i
+            for lit in set(clause):
+                self._connect(node, self.lit_vertex(lit))
+
+    @staticmethod
+    def lit_vertex(lit: int) -> int:
+        return 2 * (abs(lit) - 1) + (lit < 0)
+
+    @staticmethod
+    def vertex_lit(vertex: int) -> int:
+        v = vertex // 2 + 1
+        return -v if vertex & 1 else v
+
+    def _connect(self, u: int, v: int) -> None:
+        self.adj[u].append(v)
+        self.adj[v].append(u)
+        self.edges.add((min(u, v), max(u, v)))
+
+    def refine(self, colors: Coloring, max_rounds: int | None = None) -> Coloring:
+        """
+        Coarsest equitable refinement of ``colors``, or a coarser one after
+        ``max_rounds`` rounds.  Colors are renumbered by sorting vertex
+        signatures so that the result does not depend on vertex numbering,
+        which keeps colorings of isomorphic search branches comparable.
+        """
+        adj = self.adj
+        num_colors = len(set(colors))
+        rounds = itertools.count(1)
+        while True:
+            sigs = [
+                (colors[v], tuple(sorted(colors[u] for u in adj[v])))
+                for v in range(len(adj))
+            ]
+            ranking = {sig: i for i, sig in enumerate(sorted(set(sigs)))}
+            colors = [ranking[sig] for sig in sigs]
+            if len(ranking) == num_colors or next(rounds) == max_rounds:
+                return colors
+            num_colors = len(ranking)
+
+    def individualize(self, colors: Coloring, vertex: int) -> Coloring:
+        split = [2 * c for c in colors]
+        split[vertex] += 1
+        return self.refine(split)
+
+    def is_automorphism(self, perm: Perm) -> bool:
+        colors = self.colors
+        for u, v in enumerate(perm):
+            if colors[u] != colors[v]:
+                return False
+        for u, v in self.edges:
+            pu, pv = perm[u], perm[v]
+            if (min(pu, pv), max(pu, pv)) not in self.edges:
+                return False
+        return True
+
+
+def _target(colors: Coloring) -> int | None:
+    """
+    The smallest color shared by more than one vertex.
+    """
+    counts = [0] * len(colors)
+    for c in colors:
+        counts[c] += 1
+    for c, count in enumerate(counts):
+        if count > 1:
+            return c
+    return None
+
+
+def _histogram(colors: Coloring) -> list[int]:
+    counts = [0] * len(colors)
+    for c in colors:
+        counts[c] += 1
+    return counts
+
+
+class _Orbits:
+    __slots__ = ("parent",)
+
+    parent: list[int]
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, u: int) -> int:
+        parent = self.parent
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    def add(self, perm: Perm) -> None:
+        for u, v in enumerate(perm):
+            ru, rv = self.find(u), self.find(v)
+            if ru != rv:
+                self.parent[max(ru, rv)] = min(ru, rv)
+
+
+def automorphisms(graph: Graph, max_nodes: int = 10_000) -> list[Perm]:
+    """
+    Generators of (a subgroup of) the automorphism group of ``graph``.
+
+    The leftmost path of the search tree always individualizes the first
+    vertex of the first non-singleton cell.  At each level, deepest first,
+    the other vertices of that cell are tried in its place and the subtree
+    is searched for a leaf matching the leftmost leaf.  Vertices already in
+    the orbit of the leftmost choice are skipped.  The search gives up after
+    ``max_nodes`` refinements and returns what it has found so far.
+    """
+    nodes = 0
+
+    def refine_node(colors: Coloring, vertex: int) -> Coloring:
+        nonlocal nodes
+        nodes += 1
+        if nodes > max_nodes:
+            raise SearchBudgetExceeded
+        return graph.individualize(colors, vertex)
+
+    # leftmost path
+    path = [graph.refine(graph.colors)]
+    targets: list[int] = []
+    chosen: list[int] = []
+    while (target := _target(path[-1])) is not None:
+        vertex = path[-1].index(target)
+        targets.append(target)
+        chosen.append(vertex)
+        path.append(graph.individualize(path[-1], vertex))
+
+    leaf = path[-1]
+    histograms = [_histogram(colors) for colors in path]
+
+    def descend(level: int, colors: Coloring) -> Perm | None:
+        if _histogram(colors) != histograms[level]:
+            return None
+
+        if level == len(targets):
+            # discrete: map each vertex to the one with its leftmost color
+            by_color = [0] * len(colors)
+            for u, c in enumerate(colors):
+                by_color[c] = u
+            perm = [by_color[c] for c in leaf]
+            return perm if graph.is_automorphism(perm) else None
+
+        target = targets[level]
+        for u, c in enumerate(colors):
+            if c == target:
+                perm = descend(level + 1, refine_node(colors, u))
+                if perm is not None:
+                    return perm
+        return None
+
+    generators: list[Perm] = []
+    orbits = _Orbits(len(leaf))
+    try:
+        for level in range(len(targets) - 1, -1, -1):
+            colors, target, first = path[level], targets[level], chosen[level]
+            for u, c in enumerate(colors):
+                if c != target or orbits.find(u) == orbits.find(first):
+                    continue
+                perm = descend(level + 1, refine_node(colors, u))
+                if perm is not None:
+                    generators.append(perm)
+                    orbits.add(perm)
+    except SearchBudgetExceeded:
+        pass
+
+    return generators
+
+
+def find_symmetries(cnf: CNF, max_nodes: int = 10_000) -> list[dict[Var, Lit]]:
+    """
+    Symmetry generators of ``cnf`` as maps from each moved variable to the
+    literal it is mapped to.
+    """
+    table = VarTable()
+    graph = Graph([table.encode_clause(clause) for clause in cnf.args], len(table))
+
+    result = []
+    for perm in automorphisms(graph, max_nodes):
+        mapping: dict[Var, Lit] = {}
+        for v in range(graph.num_vars):
+            image = graph.vertex_lit(perm[2 * v])
+            if image != v + 1:
+                mapping[table.vars[v]] = table.decode(image)
+        if mapping:
+            result.append(mapping)
+
+    return result
+
+
+def lex_leader(
+    symmetry: dict[Var, Lit],
+    order: Sequence[Var],
+    name_gen: Iterator[str],
+    max_size: int | None = None,
+) -> list[Clause]:
+    """
+    Clauses allowing only assignments that are lexicographically no greater
+    than their image under ``symmetry``, comparing variables in ``order``
+    with false < true.  Only the first ``max_size`` moved variables are
+    compared, which gives a weaker but still sound predicate.
+
+    ``e[i]`` is forced true while the assignment and its image agree on the
+    first ``i + 1`` compared variables; each position contributes at most
+    three clauses.
+    """
+    moved = [var for var in order if var in symmetry]
+    if max_size is not None:
+        moved = moved[:max_size]
+
+    clauses: list[Clause] = []
+    prev: list[Lit] = []
+    for i, x in enumerate(moved):
+        y = symmetry[x]
+        # x <= y unless an earlier position already differs
+        clauses.append(Or(*prev, ~x, y))
+        # if y is ~x the assignment and its image can never agree on x, so
+        # later positions are unconstrained
+        if y == ~x or i == len(moved) - 1:
+            break
+
+        e = Var(next(name_gen), generated=True)
+        clauses.append(Or(*prev, ~x, e))
+        clauses.append(Or(*prev, y, e))
+        prev = [~e]
+
+    return clauses
+
+
+def break_symmetries(
+    cnf: CNF,
+    max_size: int | None = 50,
+    max_nodes: int = 10_000,
+    name_gen: Iterator[str] | None = None,
+) -> CNF:
+    """
+    ``cnf`` extended with a lex-leader predicate for each symmetry generator
+    found.  The result is satisfiable iff ``cnf`` is.
+    """
+    if name_gen is None:
+        name_gen = numbered_var("s", 0)
+
+    order = VarTable(lit.atom() for clause in cnf.args for lit in clause.args).vars
+
+    clauses = list(cnf.args)
+    for symmetry in find_symmetries(cnf, max_nodes):
+        clauses.extend(lex_leader(symmetry, order, name_gen, max_size))
+
+    return And(*clauses)
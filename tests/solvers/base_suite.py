@@ -1,8 +1,10 @@
+import asyncio
+
 import pytest
 
 from satisfaction.examples.queens import Queens
 from satisfaction.expr import And, Or, var
-from satisfaction.solvers.solver import Solver
+from satisfaction.solvers.solver import Result, Solver
 from satisfaction.tseitin import Tseitin
 from satisfaction.utils import numbered_var
 
@@ -48,4 +50,43 @@ class BaseSuite:
         )
         queens_cnf = tseitin.transform(sort=True)
 
-        assert self.solver_cls(queens_cnf).check() is queens_sat
+        assert bool(self.solver_cls(queens_cnf).check()) is queens_sat
+
+    def test_result(self) -> None:
+        assert self.solver_cls(And(Or(x))).check() is Result.SAT
+        assert self.solver_cls(And(Or(x), Or(~x))).check() is Result.UNSAT
+
+    def test_interrupt(self) -> None:
+        cnf = And(Or(x, y), Or(x, ~y), Or(~x, y))
+        solver = self.solver_cls(cnf)
+        solver.interrupt()
+        assert solver.check() is Result.UNKNOWN
+        # the interrupt is consumed and the search can be run again
+        assert solver.check() is Result.SAT
+
+    def test_decision_budget(self) -> None:
+        cnf = And(Or(x, y), Or(~x, ~y))
+        solver = self.solver_cls(cnf)
+        solver.set_budget(decisions=0)
+        assert solver.check() is Result.UNKNOWN
+        assert solver.decisions == 0
+
+        solver.set_budget()
+        assert solver.check() is Result.SAT
+
+    def test_time_budget(self) -> None:
+        queens_cnf = Queens(8).get_cnf(amo="pairwise")
+        solver = self.solver_cls(queens_cnf)
+        solver.set_budget(time=0)
+        assert solver.check() is Result.UNKNOWN
+
+    def test_check_async(self) -> None:
+        cnf = And(Or(x, y), Or(x, ~y), Or(~x, y))
+        assert asyncio.run(self.solver_cls(cnf).check_async()) is Result.SAT
+
+    def test_stats(self) -> None:
+        solver = self.solver_cls(And(Or(x, y), Or(~x, y)))
+        assert solver.check() is Result.SAT
+        stats = solver.stats
+        assert stats.times["search"] > 0
+        assert stats["decisions"] == solver.decisions
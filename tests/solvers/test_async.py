@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import And, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import CDCL, Config
+from satisfaction.solvers.dpll import DPLL
+from satisfaction.solvers.solver import Progress, Result
+
+x, y = var("x y")
+
+
+class TestCheckAsync:
+    def test_executor_progress(self) -> None:
+        events: list[Progress] = []
+        solver = CDCL(Pigeonhole(5).to_cnf())
+        result = asyncio.run(solver.check_async(progress=events.append, interval=0.01))
+        assert result is Result.UNSAT
+        assert events
+        assert all(a.elapsed <= b.elapsed for a, b in zip(events, events[1:]))
+
+    def test_slices(self) -> None:
+        events: list[Progress] = []
+        solver = CDCL(Pigeonhole(5).to_cnf())
+
+        async def main() -> Result:
+            return await solver.check_async(time_slice=0.005, progress=events.append)
+
+        assert asyncio.run(main()) is Result.UNSAT
+        assert len(events) > 1
+        assert events[-1].conflicts == solver.conflicts
+        # the caller's budget is left as it was
+        assert solver.budget.time is None
+
+    def test_slices_share_the_loop(self) -> None:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def main() -> list[Result]:
+            task = asyncio.create_task(ticker())
+            results = await asyncio.gather(
+                CDCL(Pigeonhole(5).to_cnf()).check_async(time_slice=0.01),
+                CDCL(Queens(8).get_cnf(amo="pairwise")).check_async(time_slice=0.01),
+            )
+            task.cancel()
+            return results
+
+        assert asyncio.run(main()) == [Result.UNSAT, Result.SAT]
+        assert ticks > 10
+
+    def test_slice_budget(self) -> None:
+        solver = CDCL(Pigeonhole(6).to_cnf())
+        solver.set_budget(conflicts=50)
+        result = asyncio.run(solver.check_async(time_slice=0.001))
+        assert result is Result.UNKNOWN
+        assert solver.conflicts == 50
+
+        solver.set_budget(time=0.05)
+        start = time.monotonic()
+        assert asyncio.run(solver.check_async(time_slice=0.01)) is Result.UNKNOWN
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.parametrize("time_slice", [None, 0.01])
+    def test_cancel(self, time_slice: float | None) -> None:
+        solver = CDCL(Pigeonhole(8).to_cnf(), Config("vsids", "luby", "saved"))
+
+        async def main() -> None:
+            task = asyncio.create_task(solver.check_async(time_slice=time_slice))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        start = time.monotonic()
+        asyncio.run(main())
+        assert time.monotonic() - start < 5
+        # the solver is still usable
+        solver.set_budget(conflicts=1)
+        assert solver.check() is Result.UNKNOWN
+
+    @pytest.mark.parametrize("time_slice", [None, 0.01])
+    def test_interrupt(self, time_slice: float | None) -> None:
+        solver = CDCL(Pigeonhole(9).to_cnf())
+
+        async def main() -> Result:
+            asyncio.get_running_loop().call_later(0.1, solver.interrupt)
+            return await solver.check_async(time_slice=time_slice)
+
+        start = time.monotonic()
+        assert asyncio.run(main()) is Result.UNKNOWN
+        assert time.monotonic() - start < 1
+
+        # the interrupt is used up
+        conflicts = solver.conflicts
+        solver.set_budget(conflicts=10)
+        assert solver.check() is Result.UNKNOWN
+        assert solver.conflicts == conflicts + 10
+
+    def test_not_resumable(self) -> None:
+        solver = DPLL(And(Or(x)))
+        with pytest.raises(ValueError):
+            asyncio.run(solver.check_async(time_slice=0.1))
+        with pytest.raises(ValueError):
+            asyncio.run(CDCL(And(Or(x))).check_async(time_slice=0))
@@ -0,0 +1,81 @@
+import multiprocessing as mp
+import time
+
+import pytest
+
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import And, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.packed import PackedCNF
+from satisfaction.solvers.batch import SOLVERS, solve_many
+from satisfaction.solvers.solver import Budget, Result
+
+x, y = var("x y")
+
+
+def formulas(n: int) -> list[And]:
+    cnfs = []
+    for i in range(n):
+        if i % 3 == 0:
+            cnfs.append(Pigeonhole(3).to_cnf())
+        else:
+            cnfs.append(And(Or(x, y), Or(~x if i % 2 else x)))
+    return cnfs
+
+
+class TestSolveMany:
+    @pytest.mark.parametrize("solver", sorted(SOLVERS))
+    def test_ordered(self, solver: str) -> None:
+        cnfs = formulas(10)
+        results = list(solve_many(cnfs, solver=solver, workers=2))
+        assert [r.index for r in results] == list(range(10))
+        for r, cnf in zip(results, cnfs):
+            assert r.result is (Result.UNSAT if r.index % 3 == 0 else Result.SAT)
+            if r.result is Result.SAT:
+                assert r.model is not None
+                assert all(any(lit in r.model for lit in c.args) for c in cnf.args)
+            else:
+                assert r.model is None
+
+    def test_unordered(self) -> None:
+        cnfs = [Pigeonhole(5).to_cnf(), *formulas(5)]
+        results = list(solve_many(cnfs, workers=2, ordered=False))
+        assert sorted(r.index for r in results) == list(range(6))
+        # the hard formula finishes last
+        assert results[-1].index == 0
+
+    def test_chunks_and_stream(self) -> None:
+        cnfs = (cnf for cnf in formulas(25))
+        results = list(solve_many(cnfs, workers=2, chunksize=4))
+        assert [r.index for r in results] == list(range(25))
+
+    def test_packed_input(self) -> None:
+        cnf = Queens(6).get_cnf(amo="pairwise")
+        [result] = solve_many([PackedCNF.from_cnf(cnf)], workers=1)
+        assert result.result is Result.SAT
+        assert result.time > 0
+
+    def test_budget(self) -> None:
+        cnfs = [Pigeonhole(8).to_cnf(), And(Or(x))]
+        results = list(solve_many(cnfs, workers=2, budget=Budget(conflicts=10)))
+        assert [r.result for r in results] == [Result.UNKNOWN, Result.SAT]
+
+    def test_early_close(self) -> None:
+        cnfs = [And(Or(x))] + [Pigeonhole(9).to_cnf()] * 4
+        stream = solve_many(cnfs, workers=2, ordered=False)
+        start = time.monotonic()
+        assert next(stream).index == 0
+        stream.close()
+        assert time.monotonic() - start < 10
+        assert mp.active_children() == []
+
+    def test_empty(self) -> None:
+        assert list(solve_many([], workers=1)) == []
+        [result] = solve_many([And()], workers=1)
+        assert result.result is Result.SAT
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            solve_many([], solver="nope")
+        with pytest.raises(ValueError):
+            solve_many([], chunksize=0)
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import And, CNF, Or, Var, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.packed import PackedCNF
+from satisfaction.solvers.cache import CachedSolver, Canonical, ResultCache
+from satisfaction.solvers.dpll import DPLL
+from satisfaction.solvers.solver import Result
+
+from .base_suite import BaseSuite
+
+x, y, z = var("x y z")
+a, b, c = var("a b c")
+
+
+def rename(cnf: CNF, names: dict[str, str]) -> CNF:
+    def rename_lit(lit):
+        v = lit.atom()
+        new = Var(names.get(v.name, v.name), generated=v.generated)
+        return new if lit == v else ~new
+
+    return And(*(Or(*map(rename_lit, clause.args)) for clause in cnf.args))
+
+
+def canonical(cnf: CNF) -> Canonical:
+    return Canonical(PackedCNF.from_cnf(cnf))
+
+
+class Cached(CachedSolver):
+    __slots__ = ()
+
+    def __init__(self, cnf) -> None:
+        super().__init__(cnf, ResultCache())
+
+
+class TestCachedSolver(BaseSuite):
+    solver_cls = Cached
+    queens = (8, True)
+
+    def test_hit(self) -> None:
+        cache = ResultCache()
+        cnf = Queens(6).get_cnf(amo="pairwise")
+        first = CachedSolver(cnf, cache)
+        assert first.check() is Result.SAT
+        assert not first.hit
+
+        second = CachedSolver(cnf, cache)
+        assert second.check() is Result.SAT
+        assert second.hit
+        assert second.assignments.els == first.assignments.els
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_renamed_hit(self) -> None:
+        cache = ResultCache()
+        cnf = And(Or(x, ~y), Or(y, z), Or(~x, ~z), Or(z))
+        assert CachedSolver(cnf, cache).check() is Result.SAT
+
+        renamed = rename(cnf, {"x": "a", "y": "b", "z": "c"})
+        # clause and literal order do not matter either
+        shuffled = And(*reversed([Or(*reversed(cl.args)) for cl in renamed.args]))
+        solver = CachedSolver(shuffled, cache)
+        assert solver.check() is Result.SAT
+        assert solver.hit
+        true = solver.assignments.els
+        assert all(any(lit in true for lit in cl.args) for cl in shuffled.args)
+
+    def test_unsat_hit(self) -> None:
+        cache = ResultCache()
+        assert CachedSolver(Pigeonhole(3).to_cnf(), cache).check() is Result.UNSAT
+        solver = CachedSolver(Pigeonhole(3).to_cnf(), cache, DPLL)
+        assert solver.check() is Result.UNSAT
+        assert solver.hit
+        assert solver.solver is None
+
+    def test_unknown_is_not_cached(self) -> None:
+        cache = ResultCache()
+        solver = CachedSolver(Pigeonhole(5).to_cnf(), cache)
+        solver.set_budget(conflicts=1)
+        assert solver.check() is Result.UNKNOWN
+        assert cache.get(solver.canonical.key) is None
+
+    def test_bad_model_is_discarded(self) -> None:
+        cache = ResultCache()
+        cnf = And(Or(x, y), Or(~x))
+        solver = CachedSolver(cnf, cache)
+        key = solver.canonical.key
+        cache.put(key, Result.SAT, solver.canonical.to_canonical([1, 2]))
+        assert solver.check() is Result.SAT
+        assert not solver.hit
+        assert solver.assignments.els == {~x, y}
+
+
+class TestCanonical:
+    def test_same_formula(self) -> None:
+        cnf = Queens(5).get_cnf(amo="pairwise")
+        assert canonical(cnf).key == canonical(cnf).key
+
+    def test_renamed(self) -> None:
+        cnf = And(Or(x, y), Or(~x, z), Or(~y, ~z, x))
+        renamed = rename(cnf, {"x": "c", "y": "a", "z": "b"})
+        assert canonical(cnf).key == canonical(renamed).key
+
+    def test_duplicates(self) -> None:
+        cnf = And(Or(x, y), Or(~x))
+        assert canonical(cnf).key == canonical(And(Or(y, x, x), Or(~x), Or(~x))).key
+
+    def test_different(self) -> None:
+        assert canonical(And(Or(x, y))).key != canonical(And(Or(x, ~y))).key
+        assert canonical(And(Or(x), Or(y))).key != canonical(And(Or(x, y))).key
+
+    def test_models(self) -> None:
+        cnf = And(Or(x, y), Or(~x, z))
+        form = canonical(cnf)
+        packed = PackedCNF.from_cnf(cnf)
+        model = [packed.table.encode(lit) for lit in (x, ~y, z)]
+        assert form.from_canonical(form.to_canonical(model)) == model
+
+
+class TestResultCache:
+    def test_lru(self) -> None:
+        cache = ResultCache(max_entries=2)
+        for key in "abc":
+            cache.put(
+                key, Result.UNSAT, Canonical(PackedCNF.from_cnf(And())).to_canonical([])
+            )
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+    def test_persistent(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.db"
+        cnf = Queens(6).get_cnf(amo="pairwise")
+        with ResultCache(path) as cache:
+            assert CachedSolver(cnf, cache).check() is Result.SAT
+        with ResultCache(path) as cache:
+            solver = CachedSolver(cnf, cache)
+            assert solver.check() is Result.SAT
+            assert solver.hit
+
+    def test_size_eviction(self, tmp_path: Path) -> None:
+        with ResultCache(tmp_path / "cache.db", max_entries=1, max_bytes=300) as cache:
+            model = canonical(And(Or(x))).to_canonical([1])
+            for i in range(10):
+                cache.put(f"{i:064x}", Result.SAT, model)
+            assert 0 < cache.stored_bytes() <= 300
+            # the oldest entries went first
+            assert cache.get(f"{0:064x}") is None
+            assert cache.get(f"{9:064x}") is not None
+
+    def test_unknown(self) -> None:
+        with pytest.raises(ValueError):
+            ResultCache().put("k", Result.UNKNOWN, canonical(And()).to_canonical([]))
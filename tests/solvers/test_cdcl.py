@@ -1,5 +1,12 @@
-from satisfaction.expr import And, Or, var
-from satisfaction.solvers.cdcl import CDCL
+import threading
+
+import pytest
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, CNF, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import CDCL, Config, luby
+from satisfaction.solvers.solver import Result
 
 from .base_suite import BaseSuite
 
@@ -30,3 +37,171 @@ class TestCDCL(BaseSuite):
             Or(~x, ~y),
         )
         assert not CDCL(cnf).check()
+
+
+class VSIDS(CDCL):
+    __slots__ = ()
+
+    def __init__(self, cnf: CNF) -> None:
+        super().__init__(cnf, Config("vsids", "luby", "saved", restart_base=4))
+
+
+class TestVSIDS(BaseSuite):
+    solver_cls = VSIDS
+    queens = (8, True)
+
+
+class TestConfig:
+    def test_luby(self) -> None:
+        assert [luby(i) for i in range(1, 16)] == [
+            1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8
+        ]  # fmt: skip
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"heuristic": "dlis"}, {"restarts": "always"}, {"phase": "maybe"}],
+    )
+    def test_invalid(self, kwargs: dict[str, str]) -> None:
+        with pytest.raises(ValueError):
+            Config(**kwargs)
+
+    @pytest.mark.parametrize("restarts", ["luby", "geometric"])
+    @pytest.mark.parametrize("phase", ["true", "false", "saved", "random"])
+    def test_policies(self, restarts: str, phase: str) -> None:
+        config = Config("vsids", restarts, phase, seed=7, restart_base=2)
+        solver = CDCL(Pigeonhole(5).to_cnf(), config)
+        assert solver.check() is Result.UNSAT
+        assert solver.restarts > 0
+
+    def test_seeds_diversify(self) -> None:
+        conflicts = set()
+        for seed in range(4):
+            solver = CDCL(Pigeonhole(5).to_cnf(), Config("vsids", seed=seed))
+            assert solver.check() is Result.UNSAT
+            conflicts.add(solver.conflicts)
+        assert len(conflicts) > 1
+
+
+class TestBudget:
+    def test_unknown_has_no_truth_value(self) -> None:
+        with pytest.raises(ValueError):
+            bool(Result.UNKNOWN)
+
+    def test_conflict_budget_resumes(self) -> None:
+        full = CDCL(Pigeonhole(4).to_cnf())
+        assert full.check() is Result.UNSAT
+
+        solver = CDCL(Pigeonhole(4).to_cnf())
+        solver.set_budget(conflicts=5)
+
+        slices = 0
+        while (result := solver.check()) is Result.UNKNOWN:
+            slices += 1
+        assert result is Result.UNSAT
+        assert slices > 1
+        # no work is lost between slices
+        assert solver.conflicts == full.conflicts
+        assert solver.decisions == full.decisions
+
+    def test_propagation_budget(self) -> None:
+        solver = CDCL(Pigeonhole(5).to_cnf())
+        solver.set_budget(propagations=10)
+        assert solver.check() is Result.UNKNOWN
+        assert solver.propagations >= 10
+
+    def test_interrupt_from_thread(self) -> None:
+        solver = CDCL(Pigeonhole(9).to_cnf())
+        timer = threading.Timer(0.05, solver.interrupt)
+        timer.start()
+        try:
+            assert solver.check() is Result.UNKNOWN
+        finally:
+            timer.cancel()
+
+
+class TestCheckpoint:
+    def suspended(self) -> CDCL:
+        solver = CDCL(Pigeonhole(5).to_cnf())
+        solver.set_budget(conflicts=20)
+        assert solver.check() is Result.UNKNOWN
+        return solver
+
+    def test_round_trip(self) -> None:
+        solver = self.suspended()
+        assert solver.level > 0
+        restored = CDCL.from_bytes(solver.to_bytes())
+
+        assert restored.variables == solver.variables
+        assert restored.clauses == solver.clauses
+        assert restored.trail == solver.trail
+        assert restored.trail_lim == solver.trail_lim
+        assert restored.levels == solver.levels
+        assert restored.reasons == solver.reasons
+        assert restored.prop_head == solver.prop_head
+        assert restored.stats.counters == solver.stats.counters
+        assert dict(restored.by_lit) == dict(solver.by_lit)
+
+    def test_satisfied_assumption(self) -> None:
+        (z,) = var("z")
+        solver = CDCL(And(Or(z), Or(x, y), Or(~x, ~y)))
+        solver.set_budget(decisions=0)
+        assert solver.check([z]) is Result.UNKNOWN
+        assert (solver.level, solver.trail_lim) == (1, [1])
+
+        restored = CDCL.from_bytes(solver.to_bytes())
+        assert restored.level == solver.level
+        assert restored.trail_lim == solver.trail_lim
+        assert restored.levels == solver.levels
+        assert restored.assumptions == solver.assumptions
+
+        solver.set_budget()
+        restored.set_budget()
+        assert solver.check([z]) is restored.check([z]) is Result.SAT
+        assert restored.trail == solver.trail
+        assert restored.decisions == solver.decisions
+
+    def test_resume_after_restore(self, tmp_path) -> None:
+        full = CDCL(Pigeonhole(5).to_cnf())
+        assert full.check() is Result.UNSAT
+
+        path = tmp_path / "state.bin"
+        self.suspended().save(path)
+        restored = CDCL.load(path)
+        assert restored.check() is Result.UNSAT
+        assert restored.conflicts == full.conflicts
+        assert restored.decisions == full.decisions
+
+    def test_resume_heuristic_state(self) -> None:
+        config = Config("vsids", "luby", "random", seed=5, restart_base=3)
+        full = CDCL(Pigeonhole(5).to_cnf(), config)
+        assert full.check() is Result.UNSAT
+
+        solver = CDCL(Pigeonhole(5).to_cnf(), config)
+        solver.set_budget(conflicts=15)
+        while solver.check() is Result.UNKNOWN:
+            solver = CDCL.from_bytes(solver.to_bytes())
+            solver.set_budget(conflicts=15)
+        assert solver.config == config
+        assert solver.conflicts == full.conflicts
+        assert solver.restarts == full.restarts
+
+    def test_sat_model(self) -> None:
+        solver = CDCL(And(Or(x, y), Or(~x, ~y)))
+        assert solver.check() is Result.SAT
+        restored = CDCL.from_bytes(solver.to_bytes())
+        assert restored.assignments.els == solver.assignments.els
+        assert restored.check() is Result.SAT
+
+    def test_unsat(self) -> None:
+        solver = CDCL(And(Or(x), Or(~x)))
+        assert solver.check() is Result.UNSAT
+        assert CDCL.from_bytes(solver.to_bytes()).check() is Result.UNSAT
+
+    def test_compact(self) -> None:
+        solver = self.suspended()
+        assert len(solver.to_bytes()) < 8 * sum(map(len, solver.clauses))
+
+    @pytest.mark.parametrize("data", [b"", b"SATCDCL1", bytes(100)])
+    def test_invalid(self, data: bytes) -> None:
+        with pytest.raises(ParseError):
+            CDCL.from_bytes(data)
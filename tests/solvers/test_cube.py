@@ -0,0 +1,114 @@
+import itertools
+
+import pytest
+
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import And, Lit, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import CDCL
+from satisfaction.solvers.cube import CubeAndConquer, Cuber
+from satisfaction.solvers.solver import Result
+
+from .base_suite import BaseSuite
+
+x, y, z = var("x y z")
+
+
+class CubeAndConquer2(CubeAndConquer):
+    __slots__ = ()
+
+    def __init__(self, cnf) -> None:
+        super().__init__(cnf, cubes=4, workers=2)
+
+
+class TestCubeAndConquer(BaseSuite):
+    solver_cls = CubeAndConquer2
+    queens = (8, True)
+
+    def test_unsat(self) -> None:
+        solver = CubeAndConquer(Pigeonhole(5).to_cnf(), cubes=8, workers=2)
+        assert solver.check() is Result.UNSAT
+
+    def test_model(self) -> None:
+        cnf = Queens(8).get_cnf(amo="sequential")
+        solver = CubeAndConquer(cnf, cubes=16, workers=3)
+        assert solver.check() is Result.SAT
+        true = solver.assignments.els
+        assert all(any(lit in true for lit in clause.args) for clause in cnf.args)
+
+    def test_cube_budget(self) -> None:
+        solver = CubeAndConquer(Pigeonhole(8).to_cnf(), cubes=2, workers=2)
+        solver.set_budget(conflicts=5)
+        assert solver.check() is Result.UNKNOWN
+
+
+class TestCuber:
+    @pytest.mark.parametrize("target", [1, 2, 8, 32])
+    def test_cube_count(self, target: int) -> None:
+        cubes = Cuber(Queens(6).get_cnf(amo="pairwise")).cubes(target)
+        assert 0 < len(cubes) <= target
+        assert len({tuple(cube) for cube in cubes}) == len(cubes)
+
+    def test_cubes_cover_models(self) -> None:
+        cnf = Queens(5).get_cnf(amo="pairwise")
+        cubes = Cuber(cnf).cubes(16)
+
+        def consistent(cube: list[Lit], model: set[Lit]) -> bool:
+            return all(lit in model for lit in cube)
+
+        # every solution of 5-queens falls in some cube
+        vars = sorted({lit.atom() for c in cnf.args for lit in c.args}, key=repr)
+        solver = CDCL(cnf)
+        while solver.check() is Result.SAT:
+            model = {lit for lit in solver.trail}
+            assert any(consistent(cube, model) for cube in cubes)
+            solver.add_clause(Or(*(~lit for lit in model if lit.atom() in vars)))
+
+    def test_refuted(self) -> None:
+        assert Cuber(Pigeonhole(3).to_cnf()).cubes(8) == []
+        assert Cuber(And(Or(x), Or(~x))).cubes(4) == []
+
+    def test_failed_literal(self) -> None:
+        # x fails: it forces both y and ~y
+        cnf = And(Or(~x, y), Or(~x, ~y), Or(x, z), Or(y, z, x))
+        cubes = Cuber(cnf).cubes(4)
+        assert all(x not in cube for cube in cubes)
+
+
+class TestAssumptions:
+    def test_assumptions(self) -> None:
+        solver = CDCL(And(Or(x, y), Or(~x, z)))
+        assert solver.check([x]) is Result.SAT
+        assert {x, z} <= set(solver.trail)
+        assert solver.check([x, ~z]) is Result.UNSAT
+        assert not solver.unsat
+        assert solver.check([~x, ~y]) is Result.UNSAT
+        assert solver.check([~x]) is Result.SAT
+        assert y in solver.trail
+
+    def test_assumption_already_implied(self) -> None:
+        solver = CDCL(And(Or(x), Or(~x, y)))
+        assert solver.check([y, x]) is Result.SAT
+        assert solver.check([~y]) is Result.UNSAT
+
+    def test_unknown_variable(self) -> None:
+        solver = CDCL(And(Or(x)))
+        assert solver.check([z]) is Result.SAT
+        assert z in solver.trail
+
+    def test_cubes_partition_pigeonhole(self) -> None:
+        cnf = Pigeonhole(4).to_cnf()
+        cubes = Cuber(cnf).cubes(8)
+        solver = CDCL(cnf)
+        for cube in cubes:
+            assert solver.check(cube) is Result.UNSAT
+        assert solver.check() is Result.UNSAT
+
+    def test_all_assignments(self) -> None:
+        cnf = And(Or(x, y, z), Or(~x, ~y), Or(~y, ~z))
+        solver = CDCL(cnf)
+        for values in itertools.product((False, True), repeat=3):
+            cube = [v if b else ~v for v, b in zip((x, y, z), values)]
+            expected = any(values) and not (values[0] and values[1])
+            expected = expected and not (values[1] and values[2])
+            assert bool(solver.check(cube)) is expected
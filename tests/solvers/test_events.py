@@ -0,0 +1,138 @@
+import io
+import json
+import logging
+
+import pytest
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers import indexed
+from satisfaction.solvers.cdcl import CDCL, Config
+from satisfaction.solvers.events import EVENTS, TraceRecorder, log_events
+
+x, y = var("x y")
+
+
+class TestSubscribe:
+    def test_cdcl_events(self) -> None:
+        solver = CDCL(Pigeonhole(4).to_cnf(), Config("vsids", "luby", restart_base=2))
+        seen: dict[str, int] = dict.fromkeys(EVENTS, 0)
+        for event in EVENTS:
+            solver.subscribe(
+                event, lambda *args, event=event: seen.update({event: seen[event] + 1})
+            )
+        assert not solver.check()
+
+        assert seen["decide"] == solver.decisions
+        assert seen["propagate"] == solver.propagations
+        assert seen["conflict"] == solver.conflicts
+        assert seen["learn"] == solver.learned
+        assert seen["backjump"] == solver.backjumps
+        assert seen["restart"] == solver.restarts > 0
+
+    def test_arguments(self) -> None:
+        solver = CDCL(And(Or(x, y), Or(~x, y), Or(x, ~y), Or(~x, ~y)))
+        decisions: list = []
+        learned: list = []
+        backjumps: list = []
+        solver.subscribe("decide", lambda lit, level: decisions.append((lit, level)))
+        solver.subscribe("learn", learned.append)
+        solver.subscribe("backjump", lambda a, b: backjumps.append((a, b)))
+        assert not solver.check()
+        assert [level for _, level in decisions][:1] == [1]
+        assert all(len(clause) >= 1 for clause in learned)
+        assert all(a > b for a, b in backjumps)
+
+    def test_fan_out_and_unsubscribe(self) -> None:
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        first: list = []
+        second: list = []
+        solver.subscribe("conflict", lambda *args: first.append(args))
+        handler = lambda *args: second.append(args)  # noqa: E731
+        solver.subscribe("conflict", handler)
+        solver.unsubscribe("conflict", handler)
+        solver.check()
+        assert len(first) == solver.conflicts
+        assert second == []
+        assert solver._on_decide is None
+
+    def test_indexed_dpll(self) -> None:
+        solver = indexed.DPLL(Pigeonhole(3).to_cnf())
+        counts: dict[str, int] = {}
+        for event in solver.EVENTS:
+            solver.subscribe(
+                event, lambda *args, e=event: counts.update({e: counts.get(e, 0) + 1})
+            )
+        assert not solver.check()
+        assert counts["decide"] == 2 * solver.decisions
+        assert counts["conflict"] == solver.conflicts
+        assert counts["backjump"] == counts["decide"]
+
+    def test_unknown_event(self) -> None:
+        with pytest.raises(ValueError):
+            indexed.DPLL(And(Or(x))).subscribe("learn", print)
+
+    def test_log_events(self, caplog: pytest.LogCaptureFixture) -> None:
+        logger = logging.getLogger("test_events")
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        log_events(solver, logger)
+        with caplog.at_level(logging.DEBUG, logger="test_events"):
+            solver.check()
+        assert any(m.startswith("decide: ") for m in caplog.messages)
+        assert any(m.startswith("learned: ") for m in caplog.messages)
+
+
+class TestTraceRecorder:
+    def test_record(self) -> None:
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        with TraceRecorder(solver) as recorder:
+            solver.check()
+        assert solver._on_propagate is None
+
+        events = list(recorder.events())
+        assert len(events) == len(recorder)
+        kinds = [event for _, event, _, _ in events]
+        assert kinds.count("decide") == solver.decisions
+        times = [t for t, *_ in events]
+        assert times == sorted(times)
+
+    def test_selected_events(self) -> None:
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        recorder = TraceRecorder(solver, ["conflict"])
+        solver.check()
+        assert {event for _, event, _, _ in recorder.events()} == {"conflict"}
+
+    def test_chrome_trace(self) -> None:
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        recorder = TraceRecorder(solver)
+        solver.check()
+        buf = io.StringIO()
+        recorder.write_chrome_trace(buf)
+        trace = json.loads(buf.getvalue())["traceEvents"]
+        decides = [e for e in trace if e["name"] == "decide"]
+        assert len(decides) == solver.decisions
+        assert decides[0]["ph"] == "i"
+        assert decides[0]["args"]["lit"].lstrip("~").startswith("x")
+        assert any(e["ph"] == "C" for e in trace)
+
+    def test_binary_round_trip(self) -> None:
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        recorder = TraceRecorder(solver)
+        solver.check()
+        data = recorder.to_bytes()
+        loaded = TraceRecorder.from_bytes(data)
+        assert list(loaded.events()) == list(recorder.events())
+        assert [v.name for v in loaded.table.vars] == [
+            v.name for v in recorder.table.vars
+        ]
+        assert len(data) < 40 + 17 * len(recorder) + 200
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ParseError):
+            TraceRecorder.from_bytes(b"nope")
+        with pytest.raises(ParseError):
+            TraceRecorder.from_bytes(b"X" * 32)
+        data = TraceRecorder(CDCL(Pigeonhole(2).to_cnf())).to_bytes()
+        with pytest.raises(ParseError):
+            TraceRecorder.from_bytes(data[:-1] if len(data) > 24 else data[:10])
@@ -0,0 +1,84 @@
+import multiprocessing as mp
+import threading
+import time
+
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import And, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.packed import PackedCNF
+from satisfaction.solvers.cdcl import Config
+from satisfaction.solvers.portfolio import (
+    BASE_CONFIGS,
+    PortfolioSolver,
+    default_configs,
+    verify,
+)
+from satisfaction.solvers.solver import Result
+
+from .base_suite import BaseSuite
+
+x, y = var("x y")
+
+
+class Portfolio(PortfolioSolver):
+    __slots__ = ()
+
+    def __init__(self, cnf) -> None:
+        super().__init__(cnf, workers=2)
+
+
+class TestPortfolio(BaseSuite):
+    solver_cls = Portfolio
+    queens = (8, True)
+
+    def test_model_is_verified(self) -> None:
+        queens = Queens(8)
+        cnf = queens.get_cnf(amo="sequential")
+        solver = PortfolioSolver(cnf, workers=3)
+        assert solver.check() is Result.SAT
+        assert solver.winner is not None
+
+        true = solver.assignments.els
+        assert all(any(lit in true for lit in clause.args) for clause in cnf.args)
+
+    def test_unsat(self) -> None:
+        solver = PortfolioSolver(Pigeonhole(4).to_cnf(), workers=2)
+        assert solver.check() is Result.UNSAT
+
+    def test_workers_are_cancelled(self) -> None:
+        solver = PortfolioSolver(Pigeonhole(9).to_cnf(), workers=2)
+        timer = threading.Timer(0.5, solver.interrupt)
+        timer.start()
+        try:
+            start = time.monotonic()
+            assert solver.check() is Result.UNKNOWN
+            assert time.monotonic() - start < 5
+        finally:
+            timer.cancel()
+        assert mp.active_children() == []
+
+    def test_configs(self) -> None:
+        configs = [Config("order"), Config("vsids", "luby", "saved", seed=3)]
+        solver = PortfolioSolver(And(Or(x, y), Or(~x)), configs=configs)
+        assert solver.check() is Result.SAT
+        assert solver.winner in configs
+        assert solver.assignments.els == {~x, y}
+
+    def test_worker_budget(self) -> None:
+        solver = PortfolioSolver(Pigeonhole(8).to_cnf(), workers=2)
+        solver.set_budget(conflicts=10)
+        assert solver.check() is Result.UNKNOWN
+        assert solver.winner is None
+
+
+def test_default_configs() -> None:
+    configs = default_configs(2 * len(BASE_CONFIGS))
+    assert len(configs) == 2 * len(BASE_CONFIGS)
+    assert len({repr(config) for config in configs}) == len(configs)
+
+
+def test_verify() -> None:
+    packed = PackedCNF.from_cnf(And(Or(x, y), Or(~x, ~y)))
+    assert verify(packed, [1, -2])
+    assert not verify(packed, [1, 2])
+    assert not verify(packed, [-1])
@@ -0,0 +1,144 @@
+import pytest
+
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import Config
+from satisfaction.solvers.portfolio import PortfolioSolver
+from satisfaction.solvers.sharing import ClauseExchange, ClauseRing, SharingCDCL
+from satisfaction.solvers.solver import Result
+
+from .base_suite import BaseSuite
+
+
+@pytest.fixture
+def rings():
+    rings = [ClauseRing.create(16), ClauseRing.create(16)]
+    yield rings
+    for ring in rings:
+        ring.unlink()
+
+
+class TestClauseRing:
+    def test_read_write(self, rings: list[ClauseRing]) -> None:
+        ring = rings[0]
+        ring.write([1, -2])
+        ring.write([3])
+        clauses, cursor = ring.read(0)
+        assert clauses == [[1, -2], [3]]
+        assert ring.read(cursor) == ([], cursor)
+
+        ring.write([-4, 5, 6])
+        assert ring.read(cursor) == ([[-4, 5, 6]], cursor + 4)
+
+    def test_wrap_around(self, rings: list[ClauseRing]) -> None:
+        ring = rings[0]
+        cursor = 0
+        for i in range(1, 20):
+            ring.write([i, -i, i + 1])
+            clauses, cursor = ring.read(cursor)
+            assert clauses == [[i, -i, i + 1]]
+
+    def test_overrun(self, rings: list[ClauseRing]) -> None:
+        ring = rings[0]
+        for i in range(1, 10):
+            ring.write([i, i + 1])
+        clauses, cursor = ring.read(0)
+        assert clauses == []
+        assert cursor == ring.pos[0]
+
+    def test_in_progress_record(self, rings: list[ClauseRing]) -> None:
+        ring = rings[0]
+        assert ring.max_record == 4
+        for i in range(3):
+            ring.write([i + 1, i + 2, i + 3])
+        assert len(ring.read(0)[0]) == 3
+
+        # a record being written at position 13 could already have
+        # overwritten the first slots
+        ring.write([9])
+        clauses, cursor = ring.read(0)
+        assert clauses == []
+        assert cursor == ring.pos[0]
+
+    def test_too_long(self, rings: list[ClauseRing]) -> None:
+        rings[0].write(list(range(1, 20)))
+        rings[0].write([1, 2, 3, 4])
+        assert rings[0].read(0) == ([], 0)
+
+    def test_attach(self, rings: list[ClauseRing]) -> None:
+        other = ClauseRing.attach(rings[0].name)
+        try:
+            other.write([7, 8])
+            assert rings[0].read(0)[0] == [[7, 8]]
+        finally:
+            other.close()
+
+
+def test_exchange(rings: list[ClauseRing]) -> None:
+    a = ClauseExchange(rings, 0)
+    b = ClauseExchange(rings, 1)
+    a.export([1, 2])
+    b.export([-3])
+    assert a.collect() == [[-3]]
+    assert b.collect() == [[1, 2]]
+    assert a.collect() == b.collect() == []
+
+
+@pytest.fixture
+def large_rings():
+    rings = [ClauseRing.create(), ClauseRing.create()]
+    yield rings
+    for ring in rings:
+        ring.unlink()
+
+
+def test_sharing_solver(large_rings: list[ClauseRing]) -> None:
+    rings = large_rings
+    config = Config("vsids", "luby", "saved", restart_base=1)
+    cnf = Pigeonhole(5).to_cnf()
+
+    first = SharingCDCL(cnf, config, ClauseExchange(rings, 0))
+    assert first.check() is Result.UNSAT
+    assert first.exported > 0
+
+    # variables are numbered alike, so the second solver can use them
+    second = SharingCDCL(cnf, config, ClauseExchange(rings, 1))
+    second.exchange.cursors[0] = 0
+    assert second.check() is Result.UNSAT
+    assert second.imported > 0
+
+
+def test_sharing_without_restarts(large_rings: list[ClauseRing]) -> None:
+    cnf = Pigeonhole(5).to_cnf()
+    first = SharingCDCL(cnf, Config("vsids", "luby"), ClauseExchange(large_rings, 0))
+    assert first.check() is Result.UNSAT
+
+    config = Config("vsids", "none", "saved")
+    second = SharingCDCL(cnf, config, ClauseExchange(large_rings, 1))
+    second.exchange.cursors[0] = 0
+    assert second.check() is Result.UNSAT
+    assert second.restarts == 0
+    assert second.imported > 0
+
+
+def test_sharing_max_size(rings: list[ClauseRing]) -> None:
+    config = Config("vsids", "luby", "saved")
+    solver = SharingCDCL(
+        Pigeonhole(4).to_cnf(), config, ClauseExchange(rings, 0), max_size=0
+    )
+    assert solver.check() is Result.UNSAT
+    assert solver.exported == 0
+
+
+class SharingPortfolio(PortfolioSolver):
+    __slots__ = ()
+
+    def __init__(self, cnf) -> None:
+        super().__init__(cnf, workers=3, share=True)
+
+
+class TestSharingPortfolio(BaseSuite):
+    solver_cls = SharingPortfolio
+    queens = (8, True)
+
+    def test_unsat(self) -> None:
+        assert SharingPortfolio(Pigeonhole(5).to_cnf()).check() is Result.UNSAT
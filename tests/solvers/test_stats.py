@@ -0,0 +1,73 @@
+import json
+import time
+
+from satisfaction.expr import And, Or, var
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import CDCL
+from satisfaction.solvers.stats import Stats, timed_phase
+
+x, y = var("x y")
+
+
+class TestStats:
+    def test_cdcl_counters(self) -> None:
+        solver = CDCL(Pigeonhole(4).to_cnf())
+        assert not solver.check()
+        stats = solver.stats
+        assert stats["conflicts"] == solver.conflicts > 0
+        # every conflict above level 0 learns a clause
+        assert stats["learned"] == solver.conflicts - 1
+        assert stats["backjumps"] == stats["learned"]
+        assert stats["backjump_levels"] >= stats["backjumps"]
+        assert 0 < stats["max_level"] <= solver.decisions
+        assert stats["restarts"] == 0
+
+    def test_snapshot(self) -> None:
+        solver = CDCL(Pigeonhole(3).to_cnf())
+        before = solver.stats
+        solver.check()
+        assert before["conflicts"] == 0
+        assert "search" not in before.times
+
+    def test_search_time_accumulates(self) -> None:
+        solver = CDCL(Pigeonhole(4).to_cnf())
+        solver.set_budget(conflicts=5)
+        solver.check()
+        first = solver.times["search"]
+        solver.set_budget()
+        solver.check()
+        assert solver.times["search"] > first
+
+    def test_phases(self) -> None:
+        times: dict[str, float] = {}
+        with timed_phase(times, "parse"):
+            time.sleep(0.01)
+        assert times["parse"] >= 0.01
+
+        solver = CDCL(And(Or(x)))
+        solver.times.update(times)
+        with solver.phase("preprocess"):
+            pass
+        assert set(solver.stats.times) == {"parse", "preprocess"}
+
+    def test_exports(self) -> None:
+        stats = Stats({"conflicts": 3, "max_level": 2}, {"search": 0.5})
+        assert stats.to_dict() == {
+            "conflicts": 3,
+            "max_level": 2,
+            "times": {"search": 0.5},
+        }
+        assert json.loads(stats.to_json()) == stats.to_dict()
+
+        text = stats.to_prometheus(labels={"instance": 'a"b'})
+        assert text.splitlines() == [
+            "# TYPE satisfaction_conflicts_total counter",
+            'satisfaction_conflicts_total{instance="a\\"b"} 3',
+            "# TYPE satisfaction_max_level gauge",
+            'satisfaction_max_level{instance="a\\"b"} 2',
+            "# TYPE satisfaction_phase_seconds gauge",
+            'satisfaction_phase_seconds{instance="a\\"b",phase="search"} 0.5',
+        ]
+        assert Stats({"decisions": 1}, {}).to_prometheus("sat") == (
+            "# TYPE sat_decisions_total counter\nsat_decisions_total 1\n"
+        )
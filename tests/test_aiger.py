@@ -0,0 +1,131 @@
+from pathlib import Path
+
+import pytest
+
+from satisfaction.aiger import _Reader, parse_aiger, read_aiger
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, Or, Var
+from satisfaction.solvers.cdcl import CDCL
+
+# out = a & b, plus a dangling gate outside the cone of influence
+AND_AAG = b"aag 4 2 0 1 2\n2\n4\n6\n6 2 4\n8 3 5\ni0 a\ni1 b\no0 out\nc\nhello\n"
+
+# out = a ^ b
+XOR_AAG = b"aag 5 2 0 1 3\n2\n4\n10\n6 4 2\n8 5 3\n10 9 7\n"
+XOR_AIG = b"aig 5 2 0 1 3\n10\n" + bytes([2, 2, 3, 2, 1, 2])
+
+a, b = Var("a"), Var("b")
+g3 = Var("g3", generated=True)
+false = Var("false", generated=True)
+
+
+def models(cnf: And, inputs: list[Var]) -> set[tuple[bool, ...]]:
+    """Input assignments under which the encoding is satisfiable."""
+    result = set()
+    for bits in range(2 ** len(inputs)):
+        values = tuple(bool(bits >> i & 1) for i in range(len(inputs)))
+        units = [Or(v if x else ~v) for v, x in zip(inputs, values)]
+        if CDCL(And(*cnf.args, *units)).check():
+            result.add(values)
+    return result
+
+
+class TestParse:
+    def test_ascii(self) -> None:
+        aig = parse_aiger(AND_AAG)
+        assert aig.max_var == 4
+        assert aig.inputs == [2, 4]
+        assert aig.outputs == [6]
+        assert aig.ands.tolist() == [6, 2, 4, 8, 3, 5]
+        assert aig.symbols == {("i", 0): "a", ("i", 1): "b", ("o", 0): "out"}
+        assert aig.var(1) == a
+
+    def test_binary(self) -> None:
+        assert parse_aiger(XOR_AIG).ands == parse_aiger(XOR_AAG).ands
+
+    def test_latches(self) -> None:
+        aig = parse_aiger(b"aag 2 1 1 1 0\n2\n4 3\n4\nl0 state\n")
+        assert aig.latches == [(4, 3)]
+        assert aig.var(2) == Var("state")
+
+        aig = parse_aiger(b"aig 2 1 1 1 0\n3 1\n4\n")
+        assert aig.latches == [(4, 3)]
+        assert aig.var(2) == Var("l0")
+
+    def test_varint(self) -> None:
+        assert _Reader(bytes([0x81, 0x01, 0x05])).varint() == 129
+
+    @pytest.mark.parametrize(
+        "data,match",
+        (
+            (b"p cnf 1 1\n", "not an AIGER"),
+            (b"aag 1 x 0 0 0\n", "invalid AIGER header"),
+            (b"aag 1 1 0 0 0 0 0 1 0\n", "justice"),
+            (b"aag 1 1 0 0 0\nfoo\n", "expected integers"),
+            (b"aag 3 2 0 1 1\n2\n4\n6\n6 2\n", "expected 3 integers"),
+            (b"aag 2 1 0 1 1\n2\n4\n4 2 8\n", "exceeds maximum"),
+            (b"aag 1 0 1 0 0\n2\n", "invalid latch"),
+            (b"aag 1 1 0 1 0\n2\n6\n", "exceeds maximum"),
+            (b"aag 1 1 0 0 0 1\n2\n4\n", "exceeds maximum"),
+            (b"aig 1 0 1 0 0\n2 0 1\n", "invalid latch"),
+            (b"aig 3 2 0 1 1\n6\n\x82", "unexpected end"),
+            (b"aag 1 1 0 0 0\n2\nx0 foo\n", "invalid symbol"),
+        ),
+    )
+    def test_raises(self, data: bytes, match: str) -> None:
+        with pytest.raises(ParseError, match=match):
+            parse_aiger(data)
+
+    def test_read(self, tmp_path: Path) -> None:
+        path = tmp_path / "xor.aig"
+        path.write_bytes(XOR_AIG)
+        assert read_aiger(path).num_ands == 3
+
+
+class TestEncode:
+    def test_clauses(self) -> None:
+        aig = parse_aiger(AND_AAG)
+        # the gate on variable 4 is not in the cone of the output
+        assert aig.to_cnf() == And(
+            Or(~false),
+            Or(~g3, a),
+            Or(~g3, b),
+            Or(g3, ~a, ~b),
+            Or(g3),
+        )
+        assert len(aig.to_cnf("none").args) == 1 + 2 * 3
+
+    def test_and(self) -> None:
+        cnf = parse_aiger(AND_AAG).to_cnf()
+        assert models(cnf, [a, b]) == {(True, True)}
+
+    def test_xor(self) -> None:
+        aig = parse_aiger(XOR_AIG)
+        i0, i1 = Var("i0"), Var("i1")
+        assert models(aig.to_cnf(), [i0, i1]) == {(True, False), (False, True)}
+
+    def test_constants(self) -> None:
+        assert CDCL(parse_aiger(b"aag 0 0 0 1 0\n1\n").to_cnf()).check()
+        assert not CDCL(parse_aiger(b"aag 0 0 0 1 0\n0\n").to_cnf()).check()
+
+    def test_assert_all(self) -> None:
+        # out0 = a, out1 = ~a
+        aig = parse_aiger(b"aag 1 1 0 2 0\n2\n2\n3\n")
+        assert CDCL(aig.to_cnf("any")).check()
+        assert not CDCL(aig.to_cnf("all")).check()
+
+        with pytest.raises(ValueError):
+            aig.to_cnf("some")  # type: ignore
+
+    def test_constraints(self) -> None:
+        # bad = a & b under the invariant constraint ~a
+        aig = parse_aiger(b"aag 3 2 0 0 1 1 1\n2\n4\n6\n3\n6 2 4\n")
+        assert aig.bad == [6]
+        assert aig.constraints == [3]
+        assert not CDCL(aig.to_cnf()).check()
+
+    def test_add_to(self) -> None:
+        solver = CDCL(And())
+        parse_aiger(XOR_AIG).add_to(solver)
+        assert len(solver.clauses) == 1 + 3 * 3 + 1
+        assert solver.check()
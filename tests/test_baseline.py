@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from satisfaction.examples.baseline import (
+    Comparison,
+    bootstrap_ratio,
+    compare,
+    format_comparisons,
+    load_baseline,
+    quartiles,
+    save_baseline,
+)
+
+BASE = [1.0, 1.02, 0.98, 1.01, 0.99, 1.0, 1.03, 0.97]
+
+
+def test_quartiles() -> None:
+    assert quartiles([1.0, 2.0, 3.0, 4.0, 5.0]) == (2.0, 3.0, 4.0)
+    assert quartiles([2.5]) == (2.5, 2.5, 2.5)
+
+
+def test_bootstrap_ratio() -> None:
+    low, high = bootstrap_ratio(BASE, [t * 2 for t in BASE])
+    assert 1.9 < low <= 2.0 <= high < 2.1
+    assert bootstrap_ratio(BASE, BASE, seed=3) == bootstrap_ratio(BASE, BASE, seed=3)
+
+
+def test_comparison() -> None:
+    slower = Comparison("cdcl", 8, BASE, [t * 1.5 for t in BASE])
+    assert slower.slower and not slower.faster
+    assert slower.ratio == pytest.approx(1.5)
+    assert slower.regressed(0.05)
+    assert not slower.regressed(0.6)
+
+    faster = Comparison("cdcl", 8, BASE, [t / 2 for t in BASE])
+    assert faster.faster and not faster.regressed()
+
+    same = Comparison("cdcl", 8, BASE, list(reversed(BASE)))
+    assert not same.slower and not same.faster
+    assert same.low <= 1 <= same.high
+
+
+def test_compare() -> None:
+    base = {"cdcl": {4: BASE, 6: BASE}, "indexed": {4: BASE}}
+    new = {"cdcl": {4: [t * 3 for t in BASE], 8: BASE}, "naive": {4: BASE}}
+    comparisons = compare(base, new)
+    assert [(c.solver, c.n) for c in comparisons] == [("cdcl", 4)]
+
+    table = format_comparisons(comparisons).splitlines()
+    assert table[0].split()[:3] == ["solver", "N", "base"]
+    assert table[2].endswith("REGRESSION")
+
+
+def test_save_and_load() -> None:
+    f = io.StringIO()
+    save_baseline({"cdcl": {4: BASE}}, {"amo": None, "symmetry": False}, f)
+    f.seek(0)
+    samples, options = load_baseline(f)
+    assert samples == {"cdcl": {4: BASE}}
+    assert options == {"amo": None, "symmetry": False}
+
+    with pytest.raises(ValueError):
+        load_baseline(io.StringIO('{"version": 99}'))
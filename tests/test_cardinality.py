@@ -0,0 +1,120 @@
+import itertools
+
+import pytest
+
+from satisfaction.cardinality import (
+    AMK_ENCODINGS,
+    AMO_ENCODINGS,
+    Encoder,
+    odd_even_merge_sort,
+)
+from satisfaction.expr import And, Clause, Lit, Or, Var
+from satisfaction.solvers.cdcl import CDCL
+from satisfaction.utils import numbered_var
+
+xs = tuple(Var(f"x{i}") for i in range(6))
+
+
+def accepted(clauses: list[Clause], lits: tuple[Lit, ...]) -> set[tuple[bool, ...]]:
+    """Assignments to ``lits`` that can be extended to satisfy ``clauses``."""
+    result = set()
+    for values in itertools.product((False, True), repeat=len(lits)):
+        units = [Or(lit if x else ~lit) for lit, x in zip(lits, values)]
+        if CDCL(And(*clauses, *units)).check():
+            result.add(values)
+    return result
+
+
+def expected(n: int, pred) -> set[tuple[bool, ...]]:
+    return {
+        values
+        for values in itertools.product((False, True), repeat=n)
+        if pred(sum(values))
+    }
+
+
+@pytest.mark.parametrize("encoding", AMO_ENCODINGS)
+@pytest.mark.parametrize("n", (1, 2, 3, 5, 6))
+def test_at_most_one(encoding: str, n: int) -> None:
+    encoder = Encoder(commander_size=2, product_min=3)
+    lits = xs[:n]
+    clauses = encoder.at_most_one(lits, encoding)
+    assert accepted(clauses, lits) == expected(n, lambda c: c <= 1)
+
+
+@pytest.mark.parametrize("encoding", AMO_ENCODINGS)
+def test_exactly_one(encoding: str) -> None:
+    lits = (xs[0], ~xs[1], xs[2], xs[3])
+    clauses = Encoder(product_min=3).exactly_one(lits, encoding)
+    assert accepted(clauses, lits) == expected(4, lambda c: c == 1)
+
+
+@pytest.mark.parametrize("encoding", AMK_ENCODINGS)
+@pytest.mark.parametrize("n,k", ((3, 1), (4, 2), (5, 2), (5, 3), (6, 4), (6, 1)))
+def test_at_most_k(encoding: str, n: int, k: int) -> None:
+    lits = xs[:n]
+    clauses = Encoder().at_most_k(lits, k, encoding)
+    assert accepted(clauses, lits) == expected(n, lambda c: c <= k)
+
+
+@pytest.mark.parametrize("encoding", AMK_ENCODINGS)
+@pytest.mark.parametrize("k", range(0, 6))
+def test_at_least_and_exactly_k(encoding: str, k: int) -> None:
+    lits = (xs[0], ~xs[1], xs[2], xs[3])
+    encoder = Encoder()
+
+    clauses = encoder.at_least_k(lits, k, encoding)
+    assert accepted(clauses, lits) == expected(4, lambda c: c >= k)
+
+    clauses = encoder.exactly_k(lits, k, encoding)
+    assert accepted(clauses, lits) == expected(4, lambda c: c == k)
+
+
+def test_trivial_bounds() -> None:
+    encoder = Encoder()
+    assert encoder.at_most_k(xs[:3], 3) == []
+    assert encoder.at_most_k(xs[:3], -1) == [Or()]
+    assert encoder.at_most_k(xs[:2], 0) == [Or(~xs[0]), Or(~xs[1])]
+    assert encoder.at_least_k(xs[:2], 0) == []
+    assert encoder.at_least_k(xs[:2], 3) == [Or()]
+    assert encoder.at_most_one(xs[:1], "sequential") == []
+
+
+def test_amk_with_amo_encoding() -> None:
+    encoder = Encoder()
+    assert encoder.at_most_k(xs[:3], 1, "pairwise") == encoder.at_most_one(xs[:3])
+
+
+def test_unsupported_encoding() -> None:
+    encoder = Encoder()
+    with pytest.raises(ValueError, match="at-most-one"):
+        encoder.at_most_one(xs, "totalizer")
+    with pytest.raises(ValueError, match="at-most-k"):
+        encoder.at_most_k(xs, 2, "pairwise")
+
+
+def test_aux_vars() -> None:
+    encoder = Encoder(name_gen=numbered_var("aux", 0))
+    clauses = encoder.at_most_one(xs[:3], "sequential")
+    aux = {lit.atom() for c in clauses for lit in c.args} - set(xs)
+    assert aux == {Var("aux0", generated=True), Var("aux1", generated=True)}
+
+
+def test_sizes() -> None:
+    encoder = Encoder()
+    lits = tuple(Var(f"y{i}") for i in range(100))
+    assert len(encoder.at_most_one(lits, "pairwise")) == 100 * 99 // 2
+    assert len(encoder.at_most_one(lits, "sequential")) == 3 * 100 - 4
+    assert len(encoder.at_most_one(lits, "product")) < 500
+    assert len(encoder.at_most_one(lits, "commander")) < 700
+
+
+@pytest.mark.parametrize("n", (2, 4, 8, 16))
+def test_odd_even_merge_sort(n: int) -> None:
+    pairs = odd_even_merge_sort(n)
+    # 0-1 principle
+    for values in itertools.product((0, 1), repeat=n):
+        wires = list(values)
+        for i, j in pairs:
+            wires[i], wires[j] = max(wires[i], wires[j]), min(wires[i], wires[j])
+        assert wires == sorted(values, reverse=True)
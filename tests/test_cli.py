@@ -0,0 +1,127 @@
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from satisfaction.cli import EXIT_SAT, EXIT_UNKNOWN, EXIT_UNSAT, main, write_model
+from satisfaction.dimacs import write_dimacs
+from satisfaction.generators import Pigeonhole
+
+SAT = b"c example\np cnf 4 3\n1 -2 0\n2 3 0\n-1 -3 0\n"
+UNSAT = b"p cnf 1 2\n1 0\n-1 0\n"
+
+
+def lines(capsys: pytest.CaptureFixture[str], prefix: str) -> list[str]:
+    return [line for line in capsys.readouterr().out.splitlines() if line[:1] == prefix]
+
+
+@pytest.mark.parametrize("solver", ["cdcl", "indexed", "dpll"])
+def test_sat(tmp_path: Path, capsys: pytest.CaptureFixture[str], solver: str) -> None:
+    path = tmp_path / "sat.cnf"
+    path.write_bytes(SAT)
+    assert main([str(path), "--solver", solver]) == EXIT_SAT
+
+    out = capsys.readouterr().out.splitlines()
+    assert "s SATISFIABLE" in out
+    (v_line,) = [line for line in out if line.startswith("v ")]
+    model = [int(lit) for lit in v_line.split()[1:]]
+    assert model[-1] == 0
+    assert [abs(lit) for lit in model[:-1]] == [1, 2, 3, 4]
+    true = set(model)
+    assert all(any(lit in true for lit in c) for c in [[1, -2], [2, 3], [-1, -3]])
+
+
+def test_unsat(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "unsat.cnf"
+    path.write_bytes(UNSAT)
+    assert main([str(path), "--stats"]) == EXIT_UNSAT
+    out = capsys.readouterr().out.splitlines()
+    assert "s UNSATISFIABLE" in out
+    assert not any(line.startswith("v") for line in out)
+    assert any(line.startswith("c conflicts: ") for line in out)
+    assert any(line.startswith("c search time: ") for line in out)
+
+
+@pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+def test_compressed(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], compress
+) -> None:
+    path = tmp_path / "sat.cnf.z"
+    path.write_bytes(compress(SAT))
+    assert main([str(path), "--no-model"]) == EXIT_SAT
+    assert lines(capsys, "s") == ["s SATISFIABLE"]
+
+
+def test_stdin(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(
+        sys, "stdin", io.TextIOWrapper(io.BytesIO(gzip.compress(UNSAT)))
+    )
+    assert main([]) == EXIT_UNSAT
+
+
+def test_limits(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "php.cnf"
+    with open(path, "wb") as f:
+        Pigeonhole(8).write_dimacs(f)
+    assert main([str(path), "--conflicts", "10"]) == EXIT_UNKNOWN
+    out = capsys.readouterr().out.splitlines()
+    assert out[-1] == "s UNKNOWN"
+    assert "c conflicts: 10" in out
+
+    assert main([str(path), "--time-limit", "0.2"]) == EXIT_UNKNOWN
+    assert lines(capsys, "s") == ["s UNKNOWN"]
+
+
+def test_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main([str(tmp_path / "missing.cnf")]) == 1
+    assert lines(capsys, "c")[0].startswith("c error: ")
+
+    path = tmp_path / "bad.cnf"
+    path.write_bytes(b"p cnf 1 1\n2 0\n")
+    assert main([str(path)]) == 1
+
+    path.write_bytes(SAT)
+    assert main([str(path), "--heuristic", "best"]) == 1
+    assert "unsupported branching heuristic" in capsys.readouterr().out
+
+
+def test_write_model() -> None:
+    out = io.StringIO()
+    write_model(list(range(1, 41)), out)
+    text = out.getvalue().splitlines()
+    assert len(text) > 1
+    assert all(line.startswith("v ") and len(line) <= 78 for line in text)
+    assert text[-1].endswith(" 0")
+    assert " ".join(line[2:] for line in text).split() == [
+        *map(str, range(1, 41)),
+        "0",
+    ]
+
+
+def test_sigterm(tmp_path: Path) -> None:
+    path = tmp_path / "php.cnf"
+    with open(path, "wb") as f:
+        write_dimacs(Pigeonhole(10).to_packed(), f)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "satisfaction.cli", str(path)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    assert process.stdout.readline().startswith("c 110 variables")
+    time.sleep(0.5)
+    process.send_signal(signal.SIGTERM)
+    out, _ = process.communicate(timeout=30)
+    assert process.returncode == EXIT_UNKNOWN
+    assert "c received SIGTERM" in out
+    assert "c parse time: " in out
+    assert out.splitlines()[-1] == "s UNKNOWN"
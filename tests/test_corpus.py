@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from satisfaction.examples.corpus import (
+    ERROR,
+    TIMEOUT,
+    Record,
+    cactus,
+    find_instances,
+    main,
+    par2,
+    run_corpus,
+    run_instance,
+    summary,
+    write_csv,
+)
+from satisfaction.generators import Pigeonhole
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    (tmp_path / "sat.cnf").write_text("p cnf 2 2\n1 2 0\n-1 0\n")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "unsat.cnf").write_text("p cnf 1 2\n1 0\n-1 0\n")
+    (tmp_path / "notes.txt").write_text("not a formula")
+    return tmp_path
+
+
+def test_find_instances(corpus: Path) -> None:
+    assert find_instances(corpus) == [
+        corpus / "nested" / "unsat.cnf",
+        corpus / "sat.cnf",
+    ]
+    assert find_instances(corpus / "sat.cnf") == [corpus / "sat.cnf"]
+
+
+def test_run_instance(corpus: Path) -> None:
+    record = run_instance(corpus / "sat.cnf", "cdcl", timeout=10)
+    assert record.status == "SAT"
+    assert 0 < record.time < 10
+    assert record.memory > 0
+    assert record.stats["decisions"] >= 0
+
+
+def test_timeout(tmp_path: Path) -> None:
+    path = tmp_path / "hard.cnf"
+    with open(path, "wb") as f:
+        Pigeonhole(9).write_dimacs(f)
+    record = run_instance(path, "cdcl", timeout=0.5)
+    assert record.status == TIMEOUT
+    assert record.time == 0.5
+    assert not record.solved
+
+
+def test_parse_error(tmp_path: Path) -> None:
+    path = tmp_path / "bad.cnf"
+    path.write_text("1 2 0\n")
+    record = run_instance(path, "indexed", timeout=10)
+    assert record.status == ERROR
+    assert record.error is not None and "ParseError" in record.error
+
+
+def test_run_corpus(corpus: Path) -> None:
+    records = list(
+        run_corpus(find_instances(corpus), ["cdcl", "indexed"], timeout=10, jobs=2)
+    )
+    assert len(records) == 4
+    assert {(Path(r.instance).name, r.status) for r in records} == {
+        ("sat.cnf", "SAT"),
+        ("unsat.cnf", "UNSAT"),
+    }
+
+    with pytest.raises(ValueError):
+        run_corpus([], ["minisat"])
+
+
+def test_scores() -> None:
+    records = [
+        Record("a", "cdcl", "SAT", 1.0),
+        Record("b", "cdcl", "UNSAT", 3.0),
+        Record("c", "cdcl", TIMEOUT, 10.0),
+        Record("a", "dpll", "SAT", 2.0),
+        Record("b", "dpll", ERROR, 0.1),
+        Record("c", "dpll", TIMEOUT, 10.0),
+    ]
+    assert par2(records, 10.0) == {"cdcl": 8.0, "dpll": 14.0}
+    assert cactus(records) == {"cdcl": [1.0, 3.0], "dpll": [2.0]}
+
+    table = summary(records, 10.0).splitlines()
+    assert table[0].split() == [
+        "solver",
+        "SAT",
+        "UNSAT",
+        "TIMEOUT",
+        "MEMOUT",
+        "ERROR",
+        "PAR-2",
+    ]
+    assert table[2].split() == ["cdcl", "1", "1", "1", "0", "0", "8.00"]
+
+    f = io.StringIO()
+    write_csv(records[:1], f)
+    rows = list(csv.DictReader(io.StringIO(f.getvalue())))
+    assert rows[0]["status"] == "SAT"
+    assert rows[0]["time"] == "1.0"
+
+
+def test_main(corpus: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    out = corpus / "results.json"
+    cactus_path = corpus / "cactus.csv"
+    main(
+        [
+            str(corpus),
+            "--timeout",
+            "10",
+            "--json",
+            str(out),
+            "--cactus",
+            str(cactus_path),
+        ]
+    )
+    data = json.loads(out.read_text())
+    assert [Path(r["instance"]).name for r in data] == ["unsat.cnf", "sat.cnf"]
+    assert "PAR-2" in capsys.readouterr().out
+    assert cactus_path.read_text().splitlines()[0] == "solver,solved,time"
@@ -0,0 +1,79 @@
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+from satisfaction.dimacs import decompress, parse_dimacs, read_dimacs, write_dimacs
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, Or, Var
+from satisfaction.solvers.cdcl import CDCL
+
+TEXT = b"""c a comment
+p cnf 3 4
+1 -2 0
+-1 2
+3 0 -3 0
+2 0
+"""
+
+x1, x2, x3 = Var("x1"), Var("x2"), Var("x3")
+
+
+class TestDimacs:
+    def test_parse(self) -> None:
+        packed = parse_dimacs(TEXT)
+        assert packed.num_vars == 3
+        assert [list(clause) for clause in packed] == [[1, -2], [-1, 2, 3], [-3], [2]]
+        assert packed.to_cnf() == And(Or(x1, ~x2), Or(~x1, x2, x3), Or(~x3), Or(x2))
+
+    def test_numbering(self) -> None:
+        # variables keep their numbers even when first seen out of order
+        packed = parse_dimacs("p cnf 5 1\n5 -3 0\n")
+        assert packed.table.encode(Var("x5")) == 5
+        assert packed.table.decode(-3) == ~Var("x3")
+        assert not CDCL(parse_dimacs(TEXT + b"-2 0\n").to_cnf()).check()
+
+    def test_satlib_trailer(self) -> None:
+        packed = parse_dimacs("p cnf 2 1\n1 2 0\n%\n0\n")
+        assert len(packed) == 1
+
+    def test_empty(self) -> None:
+        packed = parse_dimacs("p cnf 0 0\n")
+        assert packed.num_vars == 0
+        assert len(packed) == 0
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "1 2 0\n",
+            "p cnf 2 1\np cnf 2 1\n1 0\n",
+            "p dnf 2 1\n1 0\n",
+            "p cnf 2 1\n1 a 0\n",
+            "p cnf 2 1\n1 3 0\n",
+            "p cnf 2 1\n1 2\n",
+            "",
+        ],
+    )
+    def test_invalid(self, text: str) -> None:
+        with pytest.raises(ParseError):
+            parse_dimacs(text)
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        packed = parse_dimacs(TEXT)
+        buf = io.BytesIO()
+        write_dimacs(packed, buf)
+        assert buf.getvalue().startswith(b"p cnf 3 4\n1 -2 0\n")
+
+        path = tmp_path / "f.cnf"
+        path.write_bytes(buf.getvalue())
+        again = read_dimacs(path)
+        assert [list(c) for c in again] == [list(c) for c in packed]
+
+
+def test_decompress() -> None:
+    data = b"p cnf 1 1\n1 0\n"
+    assert decompress(data) is data
+    assert decompress(gzip.compress(data)) == data
+    with pytest.raises(ParseError):
+        decompress(gzip.compress(data)[:-4])
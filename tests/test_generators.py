@@ -0,0 +1,138 @@
+import io
+
+import pytest
+
+from satisfaction.dimacs import parse_dimacs
+from satisfaction.generators import (
+    GraphColoring,
+    Pigeonhole,
+    RandomKSAT,
+    Sudoku,
+    XorChains,
+    main,
+)
+from satisfaction.solvers.cdcl import CDCL
+from satisfaction.solvers.solver import Result
+
+GENERATORS = [
+    RandomKSAT(20, 50, seed=1),
+    RandomKSAT.phase_transition(30, k=4, seed=2),
+    Pigeonhole(3),
+    Pigeonhole(4, pigeons=3),
+    XorChains(6, seed=1),
+    XorChains(6, satisfiable=True, seed=1),
+    GraphColoring(30, 40, 3, seed=1),
+    GraphColoring.with_degree(20, 6.0, 2, seed=3),
+    Sudoku(2, givens=5, seed=1),
+    Sudoku(3, givens=40, seed=2),
+]
+
+
+@pytest.mark.parametrize("generator", GENERATORS, ids=repr)
+def test_shape(generator) -> None:
+    clauses = list(generator)
+    assert len(clauses) == generator.num_clauses
+    assert all(0 < abs(lit) <= generator.num_vars for c in clauses for lit in c)
+    assert list(generator) == clauses
+
+    packed = generator.to_packed()
+    assert [list(c) for c in packed] == clauses
+    assert packed.num_vars == generator.num_vars
+
+    f = io.BytesIO()
+    generator.write_dimacs(f)
+    assert [list(c) for c in parse_dimacs(f.getvalue())] == clauses
+
+
+@pytest.mark.parametrize(
+    "generator",
+    [
+        RandomKSAT(20, 50),
+        XorChains(6),
+        GraphColoring(30, 40, 3),
+        Sudoku(2, givens=5),
+    ],
+    ids=repr,
+)
+def test_unseeded(generator) -> None:
+    assert isinstance(generator.seed, int)
+    assert list(generator) == list(generator)
+    assert generator.to_cnf() == generator.to_cnf()
+
+
+def test_random_ksat() -> None:
+    clauses = list(RandomKSAT(10, 100, k=4, seed=3))
+    assert all(len({abs(lit) for lit in c}) == 4 for c in clauses)
+    assert any(lit < 0 for c in clauses for lit in c)
+    assert any(lit > 0 for c in clauses for lit in c)
+    assert clauses != list(RandomKSAT(10, 100, k=4, seed=4))
+    assert RandomKSAT.phase_transition(1000).num_clauses == 4267
+
+    with pytest.raises(ValueError):
+        RandomKSAT(2, 10, k=3)
+    with pytest.raises(ValueError):
+        RandomKSAT.phase_transition(100, k=9)
+
+
+@pytest.mark.parametrize(
+    ("generator", "expected"),
+    [
+        (Pigeonhole(4), Result.UNSAT),
+        (Pigeonhole(4, pigeons=4), Result.SAT),
+        (XorChains(8, seed=5), Result.UNSAT),
+        (XorChains(8, satisfiable=True, seed=5), Result.SAT),
+        (GraphColoring(6, 15, 5, seed=1), Result.UNSAT),
+        (GraphColoring(6, 15, 6, seed=1), Result.SAT),
+        (Sudoku(2, givens=8, seed=7), Result.SAT),
+    ],
+    ids=repr,
+)
+def test_satisfiability(generator, expected: Result) -> None:
+    assert CDCL(generator.to_cnf()).check() is expected
+
+
+def test_graph_coloring_edges() -> None:
+    coloring = GraphColoring(10, 45, 3, seed=1)
+    edges = coloring.edge_list()
+    assert len(set(edges)) == 45
+    assert all(key // 10 < key % 10 for key in edges)
+    with pytest.raises(ValueError):
+        GraphColoring(10, 46, 3)
+
+
+def test_sudoku_solution() -> None:
+    sudoku = Sudoku(3, seed=11)
+    grid = sudoku.solution()
+    units = [grid[r * 9 : r * 9 + 9] for r in range(9)]
+    units += [grid[c::9] for c in range(9)]
+    units += [
+        [grid[(b // 3 * 3 + i // 3) * 9 + b % 3 * 3 + i % 3] for i in range(9)]
+        for b in range(9)
+    ]
+    assert all(sorted(unit) == list(range(1, 10)) for unit in units)
+    assert grid == Sudoku(3, seed=11).solution()
+
+
+def test_sudoku_puzzle() -> None:
+    puzzle = "1.3. ..1. .1.. 4..1"
+    sudoku = Sudoku(2, puzzle=puzzle)
+    assert sudoku.givens == 6
+    solver = CDCL(sudoku.to_cnf())
+    assert solver.check()
+
+    # two 3s in the bottom right box
+    assert not CDCL(Sudoku(2, puzzle="1.2. ..1. .1.. ...3").to_cnf()).check()
+
+    with pytest.raises(ValueError):
+        Sudoku(2, puzzle="1.2.")
+    with pytest.raises(ValueError):
+        Sudoku(2, puzzle="5" * 16)
+
+
+def test_main(capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    main(["--seed", "1", "ksat", "10", "--ratio", "2"])
+    packed = parse_dimacs(capsysbinary.readouterr().out)
+    assert (packed.num_vars, len(packed)) == (10, 20)
+
+    main(["sudoku", "--box", "2", "--givens", "3"])
+    assert len(parse_dimacs(capsysbinary.readouterr().out)) == Sudoku(2, 3).num_clauses
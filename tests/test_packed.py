@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, Or, Var, var
+from satisfaction.packed import HEADER, PackedCNF, VarTable, write_packed
+
+x, y, z = var("x y z")
+(g,) = var("g", generated=True)
+
+cnf = And(Or(x, ~y), Or(~x, y, g), Or(~g), Or(z, x))
+
+
+class TestVarTable:
+    def test_encode_decode(self) -> None:
+        table = VarTable()
+        assert table.encode(~y) == -1
+        assert table.encode(x) == 2
+        assert table.encode(y) == 1
+        assert len(table) == 2
+
+        assert table.decode(-2) == ~x
+        assert table.decode_clause([1, -2]) == Or(y, ~x)
+
+    def test_init(self) -> None:
+        table = VarTable([z, y, z])
+        assert table.vars == [z, y]
+        assert table.encode_clause(Or(~z, y)) == [-1, 2]
+
+    def test_newline_in_name(self, tmp_path: Path) -> None:
+        bad = Var("a\nb")
+        with pytest.raises(ValueError, match="newline"):
+            VarTable([bad])
+        with pytest.raises(ValueError, match="newline"):
+            PackedCNF.from_cnf(And(Or(x, bad)))
+        with pytest.raises(ValueError, match="newline"):
+            write_packed(tmp_path / "bad.cnfb", [Or(bad)])
+
+
+class TestPackedCNF:
+    def test_from_cnf(self) -> None:
+        packed = PackedCNF.from_cnf(cnf)
+        assert len(packed) == 4
+        assert packed.num_vars == 4
+        assert packed.clause(1).tolist() == [-1, 2, 3]
+        assert [c.tolist() for c in packed] == [[1, -2], [-1, 2, 3], [-3], [4, 1]]
+        assert packed.to_cnf() == cnf
+
+    def test_bytes_round_trip(self) -> None:
+        buf = PackedCNF.from_cnf(cnf).to_bytes()
+        packed = PackedCNF.from_bytes(buf)
+        assert packed.to_cnf() == cnf
+        assert packed.table.vars[2].generated
+        assert not packed.table.vars[0].generated
+
+    def test_empty(self) -> None:
+        packed = PackedCNF.from_bytes(PackedCNF.from_cnf(And()).to_bytes())
+        assert len(packed) == 0
+        assert packed.num_vars == 0
+        assert packed.to_cnf() == And()
+
+    def test_dump_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "f.cnfb"
+        with open(path, "wb") as f:
+            PackedCNF.from_cnf(cnf).dump(f)
+
+        with PackedCNF.load(path) as packed:
+            assert packed.to_cnf() == cnf
+            assert packed._mmap is not None
+        assert packed._mmap is None
+
+    def test_write_packed(self, tmp_path: Path, monkeypatch) -> None:
+        import satisfaction.packed
+
+        # force several chunk flushes
+        monkeypatch.setattr(satisfaction.packed, "WRITE_CHUNK", 3)
+
+        clauses = [Or(Var(f"v{i}"), ~Var(f"v{i + 1}")) for i in range(50)]
+        path = tmp_path / "f.cnfb"
+        assert write_packed(path, iter(clauses)) == 50
+
+        with PackedCNF.load(path) as packed:
+            assert packed.to_cnf() == And(*clauses)
+            assert path.read_bytes() == PackedCNF.from_clauses(clauses).to_bytes()
+
+    @pytest.mark.parametrize(
+        "buf,match",
+        (
+            (b"short", "truncated packed CNF header"),
+            (b"NOTACNF!" + bytes(32), "not a packed CNF"),
+        ),
+    )
+    def test_from_bytes_raises(self, buf: bytes, match: str) -> None:
+        with pytest.raises(ParseError, match=match):
+            PackedCNF.from_bytes(buf)
+
+    def test_truncated_data(self) -> None:
+        buf = PackedCNF.from_cnf(cnf).to_bytes()
+        with pytest.raises(ParseError, match="truncated packed CNF data"):
+            PackedCNF.from_bytes(buf[:-3])
+
+    def test_little_endian(self, tmp_path: Path, monkeypatch) -> None:
+        import satisfaction.packed
+
+        buf = PackedCNF.from_cnf(And(Or(x, ~y))).to_bytes()
+        lits = buf[HEADER.size : HEADER.size + 8]
+        assert lits == b"\x01\x00\x00\x00\xfe\xff\xff\xff"
+
+        # on a big-endian machine the integer sections are swapped both ways
+        native = PackedCNF.from_cnf(cnf).to_bytes()
+        monkeypatch.setattr(satisfaction.packed, "BIG_ENDIAN", True)
+        swapped = PackedCNF.from_cnf(cnf).to_bytes()
+        assert swapped != native
+        assert PackedCNF.from_bytes(swapped).to_cnf() == cnf
+        path = tmp_path / "f.cnfb"
+        write_packed(path, cnf.args)
+        assert path.read_bytes() == swapped
@@ -0,0 +1,103 @@
+import io
+
+import pytest
+
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, Equivalent, Expr, Implies, Not, Or, Var
+from satisfaction.format import pythonic as pythonic_fmt, standard as standard_fmt
+from satisfaction.parse import (
+    parse_expr,
+    parse_lines,
+    parser,
+    pythonic,
+    standard,
+)
+
+w = Var("w")
+x = Var("x")
+y = Var("y")
+z = Var("z")
+
+
+class TestParser:
+    @pytest.mark.parametrize(
+        "text,expr",
+        (
+            ("x", x),
+            ("~x", ~x),
+            ("~~x", Not(Not(x))),
+            ("~(x | y)", ~(x | y)),
+            ("x | y | z", Or(x, y, z)),
+            ("x & y & z", And(x, y, z)),
+            ("(x | y) | z", Or(Or(x, y), z)),
+            ("x -> y", Implies(x, y)),
+            ("x <-> y", Equivalent(x, y)),
+            ("x | y & z", x | (y & z)),
+            ("w & x | y & z", Or(And(w, x), And(y, z))),
+            ("(w | x) & (y | z)", And(Or(w, x), Or(y, z))),
+            ("w & x -> y", Implies(w & x, y)),
+            ("x -> y -> z", Implies(x, Implies(y, z))),
+            ("x -> y <-> z", Equivalent(Implies(x, y), z)),
+            ("w <-> x -> ~x & (y | z)", Equivalent(w, Implies(x, ~x & (y | z)))),
+            ("  a1  &\tb_2 ", Var("a1") & Var("b_2")),
+        ),
+    )
+    def test_parse(self, text: str, expr: Expr) -> None:
+        assert pythonic.parse(text) == expr
+
+    def test_parse_standard(self) -> None:
+        expr = Equivalent(w, Implies(x, ~x & (y | z)))
+        assert standard.parse("w ⇔ x ⇒ ¬x ∧ (y ∨ z)") == expr
+
+        with pytest.raises(ParseError):
+            standard.parse("x & y")
+
+    @pytest.mark.parametrize(
+        "expr",
+        (
+            Equivalent(w, Implies(x, ~x & (y | z))),
+            Implies(Implies(w, x), y),
+            And(And(w, x), Or(y, Or(z, ~w))),
+            ~(~(w & x) | Equivalent(y, z)),
+        ),
+    )
+    def test_round_trip(self, expr: Expr) -> None:
+        assert pythonic.parse(pythonic_fmt.format(expr)) == expr
+        assert standard.parse(standard_fmt.format(expr)) == expr
+        assert parser.parse(standard_fmt.format(expr)) == expr
+
+    def test_shares_vars(self) -> None:
+        expr = parse_expr("x | ~x")
+        assert expr.args[0] is expr.args[1].expr  # type: ignore
+
+    @pytest.mark.parametrize(
+        "text,match",
+        (
+            ("", "expected variable"),
+            ("x &", "expected variable"),
+            ("(x | y", "expected '\\)'"),
+            ("x y", "expected end of input"),
+            ("x $ y", "unexpected character"),
+            ("x )", "expected end of input"),
+        ),
+    )
+    def test_parse_raises(self, text: str, match: str) -> None:
+        with pytest.raises(ParseError, match=match):
+            parser.parse(text)
+
+
+def test_parse_lines() -> None:
+    lines = io.StringIO("# rules\nx -> y\n\n  y ∧ z\n")
+    exprs = list(parse_lines(lines))
+    assert exprs == [Implies(x, y), y & z]
+    # names are shared across lines
+    assert exprs[0].rhs is exprs[1].args[0]  # type: ignore
+
+
+def test_parse_lines_raises() -> None:
+    with pytest.raises(ParseError, match="line 2"):
+        list(parse_lines(["x", "x |"]))
+
+
+def test_read() -> None:
+    assert parser.read(io.StringIO("x\n~y | z\n")) == And(x, ~y | z)
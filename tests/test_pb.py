@@ -0,0 +1,126 @@
+import itertools
+import random
+
+import pytest
+
+from satisfaction.expr import And, Clause, Lit, Or, Var
+from satisfaction.pb import PB_ENCODINGS, PBEncoder, Term, choose_encoding
+from satisfaction.solvers.cdcl import CDCL
+
+xs = tuple(Var(f"x{i}") for i in range(6))
+
+
+def accepted(clauses: list[Clause], vars: tuple[Var, ...]) -> set[tuple[bool, ...]]:
+    result = set()
+    for values in itertools.product((False, True), repeat=len(vars)):
+        units = [Or(v if x else ~v) for v, x in zip(vars, values)]
+        if CDCL(And(*clauses, *units)).check():
+            result.add(values)
+    return result
+
+
+def expected(terms: list[Term], vars: tuple[Var, ...], pred) -> set[tuple[bool, ...]]:
+    result = set()
+    for values in itertools.product((False, True), repeat=len(vars)):
+        model = dict(zip(vars, values))
+
+        def value(lit: Lit, model: dict[Var, bool] = model) -> bool:
+            return model[lit] if isinstance(lit, Var) else not model[lit.atom()]
+
+        if pred(sum(w for w, lit in terms if value(lit))):
+            result.add(values)
+    return result
+
+
+CASES = (
+    ([(3, xs[0]), (2, xs[1]), (2, xs[2]), (1, xs[3])], 4),
+    ([(5, xs[0]), (3, ~xs[1]), (2, xs[2]), (7, xs[3]), (1, xs[4])], 8),
+    ([(4, xs[0]), (-3, xs[1]), (2, ~xs[2]), (6, xs[3])], 3),
+    ([(2, xs[0]), (2, xs[1]), (2, xs[2]), (2, xs[3])], 5),
+    ([(9, xs[0]), (1, xs[1]), (1, xs[2])], 2),
+    ([(1, xs[0]), (1, ~xs[0]), (3, xs[1])], 3),
+)
+
+
+@pytest.mark.parametrize("encoding", PB_ENCODINGS)
+@pytest.mark.parametrize("terms,k", CASES)
+def test_at_most(encoding: str, terms: list[Term], k: int) -> None:
+    vars = xs[:5]
+    clauses = PBEncoder().at_most(terms, k, encoding)
+    assert accepted(clauses, vars) == expected(terms, vars, lambda s: s <= k)
+
+
+@pytest.mark.parametrize("encoding", PB_ENCODINGS)
+@pytest.mark.parametrize("terms,k", CASES)
+def test_at_least_and_exactly(encoding: str, terms: list[Term], k: int) -> None:
+    vars = xs[:5]
+    encoder = PBEncoder()
+
+    clauses = encoder.at_least(terms, k, encoding)
+    assert accepted(clauses, vars) == expected(terms, vars, lambda s: s >= k)
+
+    clauses = encoder.exactly(terms, k, encoding)
+    assert accepted(clauses, vars) == expected(terms, vars, lambda s: s == k)
+
+
+@pytest.mark.parametrize("encoding", PB_ENCODINGS[1:])
+def test_random(encoding: str) -> None:
+    rng = random.Random(0)
+    vars = xs[:5]
+    for _ in range(5):
+        terms = [(rng.randint(-10, 20), rng.choice((v, ~v))) for v in vars]
+        k = rng.randint(0, 30)
+        clauses = PBEncoder().at_most(terms, k, encoding)
+        assert accepted(clauses, vars) == expected(terms, vars, lambda s, k=k: s <= k)
+
+
+def test_adder_exhaustive() -> None:
+    vars = xs[:3]
+    for weights in itertools.combinations_with_replacement(range(1, 7), 3):
+        terms = [(w, v) for w, v in zip(weights, vars)]
+        for k in range(sum(weights)):
+            clauses = PBEncoder().at_most(terms, k, "adder")
+            want = expected(terms, vars, lambda s, k=k: s <= k)
+            assert accepted(clauses, vars) == want, (weights, k)
+
+
+def test_adder_missing_sum_bit() -> None:
+    clauses = PBEncoder().at_most([(4, xs[0]), (5, xs[1])], 6, "adder")
+    assert (False, True) in accepted(clauses, xs[:2])
+
+
+def test_trivial() -> None:
+    encoder = PBEncoder()
+    assert encoder.at_most([(1, xs[0]), (2, xs[1])], 3) == []
+    assert encoder.at_most([(1, xs[0])], -1) == [Or()]
+    assert encoder.at_most([(5, xs[0]), (1, xs[1])], 4) == [Or(~xs[0])]
+    assert encoder.at_most([(0, xs[0])], 0) == []
+
+
+def test_normalize() -> None:
+    clauses: list[Clause] = []
+    terms, k = PBEncoder.normalize(
+        [(2, xs[0]), (-3, xs[1]), (9, xs[2]), (0, xs[3])], 4, clauses
+    )
+    assert terms == [(3, ~xs[1]), (2, xs[0])]
+    assert k == 7
+    assert clauses == [Or(~xs[2])]
+
+
+def test_choose_encoding() -> None:
+    assert choose_encoding([1, 2, 1, 2], 3) == "gte"
+    assert choose_encoding([1, 2, 3, 4, 5], 10) == "bdd"
+    assert choose_encoding(list(range(1, 1001)), 10_000) == "adder"
+
+
+def test_auto_cardinality() -> None:
+    encoder = PBEncoder()
+    terms = [(3, v) for v in xs]
+    assert len(encoder.at_most(terms, 7)) == len(
+        PBEncoder().at_most_k(xs, 2, "totalizer")
+    )
+
+
+def test_unsupported_encoding() -> None:
+    with pytest.raises(ValueError, match="pseudo-Boolean"):
+        PBEncoder().at_most([(1, xs[0])], 0, "sortnet")
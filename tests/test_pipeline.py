@@ -0,0 +1,41 @@
+from satisfaction.examples.pipeline import (
+    builder,
+    count_nodes,
+    format_results,
+    run_pipeline,
+)
+from satisfaction.expr import And, Or, var
+
+x, y, z = var("x y z")
+
+
+def test_count_nodes() -> None:
+    assert count_nodes(x) == 1
+    assert count_nodes(~x) == 2
+    assert count_nodes(And(Or(x, ~y), z)) == 6
+
+
+def test_builder() -> None:
+    formula = builder("pigeonhole", 2)()
+    assert isinstance(formula, And)
+    assert len(formula.args) == 3 + 2 * 3
+    assert count_nodes(builder("queens", 4)()) > 16
+
+
+def test_run_pipeline() -> None:
+    results = run_pipeline("queens", 4, runs=1)
+    assert [r.stage for r in results] == ["build", "tseitin", "index", "cdcl"]
+    assert all(r.seconds > 0 and r.peak > 0 and r.items > 0 for r in results)
+    assert results[0].unit == "nodes"
+    assert results[2].items == results[3].items
+    assert results[2].throughput == results[2].items / results[2].seconds
+
+    clausal = run_pipeline("ksat", 50, runs=2, memory=False)
+    assert [r.stage for r in clausal] == ["build", "index", "cdcl"]
+    assert clausal[1].items == 213
+    assert all(r.peak == 0 for r in clausal)
+
+    lines = format_results(results + clausal).splitlines()
+    assert len(lines) == 2 + 7
+    assert lines[2].split()[:3] == ["queens", "4", "build"]
+    assert lines[-1].endswith("clauses/s")
@@ -0,0 +1,50 @@
+import io
+
+from satisfaction.examples.profiling import (
+    format_top,
+    measure_memory,
+    profile,
+    sample,
+    top_functions,
+)
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import CDCL
+
+
+def solve() -> CDCL:
+    solver = CDCL(Pigeonhole(4).to_cnf())
+    solver.check()
+    return solver
+
+
+def test_profile() -> None:
+    rows = top_functions(profile(solve), 5)
+    assert len(rows) == 5
+    assert [own for _, _, own, _ in rows] == sorted(
+        (own for _, _, own, _ in rows), reverse=True
+    )
+    table = format_top(rows)
+    assert table.splitlines()[0].split() == ["own", "cumulative", "calls", "function"]
+    assert len(table.splitlines()) == 6
+
+
+def test_sample() -> None:
+    sampler = sample(solve, interval=0.0001)
+    assert sampler.stacks
+    assert any("CDCL.check (cdcl.py" in stack for stack in sampler.stacks)
+
+    f = io.StringIO()
+    sampler.write_collapsed(f)
+    lines = f.getvalue().splitlines()
+    assert len(lines) == len(sampler.stacks)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert sampler.stacks[stack] == int(count)
+    assert ";" in stack
+
+
+def test_measure_memory() -> None:
+    report = measure_memory(solve, top=3)
+    assert report.peak >= report.current > 0
+    assert report.blocks >= sum(blocks for _, blocks, _ in report.sites)
+    assert len(report.sites) == 3
+    assert any(site.startswith("cdcl.py:") for site, _, _ in report.sites)
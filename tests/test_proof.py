@@ -0,0 +1,196 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from satisfaction.cli import EXIT_UNSAT
+from satisfaction.cli import main as solve
+from satisfaction.dimacs import write_dimacs
+from satisfaction.exceptions import ParseError
+from satisfaction.expr import And, Or, Var
+from satisfaction.generators import Pigeonhole, RandomKSAT
+from satisfaction.packed import PackedCNF
+from satisfaction.proof import (
+    DratChecker,
+    ProofError,
+    ProofWriter,
+    check_drat,
+    check_lrat,
+    main,
+    parse_drat,
+    parse_lrat,
+)
+from satisfaction.solvers.cdcl import CDCL, Config
+from satisfaction.solvers.solver import Result
+
+
+def prove(
+    packed: PackedCNF, binary: bool = False, lrat: bool = False, **config
+) -> tuple[Result, bytes]:
+    buf = io.BytesIO()
+    solver = CDCL(packed.to_cnf(), Config(**config))
+    with ProofWriter(buf, binary, lrat, num_inputs=len(packed)) as proof:
+        solver.attach_proof(proof, packed.table.encode)
+        result = solver.check()
+    return result, buf.getvalue()
+
+
+def clauses(packed: PackedCNF) -> list[list[int]]:
+    return [list(clause) for clause in packed]
+
+
+def test_writer_formats() -> None:
+    buf = io.BytesIO()
+    with ProofWriter(buf) as proof:
+        proof.add([1, -2])
+        proof.delete([1, -2])
+        proof.add([])
+    assert buf.getvalue() == b"1 -2 0\nd 1 -2 0\n0\n"
+    assert (proof.additions, proof.deletions) == (2, 1)
+
+    buf = io.BytesIO()
+    with ProofWriter(buf, binary=True) as proof:
+        proof.add([1, -2, 64])
+        proof.delete([-1])
+    # 2v for v and 2v + 1 for -v, in 7-bit groups
+    assert buf.getvalue() == bytes([0x61, 2, 5, 0x80, 1, 0, 0x64, 3, 0])
+    assert parse_drat(buf.getvalue()) == [(False, [1, -2, 64]), (True, [-1])]
+
+    buf = io.BytesIO()
+    with ProofWriter(buf, lrat=True, num_inputs=4) as proof:
+        proof.delete([], 2)
+        proof.add([3], 5, [1, 4])
+        proof.delete([], 5)
+    assert buf.getvalue() == b"4 d 2 0\n5 3 0 1 4 0\n5 d 5 0\n"
+    assert parse_lrat(buf.getvalue()) == [
+        (0, None, [2]),
+        (5, [3], [1, 4]),
+        (0, None, [5]),
+    ]
+
+
+def test_lrat_binary_round_trip() -> None:
+    buf = io.BytesIO()
+    with ProofWriter(buf, binary=True, lrat=True) as proof:
+        proof.add([3], 5, [1, 4])
+        proof.delete([], 5)
+    # "5 3 0 1 4 0" and "5 d 5 0": the ID is not terminated by 0
+    assert buf.getvalue() == bytes([0x61, 10, 6, 0, 2, 8, 0, 0x64, 10, 0])
+    assert parse_lrat(buf.getvalue()) == [(5, [3], [1, 4]), (0, None, [5])]
+
+    buf = io.BytesIO()
+    with ProofWriter(buf, binary=True, lrat=True) as proof:
+        proof.add([-3, 200], 300, [1, 299])
+        proof.delete([], 300)
+    assert parse_lrat(buf.getvalue()) == [(300, [-3, 200], [1, 299]), (0, None, [300])]
+
+
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize("lrat", [False, True])
+def test_pigeonhole(binary: bool, lrat: bool) -> None:
+    packed = Pigeonhole(5).to_packed()
+    result, proof = prove(packed, binary, lrat)
+    assert result is Result.UNSAT
+    check = check_lrat if lrat else check_drat
+    assert check(clauses(packed), proof) > 0
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random(seed: int) -> None:
+    packed = RandomKSAT(30, 180, seed=seed).to_packed()
+    for config in ({}, {"heuristic": "order", "restarts": "none"}, {"seed": seed}):
+        drat_result, drat = prove(packed, **config)
+        lrat_result, lrat = prove(packed, lrat=True, **config)
+        assert drat_result is lrat_result
+        if drat_result is Result.UNSAT:
+            check_drat(clauses(packed), drat)
+            check_lrat(clauses(packed), lrat)
+        else:
+            # no refutation, so nothing ends in the empty clause
+            assert b"\n0\n" not in b"\n" + drat
+
+
+def test_core_first_skips_lemmas() -> None:
+    packed = Pigeonhole(5).to_packed()
+    _, proof = prove(packed)
+    checker = DratChecker(clauses(packed))
+    checker.check(parse_drat(proof))
+    assert 0 < checker.checked < proof.count(b"\n") - 1
+
+
+def test_trivial_refutations() -> None:
+    x = Var("x")
+    packed = PackedCNF.from_cnf(And(Or(x), Or(~x)))
+    for lrat in (False, True):
+        result, proof = prove(packed, lrat=lrat)
+        assert result is Result.UNSAT
+        (check_lrat if lrat else check_drat)(clauses(packed), proof)
+
+    packed = PackedCNF.from_cnf(And(Or(x), Or()))
+    result, proof = prove(packed, lrat=True)
+    assert proof == b"3 0 2 0\n"
+    check_lrat(clauses(packed), proof)
+
+
+def test_rat() -> None:
+    # unit propagation from -1 stops at (1 v 2 v 3), but the only resolvent
+    # of (1) on 1, (1 v 2), is RUP
+    formula = [[-1, 2], [1, 2, 3], [1, 2, -3], [-2, 4], [-2, -4]]
+    assert check_drat(formula, b"1 0\n2 0\n0\n") == 2
+    with pytest.raises(ProofError, match="neither RUP nor RAT"):
+        check_drat([[2, 3], [-2, 3]], b"-3 0\n0\n")
+
+
+def test_invalid_proofs() -> None:
+    packed = Pigeonhole(4).to_packed()
+    _, proof = prove(packed)
+    # dropping a lemma that the refutation needs breaks the proof
+    lemmas = proof.splitlines(keepends=True)
+    with pytest.raises(ProofError):
+        check_drat(clauses(packed), b"".join(lemmas[-2:]))
+    with pytest.raises(ProofError, match="empty clause"):
+        check_drat([[1, 2], [-1, 2]], b"2 0\n")
+
+    _, proof = prove(packed, lrat=True)
+    first, *rest = proof.splitlines(keepends=True)
+    id, *fields = first.split()
+    hints = fields[fields.index(b"0") + 1 : -1]
+    with pytest.raises(ProofError):
+        bad = b" ".join([id, *fields[: -len(hints) - 1], *hints[1:], b"0"])
+        check_lrat(clauses(packed), bad + b"\n" + b"".join(rest))
+    with pytest.raises(ProofError, match="missing clause"):
+        check_lrat([[1], [-1]], b"3 0 1 7 0\n")
+    with pytest.raises(ProofError, match="added twice"):
+        check_lrat([[1], [-1]], b"2 1 0 1 0\n")
+
+    with pytest.raises(ParseError):
+        parse_drat(b"1 2\n")
+    with pytest.raises(ParseError):
+        parse_drat(bytes([0x61, 0x82]))
+
+
+def test_deletions() -> None:
+    formula = [[1, 2], [-1, 2], [1, -2], [-1, -2]]
+    check_drat(formula, b"2 0\nd 1 2 0\nd -1 2 0\n0\n")
+    # deleting a clause the refutation needs before deriving from it fails
+    with pytest.raises(ProofError):
+        check_drat(formula, b"d 1 2 0\n2 0\n0\n")
+    check_lrat(formula, b"5 2 0 1 2 0\n5 d 1 2 0\n6 0 5 3 4 0\n")
+
+
+def test_command_line(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    formula = tmp_path / "php.cnf"
+    with open(formula, "wb") as f:
+        write_dimacs(Pigeonhole(4).to_packed(), f)
+
+    for flags in ([], ["--binary-proof"], ["--lrat"], ["--lrat", "--binary-proof"]):
+        proof = tmp_path / "php.proof"
+        assert solve([str(formula), "--proof", str(proof), *flags]) == EXIT_UNSAT
+        capsys.readouterr()
+        lrat = ["--lrat"] if "--lrat" in flags else []
+        assert main([str(formula), str(proof), *lrat]) == 0
+        assert capsys.readouterr().out.splitlines()[-1] == "s VERIFIED"
+
+    proof.write_bytes(b"0\n")
+    assert main([str(formula), str(proof)]) == 1
+    assert capsys.readouterr().out.splitlines()[-1] == "s NOT VERIFIED"
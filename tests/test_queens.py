@@ -2,7 +2,9 @@ import logging
 
 import pytest
 
-from satisfaction.expr import Var, var
+from satisfaction.cardinality import AMO_ENCODINGS
+from satisfaction.expr import Or, Var, var
+from satisfaction.solvers.cdcl import CDCL
 from satisfaction.examples.queens import (
     Queens,
     chessboard_size,
@@ -79,6 +81,68 @@ class TestQueens:
         formula = q.get_formula()
         assert formula is not None
 
+    def test_diagonal_lengths(self) -> None:
+        q = Queens(5)
+        assert [len(q.ldiag(i)) for i in range(-5, 6)] == [
+            0,
+            1,
+            2,
+            3,
+            4,
+            5,
+            4,
+            3,
+            2,
+            1,
+            0,
+        ]
+        assert q.ldiag(1) == (q[1, 0], q[2, 1], q[3, 2], q[4, 3])
+        assert q.rdiag(-1) == (q[0, 3], q[1, 2], q[2, 1], q[3, 0])
+
+
+def placements(queens: Queens, solver: CDCL) -> set[tuple[int, int]]:
+    return {
+        (c, r)
+        for r in range(queens.n)
+        for c in range(queens.n)
+        if solver.assigns[queens[c, r]]
+    }
+
+
+def valid(placed: set[tuple[int, int]], n: int) -> bool:
+    return (
+        len(placed) == n
+        and len({r for _, r in placed}) == n
+        and len({c for c, _ in placed}) == n
+        and len({c - r for c, r in placed}) == n
+        and len({c + r for c, r in placed}) == n
+    )
+
+
+class TestGetCNF:
+    @pytest.mark.parametrize("amo", AMO_ENCODINGS)
+    @pytest.mark.parametrize("n,sat", ((2, False), (3, False), (4, True), (6, True)))
+    def test_solutions(self, amo: str, n: int, sat: bool) -> None:
+        queens = Queens(n)
+        solver = CDCL(queens.get_cnf(amo=amo))
+        assert bool(solver.check()) is sat
+        if sat:
+            assert valid(placements(queens, solver), n)
+
+    def test_symmetry(self) -> None:
+        # 4-queens has two solutions which mirror each other
+        queens = Queens(4)
+        cnf = queens.get_cnf(symmetry=True)
+        assert cnf.args[-1] == Or(queens[0, 0], queens[1, 0])
+
+        solver = CDCL(cnf)
+        assert solver.check()
+        assert placements(queens, solver) == {(1, 0), (3, 1), (0, 2), (2, 3)}
+
+    def test_scales(self) -> None:
+        cnf = Queens(100).get_cnf()
+        assert len(cnf.args) < 150_000
+
 
 class TestDisplay:
     def test_lit_repr(self) -> None:
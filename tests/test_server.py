@@ -0,0 +1,206 @@
+import http.client
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from satisfaction.dimacs import parse_dimacs
+from satisfaction.generators import Pigeonhole
+from satisfaction.packed import PackedCNF
+from satisfaction.server import (
+    CANCELLED,
+    DONE,
+    QUEUED,
+    RUNNING,
+    QueueFull,
+    SolverService,
+    make_server,
+)
+from satisfaction.solvers.solver import Budget
+
+SAT = b"p cnf 2 2\n1 2 0\n-1 0\n"
+UNSAT = b"p cnf 1 2\n1 0\n-1 0\n"
+
+
+def hard() -> PackedCNF:
+    return Pigeonhole(8).to_packed()
+
+
+def wait_for(cond: Any, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestService:
+    def test_priorities(self) -> None:
+        with SolverService(workers=1) as service:
+            blocker = service.submit(hard(), budget=Budget(time=0.5))
+            wait_for(lambda: blocker.status == RUNNING)
+            low = service.submit(parse_dimacs(SAT), priority=0)
+            high = service.submit(parse_dimacs(UNSAT), priority=5)
+            assert low.finished.wait(10)
+
+            assert list(service._done) == [blocker.id, high.id, low.id]
+            assert blocker.result is not None and blocker.result.value == "UNKNOWN"
+            assert high.result is not None and high.result.value == "UNSAT"
+            assert low.result is not None and low.result.value == "SAT"
+            assert sorted(low.model or []) == [-1, 2]
+
+            stats = service.stats()
+            assert stats["completed"] == 3
+            assert stats["SAT"] == stats["UNSAT"] == stats["UNKNOWN"] == 1
+            assert stats["queued"] == stats["running"] == 0
+
+    def test_backpressure_and_cancel(self) -> None:
+        with SolverService(workers=1, max_queue=1) as service:
+            blocker = service.submit(hard())
+            wait_for(lambda: blocker.status == RUNNING)
+            queued = service.submit(parse_dimacs(SAT))
+            with pytest.raises(QueueFull):
+                service.submit(parse_dimacs(SAT))
+
+            assert service.cancel(queued.id)
+            assert queued.status == CANCELLED
+            assert not service.cancel(queued.id)
+            assert not service.cancel(blocker.id)
+            service.submit(parse_dimacs(SAT))
+            assert service.stats()["rejected"] == 1
+        # closing interrupts the running job and cancels the queued one
+        assert blocker.status == DONE
+
+
+@pytest.fixture(scope="module")
+def service() -> Iterator[SolverService]:
+    with SolverService(workers=2, max_queue=2) as service:
+        yield service
+
+
+@pytest.fixture(scope="module")
+def port(service: SolverService) -> Iterator[int]:
+    server = make_server(service, ("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def request(
+    conn: http.client.HTTPConnection, method: str, path: str, body: bytes = b""
+) -> tuple[int, dict[str, Any], http.client.HTTPResponse]:
+    conn.request(method, path, body)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read()), response
+
+
+class TestHTTP:
+    def test_solve(self, port: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        status, job, _ = request(conn, "POST", "/jobs?wait=10", SAT)
+        assert status == 200
+        assert job["result"] == "SAT"
+        assert sorted(job["model"]) == [-1, 2]
+        assert job["stats"]["decisions"] >= 0
+
+        status, again, _ = request(conn, "GET", f"/jobs/{job['id']}")
+        assert status == 200 and again == job
+
+    def test_packed_job_and_poll(self, port: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        data = parse_dimacs(UNSAT).to_bytes()
+        status, job, response = request(conn, "POST", "/jobs?solver=dpll", data)
+        assert status in (200, 202)
+        assert response.getheader("Location") == f"/jobs/{job['id']}"
+        status, job, _ = request(conn, "GET", f"/jobs/{job['id']}?wait=10")
+        assert job["status"] == DONE
+        assert job["result"] == "UNSAT"
+        assert job["model"] is None
+
+    def test_budget(self, port: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        data = hard().to_bytes()
+        status, job, _ = request(conn, "POST", "/jobs?conflicts=5&wait=10", data)
+        assert status == 200
+        assert job["result"] == "UNKNOWN"
+        assert job["stats"]["conflicts"] == 5
+
+    def test_backpressure(self, port: int, service: SolverService) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        data = hard().to_bytes()
+        ids = []
+        for _ in range(2):
+            _, job, _ = request(conn, "POST", "/jobs?time=0.5", data)
+            ids.append(job["id"])
+        wait_for(lambda: service.stats()["running"] == 2)
+        for _ in range(2):
+            _, job, _ = request(conn, "POST", "/jobs", data)
+            ids.append(job["id"])
+            assert job["status"] == QUEUED
+
+        status, body, response = request(conn, "POST", "/jobs", data)
+        assert status == 503
+        assert response.getheader("Retry-After") == "1"
+        assert body == {"error": "queue is full"}
+
+        for job_id in ids[2:]:
+            status, job, _ = request(conn, "DELETE", f"/jobs/{job_id}")
+            assert status == 200 and job["status"] == CANCELLED
+        status, _, _ = request(conn, "DELETE", f"/jobs/{ids[2]}")
+        assert status == 409
+
+    def test_errors(self, port: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        assert request(conn, "POST", "/jobs", b"p cnf 1 1\n2 0\n")[0] == 400
+        assert request(conn, "POST", "/jobs?solver=nope", SAT)[0] == 400
+        assert request(conn, "POST", "/jobs?conflicts=x", SAT)[0] == 400
+        assert request(conn, "POST", "/elsewhere", SAT)[0] == 404
+        assert request(conn, "GET", "/jobs/999999")[0] == 404
+        assert request(conn, "GET", "/jobs/abc")[0] == 404
+
+    def test_bad_content_length(self, port: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.putrequest("POST", "/jobs")
+        conn.putheader("Content-Length", "lots")
+        conn.endheaders()
+        response = conn.getresponse()
+        assert response.status == 400
+        assert "lots" in json.loads(response.read())["error"]
+
+    def test_stats(self, port: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        status, stats, _ = request(conn, "GET", "/stats")
+        assert status == 200
+        assert stats["workers"] == 2
+        assert stats["completed"] >= 1
+        assert stats["throughput"] > 0
+
+
+class UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def test_unix_socket(tmp_path: Path, service: SolverService) -> None:
+    path = str(tmp_path / "solver.sock")
+    with make_server(service, path) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            conn = UnixConnection(path)
+            status, job, _ = request(conn, "POST", "/jobs?wait=10", UNSAT)
+            assert status == 200
+            assert job["result"] == "UNSAT"
+        finally:
+            server.shutdown()
+    assert not Path(path).exists()
@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+
+from satisfaction.examples.queens import Queens
+from satisfaction.expr import And, CNF, Lit, Or, Var
+from satisfaction.generators import Pigeonhole
+from satisfaction.solvers.cdcl import CDCL
+from satisfaction.symmetry import break_symmetries, find_symmetries, lex_leader
+from satisfaction.utils import numbered_var
+
+
+def apply(symmetry: dict[Var, Lit], lit: Lit) -> Lit:
+    var = lit.atom()
+    image = symmetry.get(var, var)
+    return image if lit is var else ~image
+
+
+def models(cnf: CNF, vars: list[Var]) -> set[tuple[bool, ...]]:
+    result = set()
+    for values in itertools.product((False, True), repeat=len(vars)):
+        units = [Or(v if x else ~v) for v, x in zip(vars, values)]
+        if CDCL(And(*cnf.args, *units)).check():
+            result.add(values)
+    return result
+
+
+@pytest.mark.parametrize(
+    "cnf",
+    [Pigeonhole(3).to_cnf(), Queens(5).get_cnf(amo="pairwise")],
+    ids=["php", "queens"],
+)
+def test_generators_are_symmetries(cnf: CNF) -> None:
+    generators = find_symmetries(cnf)
+    assert generators
+
+    clauses = {frozenset(clause.args) for clause in cnf.args}
+    for symmetry in generators:
+        image = {frozenset(apply(symmetry, lit) for lit in c) for c in clauses}
+        assert image == clauses
+
+
+def test_phase_symmetry() -> None:
+    x, y = Var("x"), Var("y")
+    cnf = And(Or(x, y), Or(~x, ~y))
+    assert any(s.get(x) == ~x or s.get(x) == y for s in find_symmetries(cnf))
+
+
+def test_no_symmetry() -> None:
+    x, y = Var("x"), Var("y")
+    assert find_symmetries(And(Or(x), Or(x, y))) == []
+
+
+def test_lex_leader() -> None:
+    xs = [Var(f"x{i}") for i in range(3)]
+    # cyclic shift x0 -> x1 -> x2 -> x0
+    symmetry = {xs[0]: xs[1], xs[1]: xs[2], xs[2]: xs[0]}
+    clauses = lex_leader(symmetry, xs, numbered_var("e", 0))
+
+    accepted = models(And(*clauses), xs)
+    assert accepted == {
+        values
+        for values in itertools.product((False, True), repeat=3)
+        if values <= values[1:] + values[:1]
+    }
+
+
+def test_lex_leader_max_size() -> None:
+    xs = [Var(f"x{i}") for i in range(4)]
+    symmetry = {xs[0]: xs[1], xs[1]: xs[0], xs[2]: xs[3], xs[3]: xs[2]}
+    clauses = lex_leader(symmetry, xs, numbered_var("e", 0), max_size=1)
+    assert clauses == [Or(~xs[0], xs[1])]
+
+
+def test_break_symmetries_reduces_models() -> None:
+    xs = [Var(f"x{i}") for i in range(4)]
+    cnf = And(Or(*xs), *(Or(~a, ~b) for a, b in itertools.combinations(xs, 2)))
+    assert len(models(cnf, xs)) == 4
+    assert len(models(break_symmetries(cnf), xs)) == 1
+
+
+@pytest.mark.parametrize("n", [4, 6, 8])
+def test_queens_stay_satisfiable(n: int) -> None:
+    cnf = break_symmetries(Queens(n).get_cnf(amo="pairwise"))
+    assert CDCL(cnf).check()
+
+
+@pytest.mark.parametrize("holes", [2, 3, 4])
+def test_pigeonhole_stays_unsatisfiable(holes: int) -> None:
+    cnf = break_symmetries(Pigeonhole(holes).to_cnf())
+    assert len(cnf.args) > len(Pigeonhole(holes).to_cnf().args)
+    assert not CDCL(cnf).check()
+
+
+def test_node_limit() -> None:
+    cnf = Pigeonhole(4).to_cnf()
+    assert len(find_symmetries(cnf, max_nodes=1)) <= len(find_symmetries(cnf))